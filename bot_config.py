@@ -5,6 +5,8 @@ ENABLE_ROLE_BOT = True
 ROLE_BOT_NICKNAME = "Sudo Master"
 ROLE_BOT_FOOTER = "Obtain your roles!"
 AUTO_JOIN_ROLE_ID = 0 # Replace with actual Role ID to give on join
+REACTION_SETTLE_SECONDS = 1.5 # Reaction add/remove bursts per member+role collapse into one edit after this window
+REACTION_RECONCILE_REMOVE = False # On startup, also remove roles the bot granted via a reaction that is no longer there
 
 # Welcome Bot
 ENABLE_WELCOME_BOT = True
@@ -14,6 +16,9 @@ WELCOME_BOT_NICKNAME = "Jeff the Doorman"
 ENABLE_EVENT_BOT = True
 EVENT_BOT_NICKNAME = "Event Loop"
 EVENT_BOT_FOOTER = "Notifying you of upcoming events!"
+EVENT_REMINDER_OFFSETS = [1440, 60, 10] # Minutes before start to post reminders (the start announcement is always sent)
+EVENT_REMINDER_CHANNEL_OFFSETS = {} # Optional per-channel override, e.g. {123456789: [60, 10]}
+EVENT_IMAGE_CACHE_MB = 200 # Disk budget for cached event images (least recently used are evicted)
 
 # Stream Bot
 ENABLE_STREAM_BOT = True
@@ -27,6 +32,9 @@ SCHEDULE_BOT_FOOTER = "Makerspace Weekly Schedule"
 # Filament Bot
 ENABLE_FILAMENT_BOT = True
 FILAMENT_BOT_NICKNAME = "Filament Tracker"
+FILAMENT_DASHBOARD_DEBOUNCE_SECONDS = 2.0 # Writes within this window share one dashboard edit
+FILAMENT_LOW_STOCK_GRAMS = 100 # Alert the admin channel when a spool drops to this weight
+FILAMENT_LOW_STOCK_DAYS = 7 # ...or when it is forecast to run out within this many days
 
 # Welcome Puns
 WELCOME_PUNS = [
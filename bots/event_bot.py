@@ -2,10 +2,18 @@ import discord
 from discord import ui
 import json
 import os
+import io
+import re
 import asyncio
-from datetime import datetime
+import uuid
+from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import bot_config
+from utils.reminder_wheel import ReminderWheel
+from utils.event_calendar import IcsExportCache, is_past_event, iter_imported_events
+from utils.announcement_dispatcher import AnnouncementDispatcher
+from utils.event_index import EventIndex
+from utils.image_cache import ImageCache
 
 # --- Interactive Components ---
 
@@ -42,12 +50,22 @@ class EventModal(ui.Modal, title="Add New Event"):
             return m.author == interaction.user and m.channel == interaction.channel
 
         image_url = None
+        image_file = None
         try:
             # Wait for image upload
             msg = await bot.wait_for('message', check=check, timeout=60.0)
             
             if msg.attachments:
-                image_url = msg.attachments[0].url
+                attachment = msg.attachments[0]
+                try:
+                    # Keep our own resized copy, the CDN URL expires
+                    data = await attachment.read()
+                    # Images still used by events must survive eviction; read the events here, on the loop
+                    pinned = {e.get('image_file') for e in bot.events if e.get('image_file')}
+                    image_file = await asyncio.to_thread(bot.image_cache.store, data, attachment.filename, pinned)
+                except Exception as e:
+                    print(f"Failed to cache event image, falling back to URL: {e}")
+                    image_url = attachment.url
                 await interaction.followup.send("Image received!", ephemeral=True)
             elif msg.content.lower().strip() == 'skip':
                 await interaction.followup.send("Skipping image upload.", ephemeral=True)
@@ -70,11 +88,11 @@ class EventModal(ui.Modal, title="Add New Event"):
             "location": self.location.value,
             "description": self.description.value,
             "image_url": image_url,
+            "image_file": image_file,
             "created_by": interaction.user.id
         }
 
-        bot.events.append(new_event)
-        bot.save_events()
+        bot.add_event(new_event)
         
         print(f"Event added via Modal: {self.name.value}")
 
@@ -85,45 +103,85 @@ class DeleteEventSelect(ui.Select):
     def __init__(self, events: List[Dict], bot: 'EventBot'):
         self.bot = bot
         options = []
-        # Sort events by time and store them so we can access by index later
-        self.sorted_events = sorted(events, key=lambda x: x['time'])
-        
-        for i, event in enumerate(self.sorted_events):
-            # Use index as value to ensure uniqueness and short length
-            value = str(i)
-            
+
+        for event in events[:25]: # Discord limit
             label = f"{event['time']} - {event['name']}"
             if len(label) > 100: label = label[:97] + "..."
 
-            options.append(discord.SelectOption(label=label, value=value))
-            
-            if len(options) >= 25: break # Discord limit
+            # Event id keeps the value unique and stable across pages
+            options.append(discord.SelectOption(label=label, value=event['id']))
 
         super().__init__(placeholder="Select an event to delete...", min_values=1, max_values=1, options=options)
 
     async def callback(self, interaction: discord.Interaction):
         try:
-            index = int(self.values[0])
-            if 0 <= index < len(self.sorted_events):
-                event_to_remove = self.sorted_events[index]
-                
-                if event_to_remove in self.bot.events:
-                    self.bot.events.remove(event_to_remove)
-                    self.bot.save_events()
-                    await interaction.response.send_message(f"Event **{event_to_remove['name']}** deleted.", ephemeral=True)
-                    print(f"Deleted event: {event_to_remove['name']}")
-                else:
-                     await interaction.response.send_message("Event not found (maybe already deleted).", ephemeral=True)
+            event_to_remove = self.bot.event_index.get(self.values[0])
+
+            if event_to_remove and event_to_remove in self.bot.events:
+                self.bot.remove_event(event_to_remove)
+                await interaction.response.send_message(f"Event **{event_to_remove['name']}** deleted.", ephemeral=True)
+                print(f"Deleted event: {event_to_remove['name']}")
             else:
-                await interaction.response.send_message("Invalid selection.", ephemeral=True)
+                 await interaction.response.send_message("Event not found (maybe already deleted).", ephemeral=True)
         except Exception as e:
             print(f"Error in delete callback: {e}")
             await interaction.response.send_message(f"Error: {str(e)}", ephemeral=True)
 
 class DeleteEventView(ui.View):
-    def __init__(self, events: List[Dict], bot: 'EventBot'):
+    """One page (up to 25 events) of the delete menu, with prev/next buttons."""
+    def __init__(self, bot: 'EventBot', after: Optional[str] = None, before: Optional[str] = None):
         super().__init__()
-        self.add_item(DeleteEventSelect(events, bot))
+        self.bot = bot
+        self.page = bot.event_index.page(limit=25, after=after, before=before)
+        self.add_item(DeleteEventSelect(self.page.events, bot))
+
+        if self.page.has_prev or self.page.has_next:
+            prev_button = ui.Button(label="Previous", style=discord.ButtonStyle.secondary, disabled=not self.page.has_prev)
+            next_button = ui.Button(label="Next", style=discord.ButtonStyle.secondary, disabled=not self.page.has_next)
+            prev_button.callback = self.show_previous
+            next_button.callback = self.show_next
+            self.add_item(prev_button)
+            self.add_item(next_button)
+
+    def describe(self) -> str:
+        shown_to = self.page.start + len(self.page.events)
+        return f"Select an event to delete ({self.page.start + 1}-{shown_to} of {self.page.total}):"
+
+    async def show_previous(self, interaction: discord.Interaction):
+        view = DeleteEventView(self.bot, before=EventIndex.cursor_for(self.page.first))
+        await interaction.response.edit_message(content=view.describe(), view=view)
+
+    async def show_next(self, interaction: discord.Interaction):
+        view = DeleteEventView(self.bot, after=EventIndex.cursor_for(self.page.last))
+        await interaction.response.edit_message(content=view.describe(), view=view)
+
+class EventPageButton(ui.DynamicItem[ui.Button], template=r'evpage:(?P<direction>[np]):(?P<cursor>[^:]*):(?P<filters>.*)'):
+    """
+    Prev/next button for !list_events. The cursor and filters live in the custom_id,
+    so the buttons keep working after a restart without any stored view state.
+    """
+    def __init__(self, direction: str, cursor: str, filters: str, disabled: bool = False):
+        self.direction = direction
+        self.cursor = cursor
+        self.filters = filters
+        super().__init__(ui.Button(
+            label="Previous" if direction == 'p' else "Next",
+            style=discord.ButtonStyle.secondary,
+            disabled=disabled,
+            custom_id=f"evpage:{direction}:{cursor}:{filters}"[:100]
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: ui.Button, match):
+        return cls(match['direction'], match['cursor'], match['filters'])
+
+    async def callback(self, interaction: discord.Interaction):
+        bot: 'EventBot' = interaction.client
+        if self.direction == 'p':
+            embed, view = bot.build_event_list_page(self.filters, before=self.cursor)
+        else:
+            embed, view = bot.build_event_list_page(self.filters, after=self.cursor)
+        await interaction.response.edit_message(embed=embed, view=view)
 
 class EventAdminView(ui.View):
     def __init__(self, bot: 'EventBot'):
@@ -139,8 +197,8 @@ class EventAdminView(ui.View):
         if not self.bot.events:
             await interaction.response.send_message("No events to delete.", ephemeral=True, delete_after=5)
             return
-        del_view = DeleteEventView(self.bot.events, self.bot)
-        await interaction.response.send_message("Select an event to delete:", view=del_view, ephemeral=True)
+        del_view = DeleteEventView(self.bot)
+        await interaction.response.send_message(del_view.describe(), view=del_view, ephemeral=True)
 
     @ui.button(label="Setup Upcoming", style=discord.ButtonStyle.blurple, custom_id="event_admin_upcoming")
     async def setup_upcoming(self, interaction: discord.Interaction, button: ui.Button):
@@ -158,7 +216,7 @@ class UpcomingChannelSelect(ui.View):
         # Send initial message
         embeds = self.bot.get_upcoming_embeds()
         try:
-            msg = await channel.send(embeds=embeds)
+            msg = await channel.send(embeds=embeds, files=self.bot.get_upcoming_files())
             
             # Store ID
             self.bot.data['upcoming_message_id'] = msg.id
@@ -181,7 +239,21 @@ class EventBot(discord.Client):
         self.data = self.load_data()
         self.events = self.data['events']
         self.bg_task = None
-        self.channel_id = None
+        self.channel_ids = []
+        self.dispatcher = AnnouncementDispatcher(max_concurrency=4)
+        self.calendar_cache = IcsExportCache(os.path.join("data", "calendar"))
+        self.image_cache = ImageCache(
+            os.path.join("data", "event_images"),
+            max_bytes=bot_config.EVENT_IMAGE_CACHE_MB * 1024 * 1024
+        )
+
+        # Reminder state: fired keys survive restarts so nothing is announced twice
+        self.reminders = ReminderWheel()
+        self.fired_reminders = set(self.data.setdefault('fired_reminders', []))
+        if self.ensure_event_ids():
+            # Client loop is not available yet, so skip the dashboard refresh
+            self.write_events_file()
+        self.event_index = EventIndex(self.events)
 
     def load_data(self) -> Dict:
         if not os.path.exists(self.events_file):
@@ -195,15 +267,124 @@ class EventBot(discord.Client):
         except json.JSONDecodeError:
             return {'events': [], 'upcoming_message_id': None, 'upcoming_channel_id': None}
 
-    def save_events(self):
+    def write_events_file(self):
+        self.data['fired_reminders'] = sorted(self.fired_reminders)
         with open(self.events_file, 'w') as f:
             json.dump(self.data, f, indent=4)
+
+    def save_events(self):
+        self.write_events_file()
         # Trigger update when events change
         if hasattr(self, 'loop'):
             self.loop.create_task(self.update_upcoming_message())
 
+    def ensure_event_ids(self) -> bool:
+        """Gives legacy events a stable id. Returns True if any were added."""
+        changed = False
+        for event in self.events:
+            if not event.get('id'):
+                event['id'] = uuid.uuid4().hex[:8]
+                changed = True
+        return changed
+
+    def add_event(self, event: Dict):
+        if not event.get('id'):
+            event['id'] = uuid.uuid4().hex[:8]
+        self.events.append(event)
+        self.event_index.add(event)
+        self.schedule_event_reminders(event)
+        self.save_events()
+
+    def add_events(self, events: List[Dict]):
+        """Bulk insert with a single save, used by the importer."""
+        for event in events:
+            if not event.get('id'):
+                event['id'] = uuid.uuid4().hex[:8]
+            self.events.append(event)
+            self.event_index.add(event)
+            self.schedule_event_reminders(event)
+        self.save_events()
+
+    def remove_event(self, event: Dict, save: bool = True):
+        if event in self.events:
+            self.events.remove(event)
+        self.event_index.remove(event.get('id'))
+        self.reminders.cancel_owner(event.get('id'))
+        # Forget fired keys for this event so the persisted set stays bounded
+        prefix = f"{event.get('id')}|"
+        self.fired_reminders = {k for k in self.fired_reminders if not k.startswith(prefix)}
+        if save:
+            self.save_events()
+
+    # --- Reminders ---
+
+    def get_reminder_offsets(self, event: Dict, channel_id: Optional[int] = None) -> List[int]:
+        """
+        Minutes before start at which to remind. Per-event list wins over per-channel, then global.
+        Without a channel, returns the union over all announcement channels.
+        """
+        offsets = event.get('reminder_offsets')
+        if offsets is None:
+            channel_offsets = bot_config.EVENT_REMINDER_CHANNEL_OFFSETS
+            if channel_id is not None:
+                offsets = channel_offsets.get(channel_id, bot_config.EVENT_REMINDER_OFFSETS)
+            else:
+                offsets = set()
+                for cid in self.channel_ids or [None]:
+                    offsets |= set(channel_offsets.get(cid, bot_config.EVENT_REMINDER_OFFSETS))
+        # Offset 0 is the "starting now" announcement
+        return sorted({int(o) for o in offsets if int(o) > 0} | {0}, reverse=True)
+
+    def load_announcement_channels(self) -> List[int]:
+        """EVENT_CHANNEL_ID plus any comma-separated EVENT_CHANNEL_IDS (one per guild)."""
+        channel_ids = []
+        raw = f"{os.getenv('EVENT_CHANNEL_ID', '')},{os.getenv('EVENT_CHANNEL_IDS', '')}"
+        for part in raw.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            try:
+                channel_id = int(part)
+            except ValueError:
+                print(f"Ignoring invalid event channel ID: {part}")
+                continue
+            if channel_id and channel_id not in channel_ids:
+                channel_ids.append(channel_id)
+        return channel_ids
+
+    def reminder_key(self, event: Dict, offset: int) -> str:
+        # Includes the start time so rescheduling an event re-arms its reminders
+        return f"{event['id']}|{event['time']}|{offset}"
+
+    def schedule_event_reminders(self, event: Dict) -> bool:
+        """(Re)arms every reminder for an event. Returns False if the event time is invalid."""
+        try:
+            event_time = datetime.strptime(event['time'], "%Y-%m-%d %H:%M")
+        except (ValueError, KeyError):
+            return False
+
+        self.reminders.cancel_owner(event['id'])
+        for offset in self.get_reminder_offsets(event):
+            if self.reminder_key(event, offset) in self.fired_reminders:
+                continue
+            self.reminders.schedule(
+                (event['id'], offset),
+                event_time - timedelta(minutes=offset),
+                payload=(event['id'], offset),
+                owner=event['id']
+            )
+        return True
+
+    def schedule_all_reminders(self):
+        invalid = [e for e in self.events if not self.schedule_event_reminders(e)]
+        for event in invalid:
+            self.remove_event(event, save=False)
+        if invalid:
+            self.save_events()
+
     async def setup_hook(self):
         self.add_view(EventAdminView(self))
+        self.add_dynamic_items(EventPageButton)
 
     async def on_ready(self):
         print(f'The Event Loop logged in as {self.user} (ID: {self.user.id})')
@@ -214,10 +395,9 @@ class EventBot(discord.Client):
             except Exception as e:
                 print(f"Nickname change failed in {guild.name}: {e}")
 
-        try:
-            self.channel_id = int(os.getenv('EVENT_CHANNEL_ID', '0'))
-        except ValueError:
-            self.channel_id = 0
+        self.channel_ids = self.load_announcement_channels()
+        if not self.channel_ids:
+            print("Warning: EVENT_CHANNEL_ID not set. Event announcements are disabled.")
 
         if not self.bg_task:
             self.bg_task = self.loop.create_task(self.check_events())
@@ -228,21 +408,39 @@ class EventBot(discord.Client):
         else:
             return ["st", "nd", "rd"][day % 10 - 1]
 
+    # --- Event Images ---
+
+    def set_event_image(self, embed: discord.Embed, event: Dict):
+        """Points the embed at the cached copy (sent as an attachment), or the legacy URL."""
+        if self.image_cache.path(event.get('image_file')):
+            embed.set_image(url=f"attachment://{event['image_file']}")
+        elif event.get('image_url'):
+            embed.set_image(url=event['image_url'])
+
+    def event_image_file(self, event: Dict) -> Optional[discord.File]:
+        path = self.image_cache.path(event.get('image_file'))
+        return discord.File(path, filename=event['image_file']) if path else None
+
+    def get_upcoming_image_names(self) -> List[str]:
+        now = datetime.now().strftime("%Y-%m-%d %H:%M")
+        return [
+            e['image_file'] for e in self.event_index.upcoming(now, 3)
+            if self.image_cache.path(e.get('image_file'))
+        ]
+
+    def get_upcoming_files(self) -> List[discord.File]:
+        """Attachments backing the attachment:// images in get_upcoming_embeds()."""
+        return [discord.File(self.image_cache.path(name), filename=name) for name in self.get_upcoming_image_names()]
+
     def get_upcoming_embeds(self) -> List[discord.Embed]:
-        # Filter for future events
+        # Next 3 future events straight from the sorted index
         now = datetime.now()
-        future_events = []
-        for event in self.events:
+        next_events = []
+        for event in self.event_index.upcoming(now.strftime("%Y-%m-%d %H:%M"), 3):
             try:
-                event_time = datetime.strptime(event['time'], "%Y-%m-%d %H:%M")
-                if event_time > now:
-                    future_events.append((event_time, event))
+                next_events.append((datetime.strptime(event['time'], "%Y-%m-%d %H:%M"), event))
             except ValueError:
                 continue
-        
-        # Sort by time and take top 3
-        future_events.sort(key=lambda x: x[0])
-        next_events = future_events[:3]
 
         embeds = []
         
@@ -283,8 +481,7 @@ class EventBot(discord.Client):
             
             embed.description = description_text
             
-            if event.get('image_url'):
-                embed.set_image(url=event['image_url'])
+            self.set_event_image(embed, event)
             
             embeds.append(embed)
 
@@ -312,7 +509,13 @@ class EventBot(discord.Client):
 
             try:
                 message = await channel.fetch_message(msg_id)
-                await message.edit(embeds=self.get_upcoming_embeds())
+                # Keep already-uploaded images, only upload the ones that are new to the dashboard
+                existing = {a.filename: a for a in message.attachments}
+                attachments = [
+                    existing[name] if name in existing else discord.File(self.image_cache.path(name), filename=name)
+                    for name in self.get_upcoming_image_names()
+                ]
+                await message.edit(embeds=self.get_upcoming_embeds(), attachments=attachments)
             except discord.NotFound:
                 # Message deleted, clear data
                 self.data['upcoming_message_id'] = None
@@ -324,39 +527,85 @@ class EventBot(discord.Client):
         except Exception as e:
             print(f"Error in update_upcoming_message: {e}")
 
+    def build_start_embed(self, event: Dict, now: datetime) -> discord.Embed:
+        embed = discord.Embed(
+            title=f"Event Starting: {event['name']}",
+            description=f"Location: **{event.get('location', 'No location')}**\n{event['description']}",
+            color=0x2ECC71,
+            timestamp=now
+        )
+        self.set_event_image(embed, event)
+        embed.set_footer(text=bot_config.EVENT_BOT_FOOTER)
+        return embed
+
+    def build_reminder_embed(self, event: Dict, event_time: datetime, now: datetime) -> discord.Embed:
+        embed = discord.Embed(
+            title=f"Reminder: {event['name']}",
+            description=(
+                f"Starts <t:{int(event_time.timestamp())}:R> (<t:{int(event_time.timestamp())}:f>)\n"
+                f"Location: **{event.get('location', 'No location')}**"
+            ),
+            color=0xF1C40F,
+            timestamp=now
+        )
+        embed.set_footer(text=bot_config.EVENT_BOT_FOOTER)
+        return embed
+
     async def check_events(self):
         await self.wait_until_ready()
         print("The Event Loop background task started.")
+        self.schedule_all_reminders()
         while not self.is_closed():
             now = datetime.now()
+
+            # Collapse everything due this tick to the closest offset per event,
+            # so a bot that was offline does not post a stale "1 day" reminder.
+            due = {}
+            for event_id, offset in self.reminders.advance(now):
+                due.setdefault(event_id, []).append(offset)
+
+            events_by_id = {e.get('id'): e for e in self.events}
             events_to_remove = []
-            
-            for event in self.events:
-                try:
-                    event_time = datetime.strptime(event['time'], "%Y-%m-%d %H:%M")
-                    if now >= event_time:
-                        channel = self.get_channel(self.channel_id)
-                        if channel:
-                            embed = discord.Embed(
-                                title=f"Event Starting: {event['name']}",
-                                description=f"Location: **{event.get('location', 'No location')}**\n{event['description']}",
-                                color=0x2ECC71,
-                                timestamp=now
-                            )
-                            if event.get('image_url'):
-                                embed.set_image(url=event['image_url'])
-                            embed.set_footer(text=bot_config.EVENT_BOT_FOOTER)
-                            await channel.send(f"@everyone Event is starting now!", embed=embed)
-                            print(f"Triggered event: {event['name']}")
-                        
-                        events_to_remove.append(event)
-                except ValueError:
+            channels = [c for c in (self.get_channel(cid) for cid in self.channel_ids) if c]
+            jobs = []
+
+            for event_id, offsets in due.items():
+                event = events_by_id.get(event_id)
+                if not event:
+                    continue
+                for offset in offsets:
+                    self.fired_reminders.add(self.reminder_key(event, offset))
+
+                offset = min(offsets)
+                event_time = datetime.strptime(event['time'], "%Y-%m-%d %H:%M")
+                if offset == 0:
+                    payload = {'content': "@everyone Event is starting now!", 'embed': self.build_start_embed(event, now)}
                     events_to_remove.append(event)
+                    print(f"Triggered event: {event['name']}")
+                else:
+                    payload = {'embed': self.build_reminder_embed(event, event_time, now)}
+                    print(f"Sending {offset}m reminder for event: {event['name']}")
+
+                def make_payload(event=event, payload=payload, offset=offset):
+                    # A fresh File per send (and per retry), since sending consumes it
+                    kwargs = dict(payload)
+                    if offset == 0:
+                        image = self.event_image_file(event)
+                        if image:
+                            kwargs['file'] = image
+                    return kwargs
+
+                for channel in channels:
+                    if offset in self.get_reminder_offsets(event, channel.id):
+                        jobs.append((channel, make_payload))
+
+            # Every target for every due event goes out concurrently
+            await self.dispatcher.dispatch(jobs)
 
             if events_to_remove:
                 for e in events_to_remove:
-                    if e in self.events:
-                        self.events.remove(e)
+                    self.remove_event(e, save=False)
+            if due:
                 self.save_events()
                 # Update the upcoming events message since events were removed
                 await self.update_upcoming_message()
@@ -368,6 +617,94 @@ class EventBot(discord.Client):
 
             await asyncio.sleep(60)
 
+    # --- Event List Paging ---
+
+    def parse_list_filters(self, args: str) -> str:
+        """Encodes '!list_events' filters as 'YYYYMMDD~YYYYMMDD~prefix' for the page buttons."""
+        start = end = prefix = ""
+        name_match = re.search(r'name:(.*)$', args)
+        if name_match:
+            prefix = name_match.group(1).strip().replace(':', ' ')[:30]
+            args = args[:name_match.start()]
+        from_match = re.search(r'from:(\d{4}-\d{2}-\d{2})', args)
+        to_match = re.search(r'to:(\d{4}-\d{2}-\d{2})', args)
+        if from_match:
+            start = from_match.group(1).replace('-', '')
+        if to_match:
+            end = to_match.group(1).replace('-', '')
+        return f"{start}~{end}~{prefix}"
+
+    def build_event_list_page(self, filters: str, after: Optional[str] = None, before: Optional[str] = None, page_size: int = 10):
+        start, end, prefix = (filters.split('~', 2) + ['', '', ''])[:3]
+        start = f"{start[:4]}-{start[4:6]}-{start[6:8]}" if start else None
+        end = f"{end[:4]}-{end[4:6]}-{end[6:8]}" if end else None
+
+        page = self.event_index.page(limit=page_size, after=after, before=before, start=start, end=end, prefix=prefix)
+
+        embed = discord.Embed(title="All Scheduled Events", color=0x3498DB)
+        active = [f for f in (f"from {start}" if start else "", f"to {end}" if end else "", f"name starts with '{prefix}'" if prefix else "") if f]
+        if active:
+            embed.description = "Filtered: " + ", ".join(active)
+        if not page.events:
+            embed.add_field(name="No events", value="Nothing matches these filters.", inline=False)
+        for event in page.events:
+            location = event.get('location', 'No location')
+            embed.add_field(
+                name=f"{event['time']} | {event['name']}"[:256],
+                value=f"Location: {location}"[:1024],
+                inline=False
+            )
+        if page.events:
+            embed.set_footer(text=f"Showing {page.start + 1}-{page.start + len(page.events)} of {page.total}")
+
+        view = ui.View(timeout=None)
+        if page.has_prev or page.has_next:
+            first = EventIndex.cursor_for(page.first)
+            last = EventIndex.cursor_for(page.last)
+            view.add_item(EventPageButton('p', first, filters, disabled=not page.has_prev))
+            view.add_item(EventPageButton('n', last, filters, disabled=not page.has_next))
+        return embed, view
+
+    async def import_events_from_attachment(self, message, attachment):
+        data = await attachment.read()
+        existing = {(e.get('name'), e.get('time')) for e in self.events}
+
+        def parse():
+            imported, errors, duplicates, past = [], [], 0, 0
+            now = datetime.now()
+            lines = io.TextIOWrapper(io.BytesIO(data), encoding='utf-8-sig', errors='replace', newline='')
+            for event, error in iter_imported_events(lines, attachment.filename):
+                if error:
+                    errors.append(error)
+                    continue
+                if is_past_event(event, now):
+                    past += 1 # Already started: its reminders would all fire at once
+                    continue
+                key = (event['name'], event['time'])
+                if key in existing:
+                    duplicates += 1
+                    continue
+                existing.add(key)
+                event['created_by'] = message.author.id
+                imported.append(event)
+            return imported, errors, duplicates, past
+
+        imported, errors, duplicates, past = await asyncio.to_thread(parse)
+        if imported:
+            self.add_events(imported)
+
+        summary = f"Imported **{len(imported)}** events from `{attachment.filename}`."
+        if past:
+            summary += f"\nSkipped {past} events that already started."
+        if duplicates:
+            summary += f"\nSkipped {duplicates} duplicates."
+        if errors:
+            summary += f"\nRejected {len(errors)} entries:\n" + "\n".join(f"• {e}" for e in errors[:10])
+            if len(errors) > 10:
+                summary += f"\n...and {len(errors) - 10} more."
+        await message.channel.send(summary[:2000])
+        print(f"Imported {len(imported)} events from {attachment.filename} ({len(errors)} rejected, {past} past)")
+
     async def on_message(self, message):
         if message.author == self.user:
             return
@@ -387,7 +724,7 @@ class EventBot(discord.Client):
 
              embed = discord.Embed(
                  title="The Event Loop (Event Bot)",
-                 description="Manages community events.\n\n**Usage:**\n• **Add Event**: Create a new event listing.\n• **Delete Event**: Remove an existing event.\n• Use `!setup_upcoming` in the target channel to spawn the live dashboard.",
+                 description="Manages community events.\n\n**Usage:**\n• **Add Event**: Create a new event listing.\n• **Delete Event**: Remove an existing event.\n• `!import_events` with an `.ics`/`.csv` attached bulk-loads events.\n• Use `!setup_upcoming` in the target channel to spawn the live dashboard.",
                  color=0x2ECC71
              )
              await message.channel.send(embed=embed, view=EventAdminView(self))
@@ -412,26 +749,58 @@ class EventBot(discord.Client):
         # Command: !upcoming
         if message.content.startswith('!upcoming'):
             embeds = self.get_upcoming_embeds()
-            await message.channel.send(embeds=embeds)
+            await message.channel.send(embeds=embeds, files=self.get_upcoming_files())
 
-        # Command: !list_events (Lists ALL events)
+        # Command: !list_events [from:YYYY-MM-DD] [to:YYYY-MM-DD] [name:prefix]
         if message.content.startswith('!list_events'):
             if not self.events:
                 await message.channel.send("No events found.")
                 return
 
-            sorted_events = sorted(self.events, key=lambda x: x['time'])
-            
-            embed = discord.Embed(title="All Scheduled Events", color=0x3498DB)
-            for event in sorted_events:
-                 location = event.get('location', 'No location')
-                 embed.add_field(
-                    name=f"{event['time']} | {event['name']}",
-                    value=f"Location: {location}",
+            filters = self.parse_list_filters(message.content[len('!list_events'):])
+            embed, view = self.build_event_list_page(filters)
+            await message.channel.send(embed=embed, view=view)
+
+        # Command: !announce_stats (Admin, per-channel delivery latency)
+        if message.content.startswith('!announce_stats'):
+            if not message.author.guild_permissions.administrator:
+                await message.channel.send("You need Administrator permissions to use this command.")
+                return
+
+            report = self.dispatcher.latency_report()
+            embed = discord.Embed(title="Announcement Delivery", color=0x3498DB)
+            if not report:
+                embed.description = "No announcements sent since startup."
+            for row in report[:25]:
+                embed.add_field(
+                    name=row['label'],
+                    value=f"Sent: {row['sent']} | Failed: {row['failed']}\nAvg: {row['avg']:.2f}s | p95: {row['p95']:.2f}s | Last: {row['last']:.2f}s",
                     inline=False
-                 )
+                )
             await message.channel.send(embed=embed)
 
+        # Command: !calendar (Download .ics feed)
+        if message.content.startswith('!calendar'):
+            path = await asyncio.to_thread(self.calendar_cache.get, list(self.events))
+            await message.channel.send(
+                "Here is the event calendar. Import it into your phone or calendar app:",
+                file=discord.File(path, filename="elc_events.ics")
+            )
+
+        # Command: !import_events (Admin, attach .ics or .csv)
+        if message.content.startswith('!import_events'):
+            if not message.author.guild_permissions.administrator:
+                await message.channel.send("You need Administrator permissions to use this command.")
+                return
+
+            if not message.attachments:
+                await message.channel.send(
+                    "Attach an `.ics` file or a `.csv` with the columns `name,date,time,location,description`."
+                )
+                return
+
+            await self.import_events_from_attachment(message, message.attachments[0])
+
         # Command: !delete_event (Admin Access)
         if message.content.startswith('!delete_event'):
             if not message.author.guild_permissions.administrator:
@@ -452,8 +821,8 @@ class EventBot(discord.Client):
                         return
 
                     # Create the select view dynamically to get the latest events
-                    del_view = DeleteEventView(self.events, self)
-                    await interaction.response.send_message("Select an event to delete:", view=del_view, ephemeral=True)
+                    del_view = DeleteEventView(self)
+                    await interaction.response.send_message(del_view.describe(), view=del_view, ephemeral=True)
                 except Exception as e:
                     print(f"Error in delete_button_callback: {e}")
                     await interaction.response.send_message("An error occurred while opening the menu.", ephemeral=True)
@@ -470,7 +839,7 @@ class EventBot(discord.Client):
             
              # Send initial message
              embeds = self.get_upcoming_embeds()
-             msg = await message.channel.send(embeds=embeds)
+             msg = await message.channel.send(embeds=embeds, files=self.get_upcoming_files())
              
              # Store ID
              self.data['upcoming_message_id'] = msg.id
@@ -1,15 +1,22 @@
 import discord
-from discord import ui
+from discord import app_commands, ui
 from discord.ext import tasks
 import os
 import json
 import asyncio
+from datetime import datetime
 from typing import List, Dict, Optional
 import bot_config
-from utils.filament_data_manager import FilamentDataManager
+from utils.consumption_stats import period_keys
+from utils.data_writer import DataWriter
+from utils.filament_data_manager import create_data_manager
+from utils.spool_index import SpoolIndex, spool_label
+from utils.usage_analytics import UsageColumns, render_bars, to_seconds
+from utils.usage_export import group_parts, parse_date_range
 
 # --- Configuration Management ---
 CONFIG_FILE = "filament_config.json"
+DEFAULT_UPLOAD_LIMIT = 10 * 1024 * 1024 # Discord's attachment limit for unboosted servers
 
 def load_config():
     if os.path.exists(CONFIG_FILE):
@@ -24,6 +31,13 @@ def save_config(config):
     with open(CONFIG_FILE, 'w') as f:
         json.dump(config, f, indent=4)
 
+def format_days_left(days):
+    if days is None:
+        return "unknown"
+    if days < 1:
+        return "<1 day"
+    return f"~{days:.0f} day{'s' if round(days) != 1 else ''}"
+
 # --- Modals ---
 class LogUsageModal(ui.Modal, title="Log Filament Usage"):
     first_name = ui.TextInput(label="First Name", placeholder="Enter your name", min_length=1, max_length=50)
@@ -38,26 +52,30 @@ class LogUsageModal(ui.Modal, title="Log Filament Usage"):
     async def on_submit(self, interaction: discord.Interaction):
         try:
             amount_val = float(self.amount.value)
-            
+        except ValueError:
+            await interaction.response.send_message("Invalid amount. Please enter a number.", ephemeral=True)
+            return
+
+        # Acknowledge within Discord's 3s window; the write may wait behind others on the writer thread
+        await interaction.response.defer(ephemeral=True)
+        try:
             # Combine name and user for logging
             user_display = f"{self.first_name.value} ({interaction.user.display_name})"
             
-            self.bot.data_manager.log_usage(user_display, self.filament_id, amount_val)
-            self.bot.data_manager.update_filament_weight(self.filament_id, amount_val)
+            await self.bot.writer.submit(
+                self.bot.data_manager.log_usage_and_decrement, user_display, self.filament_id, amount_val
+            )
             
-            # Send a regular message that auto-deletes instead of ephemeral
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 f"Logged **{amount_val}g** usage for **{self.filament_name}** by **{self.first_name.value}**.",
-                delete_after=5
+                ephemeral=True
             )
             # Trigger dashboard updates
-            await self.bot.update_dashboards()
+            self.bot.request_dashboard_update()
             
-        except ValueError:
-            await interaction.response.send_message("Invalid amount. Please enter a number.", delete_after=5)
         except Exception as e:
             print(f"Error logging usage: {e}")
-            await interaction.response.send_message(f"An error occurred: {e}", delete_after=5)
+            await interaction.followup.send(f"An error occurred: {e}", ephemeral=True)
 
 class AddFilamentModal(ui.Modal, title="Add New Filament"):
     brand = ui.TextInput(label="Brand", placeholder="e.g., Elegoo", max_length=50)
@@ -72,23 +90,28 @@ class AddFilamentModal(ui.Modal, title="Add New Filament"):
     async def on_submit(self, interaction: discord.Interaction):
         try:
             weight_val = float(self.weight.value)
-            new_id = self.bot.data_manager.add_inventory_item(
+        except ValueError:
+            await interaction.response.send_message("❌ Invalid weight. Please enter a number.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        try:
+            new_id = await self.bot.writer.submit(
+                self.bot.data_manager.add_inventory_item,
                 self.type_name.value, 
                 self.brand.value, 
                 self.color.value, 
                 weight_val
             )
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 f"Added **{self.brand.value} {self.type_name.value} ({self.color.value})** with ID **{new_id}**.",
-                delete_after=5
+                ephemeral=True
             )
-            await self.bot.update_dashboards()
+            self.bot.request_dashboard_update()
             
-        except ValueError:
-             await interaction.response.send_message("❌ Invalid weight. Please enter a number.", ephemeral=True)
         except Exception as e:
             print(f"Error adding filament: {e}")
-            await interaction.response.send_message(f"❌ An error occurred: {e}", ephemeral=True)
+            await interaction.followup.send(f"❌ An error occurred: {e}", ephemeral=True)
 
 class EditFilamentModal(ui.Modal, title="Edit Filament Details"):
     brand = ui.TextInput(label="Brand", max_length=50)
@@ -109,10 +132,16 @@ class EditFilamentModal(ui.Modal, title="Edit Filament Details"):
 
     async def on_submit(self, interaction: discord.Interaction):
         try:
-            # Update data
             base_weight = float(self.weight.value)
-            
-            success = self.bot.data_manager.update_inventory_item(
+        except ValueError:
+            await interaction.response.send_message("❌ Invalid weight format.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        try:
+            # Update data
+            success = await self.bot.writer.submit(
+                self.bot.data_manager.update_inventory_item,
                 self.filament_id,
                 brand=self.brand.value,
                 type=self.type_name.value,
@@ -121,120 +150,164 @@ class EditFilamentModal(ui.Modal, title="Edit Filament Details"):
             )
             
             if success:
-                await interaction.response.send_message(
+                await interaction.followup.send(
                     f"✅ Updated filament ID **{self.filament_id}**:\n"
                     f"{self.brand.value} {self.type_name.value} - {self.color.value} ({base_weight}g)",
                     ephemeral=True
                 )
-                await self.bot.update_dashboards()
+                self.bot.request_dashboard_update()
             else:
-                await interaction.response.send_message("❌ Failed to update filament. ID not found.", ephemeral=True)
+                await interaction.followup.send("❌ Failed to update filament. ID not found.", ephemeral=True)
+
+        except Exception as e:
+            await interaction.followup.send(f"❌ Error: {e}", ephemeral=True)
+
+class ExportLogsModal(ui.Modal, title="Export Usage Logs"):
+    start_date = ui.TextInput(label="From (YYYY-MM-DD, optional)", required=False, max_length=10)
+    end_date = ui.TextInput(label="To (YYYY-MM-DD, optional)", required=False, max_length=10)
+    user = ui.TextInput(label="User contains (optional)", required=False, max_length=50)
+
+    def __init__(self, bot):
+        super().__init__()
+        self.bot = bot
 
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            start, end = parse_date_range(self.start_date.value, self.end_date.value)
         except ValueError:
-            await interaction.response.send_message("❌ Invalid weight format.", ephemeral=True)
+            await interaction.response.send_message("❌ Invalid dates. Use YYYY-MM-DD, with From before To.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        limit = interaction.guild.filesize_limit if interaction.guild else DEFAULT_UPLOAD_LIMIT
+        part_limit = limit - 64 * 1024 # Headroom for multipart overhead
+        try:
+            # CSV is written off the event loop; parts spill to disk once they get large
+            parts, rows = await asyncio.to_thread(
+                self.bot.data_manager.export_logs, part_limit, start, end, self.user.value
+            )
         except Exception as e:
-            await interaction.response.send_message(f"❌ Error: {e}", ephemeral=True)
+            print(f"Error exporting logs: {e}")
+            await interaction.followup.send(f"❌ Export failed: {e}", ephemeral=True)
+            return
+
+        try:
+            if not rows:
+                await interaction.followup.send("No logs match those filters.", ephemeral=True)
+                return
+            names = {
+                id(part): "filament_logs_export.csv" if len(parts) == 1 else f"filament_logs_export_part{i}of{len(parts)}.csv"
+                for i, part in enumerate(parts, 1)
+            }
+            summary = f"📊 {rows} log entries" + (f" in {len(parts)} files" if len(parts) > 1 else "") + ":"
+            # The upload limit applies to the whole request, so each message carries only what fits
+            for i, group in enumerate(group_parts(parts, part_limit)):
+                files = [discord.File(part, filename=names[id(part)]) for part in group]
+                await interaction.followup.send(summary if i == 0 else "📊 (continued)", files=files, ephemeral=True)
+        finally:
+            for part in parts:
+                part.close()
+
+# --- Spool Actions (shared by the select menus and slash commands) ---
+async def open_log_usage(bot, interaction: discord.Interaction, filament_id: int):
+    item = bot.data_manager.get_item(filament_id)
+    name = f"{item['color']} {item['type']}" if item else "Unknown"
+    await interaction.response.send_modal(LogUsageModal(bot, filament_id, name))
+
+async def open_edit_filament(bot, interaction: discord.Interaction, filament_id: int):
+    item = bot.data_manager.get_item(filament_id)
+    if item:
+        await interaction.response.send_modal(EditFilamentModal(bot, filament_id, item))
+    else:
+        await interaction.response.send_message("❌ Filament not found!", ephemeral=True)
+
+async def delete_filament(bot, interaction: discord.Interaction, filament_id: int):
+    item = bot.data_manager.get_item(filament_id)
+    if item:
+        # Confirm deletion logic could go here, but for now direct delete
+        await interaction.response.defer(ephemeral=True)
+        success = await bot.writer.submit(bot.data_manager.delete_inventory_item, filament_id)
+        if success:
+            await interaction.followup.send(
+                f"🗑️ **Deleted Filament**: {item['brand']} {item['type']} - {item['color']}", 
+                ephemeral=True
+            )
+            bot.request_dashboard_update()
+        else:
+            await interaction.followup.send("❌ Failed to delete item.", ephemeral=True)
+    else:
+        await interaction.response.send_message("❌ Filament not found!", ephemeral=True)
 
 # --- Select Menus ---
 class FilamentSelect(ui.Select):
-    def __init__(self, bot):
+    def __init__(self, bot, items):
         self.bot: 'FilamentBot' = bot
-        options = []
-        inventory = self.bot.data_manager.get_inventory()
-        sorted_inv = sorted(inventory, key=lambda x: (x.get('type', ''), x.get('color', '')))
-        
-        for item in sorted_inv:
-            label = f"{item['brand']} {item['type']} - {item['color']}"
-            desc = f"Remaining: {item['weight_g']}g"
-            if len(label) > 100: label = label[:97] + "..."
-            
-            options.append(discord.SelectOption(
-                label=label, 
-                description=desc, 
-                value=str(item['id'])
-            ))
-            if len(options) >= 25: break 
-
+        options = [
+            discord.SelectOption(label=spool_label(item), description=f"Remaining: {item['weight_g']}g", value=str(item['id']))
+            for item in items
+        ]
         super().__init__(placeholder="Select a filament...", min_values=1, max_values=1, options=options)
 
     async def callback(self, interaction: discord.Interaction):
-        filament_id = int(self.values[0])
-        inventory = self.bot.data_manager.get_inventory()
-        item = next((x for x in inventory if x['id'] == filament_id), None)
-        name = f"{item['color']} {item['type']}" if item else "Unknown"
-        
-        await interaction.response.send_modal(LogUsageModal(self.bot, filament_id, name))
+        await open_log_usage(self.bot, interaction, int(self.values[0]))
 
 class EditFilamentSelect(ui.Select):
-    def __init__(self, bot):
+    def __init__(self, bot, items):
         self.bot = bot
-        options = []
-        inventory = self.bot.data_manager.get_inventory()
-        # Sort for easier finding
-        sorted_inv = sorted(inventory, key=lambda x: (x.get('brand', ''), x.get('type', ''), x.get('color', '')))
-        
-        for item in sorted_inv:
-            label = f"{item['brand']} {item['type']} - {item['color']}"
-            if len(label) > 100: label = label[:97] + "..."
-            
-            options.append(discord.SelectOption(
-                label=label,
-                description=f"ID: {item['id']} | {item['weight_g']}g",
-                value=str(item['id'])
-            ))
-            if len(options) >= 25: break
-
+        options = [
+            discord.SelectOption(label=spool_label(item), description=f"ID: {item['id']} | {item['weight_g']}g", value=str(item['id']))
+            for item in items
+        ]
         super().__init__(placeholder="Select filament to edit...", min_values=1, max_values=1, options=options)
 
     async def callback(self, interaction: discord.Interaction):
-        filament_id = int(self.values[0])
-        inventory = self.bot.data_manager.get_inventory()
-        item = next((x for x in inventory if x['id'] == filament_id), None)
-        
-        if item:
-            await interaction.response.send_modal(EditFilamentModal(self.bot, filament_id, item))
-        else:
-            await interaction.response.send_message("❌ Filament not found!", ephemeral=True)
+        await open_edit_filament(self.bot, interaction, int(self.values[0]))
 
 class DeleteFilamentSelect(ui.Select):
-    def __init__(self, bot):
+    def __init__(self, bot, items):
         self.bot = bot
-        options = []
-        inventory = self.bot.data_manager.get_inventory()
-        sorted_inv = sorted(inventory, key=lambda x: (x.get('brand', ''), x.get('type', ''), x.get('color', '')))
-        
-        for item in sorted_inv:
-            label = f"{item['brand']} {item['type']} - {item['color']}"
-            if len(label) > 100: label = label[:97] + "..."
-            
-            options.append(discord.SelectOption(
-                label=label,
-                description=f"ID: {item['id']} | {item['weight_g']}g",
-                value=str(item['id']),
-                emoji="🗑️"
-            ))
-            if len(options) >= 25: break
-
+        options = [
+            discord.SelectOption(label=spool_label(item), description=f"ID: {item['id']} | {item['weight_g']}g",
+                                 value=str(item['id']), emoji="🗑️")
+            for item in items
+        ]
         super().__init__(placeholder="Select filament to DELETE...", min_values=1, max_values=1, options=options)
 
     async def callback(self, interaction: discord.Interaction):
-        filament_id = int(self.values[0])
-        inventory = self.bot.data_manager.get_inventory()
-        item = next((x for x in inventory if x['id'] == filament_id), None)
-        
-        if item:
-            # Confirm deletion logic could go here, but for now direct delete
-            success = self.bot.data_manager.delete_inventory_item(filament_id)
-            if success:
-                await interaction.response.send_message(
-                    f"🗑️ **Deleted Filament**: {item['brand']} {item['type']} - {item['color']}", 
-                    ephemeral=True
-                )
-                await self.bot.update_dashboards()
-            else:
-                await interaction.response.send_message("❌ Failed to delete item.", ephemeral=True)
+        await delete_filament(self.bot, interaction, int(self.values[0]))
+
+class SpoolPageView(ui.View):
+    """One page (25 spools) of a spool select, with Previous/Next buttons when the inventory doesn't fit."""
+
+    def __init__(self, bot, select_cls, order="type", page=0):
+        super().__init__(timeout=300)
+        self.bot = bot
+        self.select_cls = select_cls
+        self.order = order
+        items, self.page, self.pages = bot.get_spool_index().page(page, order)
+        self.empty = not items
+        if items:
+            self.add_item(select_cls(bot, items))
+        if self.pages > 1:
+            self.prev_page.disabled = self.page == 0
+            self.next_page.disabled = self.page >= self.pages - 1
+            self.prev_page.label = f"◀ Page {self.page}" if self.page > 0 else "◀"
+            self.next_page.label = f"Page {self.page + 2} ▶" if self.page < self.pages - 1 else "▶"
         else:
-            await interaction.response.send_message("❌ Filament not found!", ephemeral=True)
+            self.remove_item(self.prev_page)
+            self.remove_item(self.next_page)
+
+    async def _turn(self, interaction: discord.Interaction, delta: int):
+        view = SpoolPageView(self.bot, self.select_cls, self.order, self.page + delta)
+        await interaction.response.edit_message(view=view)
+
+    @ui.button(label="◀", style=discord.ButtonStyle.secondary, row=1)
+    async def prev_page(self, interaction: discord.Interaction, button: ui.Button):
+        await self._turn(interaction, -1)
+
+    @ui.button(label="▶", style=discord.ButtonStyle.secondary, row=1)
+    async def next_page(self, interaction: discord.Interaction, button: ui.Button):
+        await self._turn(interaction, 1)
 
 # --- Public Dashboard View ---
 class PublicDashboardView(ui.View):
@@ -244,13 +317,11 @@ class PublicDashboardView(ui.View):
 
     @ui.button(label="Log Usage", style=discord.ButtonStyle.success, custom_id="filament_public_log")
     async def log_usage_btn(self, interaction: discord.Interaction, button: ui.Button):
-        view = ui.View()
-        select = FilamentSelect(self.bot)
-        if not select.options:
+        view = SpoolPageView(self.bot, FilamentSelect)
+        if view.empty:
              await interaction.response.send_message("No filament in inventory!", delete_after=5)
              return
-        view.add_item(select)
-        await interaction.response.send_message("Select the filament you used:", view=view, ephemeral=True)
+        await interaction.response.send_message("Select the filament you used (or use `/filament_log` to search):", view=view, ephemeral=True)
 
 # --- Admin Dashboard View ---
 class AdminDashboardView(ui.View):
@@ -264,33 +335,23 @@ class AdminDashboardView(ui.View):
 
     @ui.button(label="Edit Filament", style=discord.ButtonStyle.primary, custom_id="filament_admin_edit")
     async def edit_filament_btn(self, interaction: discord.Interaction, button: ui.Button):
-        view = ui.View()
-        select = EditFilamentSelect(self.bot)
-        if not select.options:
+        view = SpoolPageView(self.bot, EditFilamentSelect, order="brand")
+        if view.empty:
              await interaction.response.send_message("No filament to edit!", ephemeral=True)
              return
-        view.add_item(select)
-        await interaction.response.send_message("Select filament to edit:", view=view, ephemeral=True)
+        await interaction.response.send_message("Select filament to edit (or use `/filament_edit` to search):", view=view, ephemeral=True)
 
     @ui.button(label="Delete Filament", style=discord.ButtonStyle.danger, custom_id="filament_admin_delete")
     async def delete_filament_btn(self, interaction: discord.Interaction, button: ui.Button):
-        view = ui.View()
-        select = DeleteFilamentSelect(self.bot)
-        if not select.options:
+        view = SpoolPageView(self.bot, DeleteFilamentSelect, order="brand")
+        if view.empty:
              await interaction.response.send_message("No filament to delete!", ephemeral=True)
              return
-        view.add_item(select)
         await interaction.response.send_message("⚠️ **SELECT FILAMENT TO DELETE** ⚠️", view=view, ephemeral=True)
 
     @ui.button(label="Export Logs", style=discord.ButtonStyle.secondary, custom_id="filament_admin_export")
     async def export_logs_btn(self, interaction: discord.Interaction, button: ui.Button):
-        csv_data = self.bot.data_manager.export_logs_to_csv()
-        
-        # Create a temporary file to send
-        import io
-        file = discord.File(io.StringIO(csv_data), filename="filament_logs_export.csv")
-        
-        await interaction.response.send_message("📊 Here is the latest usage log:", file=file, ephemeral=True)
+        await interaction.response.send_modal(ExportLogsModal(self.bot))
 
 # --- Main Bot Class ---
 class FilamentBot(discord.Client):
@@ -301,23 +362,213 @@ class FilamentBot(discord.Client):
             print("ERROR: FILAMENT_DATA_PATH not set in .env")
             data_path = "./data" # Fallback
             
-        self.data_manager = FilamentDataManager(data_path)
+        self.data_manager = create_data_manager(data_path)
+        self.writer = DataWriter() # Every mutation of the data files goes through this one thread
         self.config = load_config()
+        self.data_manager.configure_low_stock(
+            bot_config.FILAMENT_LOW_STOCK_GRAMS, bot_config.FILAMENT_LOW_STOCK_DAYS, self._low_stock_from_writer
+        )
+
+        # Dashboard rendering state
+        self.public_view = None # Persistent views, created in setup_hook
+        self.admin_view = None
+        self._public_message = None # Cached PartialMessage of the public dashboard
+        self._rendered_state = None # (data version, current day/week/month keys) last shown
+        self._dashboard_dirty = False
+        self._dashboard_task = None
+
+        # Spool search, rebuilt when the data version moves
+        self._spool_index = None
+        self._spool_index_version = None
+        self._analytics = None # UsageColumns, extended off-loop with new entries when the data version moves
+        self._analytics_version = None
+        self._analytics_lock = asyncio.Lock() # One load at a time; concurrent commands wait for it
+        self._analytics_imports = 0 # legacy_imports seen by the last analytics load
+        self.tree = app_commands.CommandTree(self)
+        self.register_slash_commands()
 
     async def setup_hook(self):
+        self.writer.start()
         # Register persistent views so buttons work after restart
-        self.add_view(PublicDashboardView(self))
-        self.add_view(AdminDashboardView(self))
+        self.public_view = PublicDashboardView(self)
+        self.admin_view = AdminDashboardView(self)
+        self.add_view(self.public_view)
+        self.add_view(self.admin_view)
+        try:
+            synced = await self.tree.sync()
+            print(f"Synced {len(synced)} filament slash command(s).")
+        except Exception as e:
+            print(f"Failed to sync filament slash commands: {e}")
         self.auto_refresh.start()
+        if hasattr(self.data_manager, 'usage_log'): # JSONL segments only; SQLite needs no compaction
+            self.compact_usage_logs.start()
 
     @tasks.loop(minutes=1)
     async def auto_refresh(self):
+        if hasattr(self.data_manager, 'import_legacy_logs'): # Pick up usage logged in the desktop app
+            try:
+                await self.writer.submit(self.data_manager.import_legacy_logs)
+            except Exception as e:
+                print(f"Importing desktop app usage logs failed: {e}")
         await self.update_dashboards()
+
+    @tasks.loop(hours=6)
+    async def compact_usage_logs(self):
+        # Gzip closed months on the writer thread so it never races a late entry appended to
+        # the segment being packed; one month per job keeps modal writes from queueing behind it
+        usage_log = self.data_manager.usage_log
+        try:
+            compacted = 0
+            for month in await asyncio.to_thread(usage_log.compactable_months):
+                if await self.writer.submit(usage_log.compact_month, month):
+                    compacted += 1
+            if compacted:
+                print(f"Compacted {compacted} usage log segment(s).")
+        except Exception as e:
+            print(f"Usage log compaction failed: {e}")
     
     @auto_refresh.before_loop
     async def before_auto_refresh(self):
         await self.wait_until_ready()
 
+    async def close(self):
+        await super().close()
+        await asyncio.to_thread(self.writer.stop, 10) # Let queued writes reach disk
+
+    def get_spool_index(self):
+        version = self.data_manager.data_version()
+        if self._spool_index is None or version != self._spool_index_version:
+            self._spool_index = SpoolIndex(self.data_manager.get_inventory())
+            self._spool_index_version = version
+        return self._spool_index
+
+    async def get_usage_analytics(self):
+        async with self._analytics_lock:
+            version = self.data_manager.data_version()
+            if self._analytics is not None and version == self._analytics_version:
+                return self._analytics
+            spool_types = {item['id']: item.get('type') for item in self.data_manager.get_inventory()}
+            imports = getattr(self.data_manager, 'legacy_imports', 0)
+            if self._analytics is None or imports != self._analytics_imports:
+                # Desktop app entries can be older than the newest loaded row: load everything
+                self._analytics_imports = imports
+                self._analytics = await asyncio.to_thread(
+                    lambda: UsageColumns.from_entries(self.data_manager.iter_logs(), spool_types)
+                )
+            else:
+                # The log is append-only: read from the newest loaded second onwards
+                columns = self._analytics
+                columns.spool_types.update(spool_types)
+                await asyncio.to_thread(lambda: columns.extend(self.data_manager.iter_logs(start=columns.last_timestamp())))
+            self._analytics_version = version
+            return self._analytics
+
+    async def get_usage_report(self, by="material", days=30):
+        columns = await self.get_usage_analytics()
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        end = to_seconds(today) + 86400
+        start = end - days * 86400
+        if by == "week":
+            rows = [(week.strftime("%b %d"), grams) for week, grams in columns.weekly(start, end)][-30:]
+        else:
+            rows = columns.group_totals(by, start, end, top=15)
+        header = f"Usage by {by}, last {days} days: {columns.total(start, end):,.1f}g over {columns.count(start, end)} logs"
+        return f"**{header}**\n```\n{render_bars(rows)}\n```"
+
+    async def spool_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [
+            app_commands.Choice(name=f"{spool_label(item)} ({item['weight_g']}g)"[:100], value=str(item['id']))
+            for item in self.get_spool_index().search(current)
+        ]
+
+    def register_slash_commands(self):
+        bot = self
+
+        async def resolve(interaction: discord.Interaction, spool: str):
+            # Autocomplete sends the id; anything typed without picking a suggestion is searched
+            if spool.isdigit() and bot.get_spool_index().items.get(int(spool)):
+                return int(spool)
+            matches = bot.get_spool_index().search(spool, limit=2)
+            if len(matches) == 1:
+                return matches[0]['id']
+            await interaction.response.send_message(
+                "❌ Pick a spool from the suggestions." if matches else "❌ No spool matches that.", ephemeral=True
+            )
+            return None
+
+        @self.tree.command(name="filament_log", description="Log filament usage for a spool")
+        @app_commands.describe(spool="Start typing a brand, type or color")
+        @app_commands.autocomplete(spool=self.spool_autocomplete)
+        async def filament_log(interaction: discord.Interaction, spool: str):
+            filament_id = await resolve(interaction, spool)
+            if filament_id is not None:
+                await open_log_usage(bot, interaction, filament_id)
+
+        @self.tree.command(name="filament_edit", description="Edit a filament spool")
+        @app_commands.describe(spool="Start typing a brand, type or color")
+        @app_commands.autocomplete(spool=self.spool_autocomplete)
+        @app_commands.default_permissions(administrator=True)
+        async def filament_edit(interaction: discord.Interaction, spool: str):
+            filament_id = await resolve(interaction, spool)
+            if filament_id is not None:
+                await open_edit_filament(bot, interaction, filament_id)
+
+        @self.tree.command(name="filament_delete", description="Delete a filament spool")
+        @app_commands.describe(spool="Start typing a brand, type or color")
+        @app_commands.autocomplete(spool=self.spool_autocomplete)
+        @app_commands.default_permissions(administrator=True)
+        async def filament_delete(interaction: discord.Interaction, spool: str):
+            filament_id = await resolve(interaction, spool)
+            if filament_id is not None:
+                await delete_filament(bot, interaction, filament_id)
+
+    def _low_stock_from_writer(self, item, levels, days_left):
+        # Called on the writer thread by the data manager; hand the alert to the event loop
+        asyncio.run_coroutine_threadsafe(self.post_low_stock_alert(item, levels, days_left), self.loop)
+
+    async def post_low_stock_alert(self, item, levels, days_left):
+        channel_id = self.config.get('admin_channel_id') or os.getenv('FILAMENT_ADMIN_CHANNEL_ID')
+        if not channel_id:
+            print(f"Low stock for filament {item['id']} but no admin channel is configured.")
+            return
+        name = f"{item['brand']} {item['type']} - {item['color']}"
+        if "empty" in levels:
+            title, color = f"🚫 Spool Empty: {name}", 0xE74C3C
+        else:
+            title, color = f"⚠️ Low Filament: {name}", 0xF39C12
+        reasons = []
+        if "grams" in levels and "empty" not in levels:
+            reasons.append(f"Down to **{item['weight_g']}g** (alert below {bot_config.FILAMENT_LOW_STOCK_GRAMS}g)")
+        if "days" in levels and "empty" not in levels:
+            reasons.append(f"**{format_days_left(days_left)}** left at the recent rate (alert below {bot_config.FILAMENT_LOW_STOCK_DAYS} days)")
+        embed = discord.Embed(title=title, description="\n".join(reasons) or "Reorder or replace this spool.", color=color)
+        embed.set_footer(text=f"Filament ID {item['id']}")
+        try:
+            channel = self.get_channel(int(channel_id)) or await self.fetch_channel(int(channel_id))
+            await channel.send(embed=embed)
+        except Exception as e:
+            print(f"Failed to post low stock alert: {e}")
+
+    def get_writer_stats_embed(self):
+        stats = self.writer.stats()
+        embed = discord.Embed(title="Filament Writer Queue", color=0x3498DB)
+        embed.add_field(name="Queue", value=(
+            f"Depth: {stats['depth']}\n"
+            f"Submitted: {stats['submitted']}\n"
+            f"Completed: {stats['completed']}\n"
+            f"Failed: {stats['failures']}"
+        ), inline=True)
+        embed.add_field(name="Queue Wait", value=(
+            f"p50: {stats['wait_p50'] * 1000:.1f}ms\n"
+            f"p95: {stats['wait_p95'] * 1000:.1f}ms\n"
+            f"p99: {stats['wait_p99'] * 1000:.1f}ms"
+        ), inline=True)
+        embed.add_field(name="Write Time", value=(
+            f"p50: {stats['service_p50'] * 1000:.1f}ms\n"
+            f"p95: {stats['service_p95'] * 1000:.1f}ms"
+        ), inline=True)
+        return embed
+
     async def on_ready(self):
         print(f'Filament Tracker logged in as {self.user} (ID: {self.user.id})')
         for guild in self.guilds:
@@ -357,10 +608,13 @@ class FilamentBot(discord.Client):
             for ftype, items in grouped.items():
                 content = ""
                 for item in items:
-                    content += f"{item['brand']} {item['color']}: {item['weight_g']}g\n"
+                    days_left = self.data_manager.get_days_left(item)
+                    warn = "⚠️ " if self.data_manager.forecast.alerted.get(item['id']) else ""
+                    forecast = f" · {format_days_left(days_left)} left" if days_left is not None else ""
+                    content += f"{warn}{item['brand']} {item['color']}: {item['weight_g']}g{forecast}\n"
                 embed.add_field(name=f"{ftype}", value=content, inline=False)
         
-        embed.set_footer(text="Use the button below to log usage.")
+        embed.set_footer(text="Use the button below to log usage. Days left are based on the last ~2 weeks of usage.")
         embed.timestamp = discord.utils.utcnow()
         return embed
 
@@ -373,18 +627,50 @@ class FilamentBot(discord.Client):
         embed.add_field(name="Instructions", value="• **Add Filament**: Register a new spool.\n• **Export Logs**: Download usage history as CSV.")
         return embed
 
-    async def update_dashboards(self):
-        # Update Public Dashboard
-        pub_chan_id = self.config.get('public_channel_id')
-        pub_msg_id = self.config.get('public_message_id')
-        
-        if pub_chan_id and pub_msg_id:
-            try:
-                channel = self.get_channel(pub_chan_id) or await self.fetch_channel(pub_chan_id)
-                message = await channel.fetch_message(pub_msg_id)
-                await message.edit(embed=self.get_public_embed(), view=PublicDashboardView(self))
-            except Exception as e:
-                print(f"Failed to update Public Dashboard: {e}")
+    def dashboard_state(self):
+        # Stats change on a data write or when the day/week/month rolls over
+        return (self.data_manager.data_version(), tuple(period_keys(datetime.now()).values()))
+
+    def request_dashboard_update(self):
+        """Schedules a dashboard refresh; a burst of writes is coalesced into one edit."""
+        self._dashboard_dirty = True
+        if self._dashboard_task is None or self._dashboard_task.done():
+            self._dashboard_task = asyncio.create_task(self._dashboard_updater())
+
+    async def _dashboard_updater(self):
+        while self._dashboard_dirty:
+            self._dashboard_dirty = False
+            await asyncio.sleep(bot_config.FILAMENT_DASHBOARD_DEBOUNCE_SECONDS)
+            await self.update_dashboards()
+
+    async def get_public_message(self):
+        if self._public_message is None:
+            pub_chan_id = self.config.get('public_channel_id')
+            pub_msg_id = self.config.get('public_message_id')
+            if not pub_chan_id or not pub_msg_id:
+                return None
+            channel = self.get_channel(pub_chan_id) or await self.fetch_channel(pub_chan_id)
+            self._public_message = channel.get_partial_message(pub_msg_id)
+        return self._public_message
+
+    async def update_dashboards(self, force=False):
+        # Update Public Dashboard, only if what it shows has changed
+        state = self.dashboard_state()
+        if not force and state == self._rendered_state:
+            return
+        try:
+            message = await self.get_public_message()
+            if message is None:
+                return
+            # Components are left as posted: the persistent view handles the buttons
+            await message.edit(embed=self.get_public_embed())
+            self._rendered_state = state
+        except discord.NotFound:
+            print("Public Dashboard message no longer exists. Run !filament setup to post a new one.")
+            self._public_message = None
+        except Exception as e:
+            print(f"Failed to update Public Dashboard: {e}")
+            self._public_message = None
 
         # Admin dashboard doesn't need constant updating as it's static menu, but good to know
 
@@ -409,7 +695,7 @@ class FilamentBot(discord.Client):
                 await message.channel.purge(limit=20)
                 
                 # We use the existing get_admin_embed and AdminDashboardView
-                await message.channel.send(embed=self.get_admin_embed(), view=AdminDashboardView(self))
+                await message.channel.send(embed=self.get_admin_embed(), view=self.admin_view)
             except Exception as e:
                 print(f"FilamentBot failed to post admin setup: {e}")
             return
@@ -437,9 +723,12 @@ class FilamentBot(discord.Client):
 
             # Post Public Dashboard
             try:
-                pub_msg = await pub_channel.send(embed=self.get_public_embed(), view=PublicDashboardView(self))
+                state = self.dashboard_state()
+                pub_msg = await pub_channel.send(embed=self.get_public_embed(), view=self.public_view)
                 self.config['public_channel_id'] = pub_channel.id
                 self.config['public_message_id'] = pub_msg.id
+                self._public_message = pub_msg
+                self._rendered_state = state
                 await message.channel.send(f"✅ Public Dashboard deployed to {pub_channel.mention}")
             except Exception as e:
                 await message.channel.send(f"❌ Failed to post Public Dashboard: {e}")
@@ -448,7 +737,7 @@ class FilamentBot(discord.Client):
             try:
                 # Check if we already have one to avoid spamming admin channel? 
                 # For now just post a new one.
-                admin_msg = await admin_channel.send(embed=self.get_admin_embed(), view=AdminDashboardView(self))
+                admin_msg = await admin_channel.send(embed=self.get_admin_embed(), view=self.admin_view)
                 self.config['admin_channel_id'] = admin_channel.id
                 self.config['admin_message_id'] = admin_msg.id
                 await message.channel.send(f"✅ Admin Dashboard deployed to {admin_channel.mention}")
@@ -457,6 +746,32 @@ class FilamentBot(discord.Client):
 
             save_config(self.config)
 
+        if message.content.startswith('!filament stats'):
+            if not message.author.guild_permissions.administrator:
+                await message.channel.send("❌ Admin permissions required.")
+                return
+            await message.channel.send(embed=self.get_writer_stats_embed())
+            return
+
+        if message.content.startswith('!filament usage'):
+            if not message.author.guild_permissions.administrator:
+                await message.channel.send("❌ Admin permissions required.")
+                return
+            # !filament usage [user|material|spool|week] [days]
+            parts = message.content.split()[2:]
+            by = {"spool": "filament"}.get(parts[0], parts[0]) if parts else "material"
+            if by not in ("user", "material", "filament", "week"):
+                await message.channel.send("Usage: `!filament usage [user|material|spool|week] [days]`")
+                return
+            try:
+                days = max(1, min(int(parts[1]), 3650)) if len(parts) > 1 else 30
+            except ValueError:
+                await message.channel.send("❌ Days must be a number.")
+                return
+            async with message.channel.typing():
+                await message.channel.send(await self.get_usage_report(by, days))
+            return
+
         # Auto-Clear Messages in Public Channel
         # Ignore messages from the bot itself (unless we want to clean up its own responses, 
         # but we handle those with delete_after)
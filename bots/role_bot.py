@@ -1,8 +1,19 @@
 import discord
+import io
 import os
 import re
+import asyncio
 import bot_config
 from datetime import datetime, timezone
+from utils.reaction_role_index import ReactionRoleIndex, parse_panel_description
+from utils.auto_role_queue import AutoRoleQueue
+from utils.reaction_coalescer import ReactionCoalescer
+from utils.reaction_panel import ReactionPanelBuilder
+from utils.reaction_reconciler import ReactionReconciler
+from utils.role_counter import RoleCounter
+from utils.role_guard import RoleGuard
+from utils.migration_jobs import JobStore
+from utils.role_migration import MigrationEngine, MigrationPlan, changes_from_state, net_role_change
 
 class MigrationModal(discord.ui.Modal, title="Migrate Alumni Roles"):
     alumni_role_id = discord.ui.TextInput(label="Alumni Role ID", placeholder="123456789", required=True)
@@ -29,14 +40,41 @@ class MigrationModal(discord.ui.Modal, title="Migrate Alumni Roles"):
                  await self.channel.send("❌ Error: Invalid Role IDs provided in Modal.")
                  return
 
-            # Call the helper logic
-            await self.bot._perform_migration(self.channel, guild, alumni_role, member_role, cutoff_dt)
+            # Preview first; the plan view executes it
+            await self.bot._perform_migration(self.channel, guild, alumni_role, member_role, cutoff_dt, dry_run=True)
             
         except ValueError:
             await self.channel.send("❌ Error: Invalid Date Format. Use YYYY-MM-DD.")
         except Exception as e:
             await self.channel.send(f"❌ Error starting migration: {e}")
 
+class MigrationPlanView(discord.ui.View):
+    def __init__(self, bot, plan):
+        super().__init__(timeout=900)
+        self.bot = bot
+        self.plan = plan
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message("Administrator permissions required.", ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.button(label="Execute Plan", style=discord.ButtonStyle.danger, emoji="▶️")
+    async def execute_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        for child in self.children:
+            child.disabled = True
+        await interaction.response.edit_message(view=self)
+        self.stop()
+        await self.bot.execute_migration_plan(interaction.channel, interaction.guild, self.plan)
+
+    @discord.ui.button(label="Discard", style=discord.ButtonStyle.secondary)
+    async def discard_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        for child in self.children:
+            child.disabled = True
+        await interaction.response.edit_message(content="Migration plan discarded.", view=self)
+        self.stop()
+
 class AdminDashboardView(discord.ui.View):
     def __init__(self, bot):
         super().__init__(timeout=None)
@@ -51,6 +89,42 @@ class AdminDashboardView(discord.ui.View):
     async def reaction_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.send_message("Select the channel where the reaction role message should appear:", view=ReactionChannelSelect(self.bot), ephemeral=True)
 
+    @discord.ui.button(label="Migration Jobs", style=discord.ButtonStyle.secondary, emoji="📜")
+    async def jobs_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.send_message(
+            embed=self.bot.get_migration_jobs_embed(interaction.guild),
+            view=MigrationJobsView(self.bot, interaction.guild),
+            ephemeral=True
+        )
+
+class UndoJobSelect(discord.ui.Select):
+    def __init__(self, bot, jobs):
+        options = [
+            discord.SelectOption(label=job['id'], description=f"Cutoff {job['params'].get('cutoff')} • {job['status']}", value=job['id'])
+            for job in jobs
+        ]
+        super().__init__(placeholder="Undo a migration job...", min_values=1, max_values=1, options=options)
+        self.bot = bot
+
+    async def callback(self, interaction: discord.Interaction):
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message("Administrator permissions required.", ephemeral=True)
+            return
+        job_id = self.values[0]
+        await interaction.response.send_message(f"⏪ Undoing job `{job_id}`... progress will be posted in this channel.", ephemeral=True)
+        await self.bot.undo_migration_job(interaction.channel, interaction.guild, job_id)
+
+class MigrationJobsView(discord.ui.View):
+    def __init__(self, bot, guild):
+        super().__init__(timeout=300)
+        undoable = [
+            job for job in bot.job_store.list_jobs(limit=25)
+            if job['kind'] == 'migration' and job['status'] != 'running'
+            and not job.get('undone_by') and job['params'].get('guild_id') == guild.id
+        ]
+        if undoable:
+            self.add_item(UndoJobSelect(bot, undoable))
+
 class ReactionChannelSelect(discord.ui.View):
     def __init__(self, bot):
         super().__init__(timeout=60)
@@ -82,41 +156,47 @@ class ReactionSetupModal(discord.ui.Modal, title="Reaction Roles Setup"):
              await interaction.response.send_message('Error: No valid Emoji-Role pairs found. Format: emoji @role', ephemeral=True)
              return
         
-        description = ""
-        emojis_to_add = []
-        
-        for emoji, role_mention in matches:
-            description += f"{emoji} : {role_mention}\n"
-            emojis_to_add.append(emoji)
-        
-        embed = discord.Embed(
-            title=self.title_input.value,
-            description=description,
-            color=0x3498DB
-        )
-        embed.set_footer(text=bot_config.ROLE_BOT_FOOTER)
+        pairs = [(emoji, int(role_mention[3:-1])) for emoji, role_mention in matches]
 
+        # Posting a sharded panel can outlast the 3 second interaction window
+        await interaction.response.defer(ephemeral=True, thinking=True)
         try:
-            sent_msg = await self.channel.send(embed=embed)
-            await interaction.response.send_message(f"Reaction Role message created in {self.channel.mention}", ephemeral=True)
-
-            for emoji in emojis_to_add:
-                try:
-                    await sent_msg.add_reaction(emoji)
-                except Exception as e:
-                     print(f"Failed to add reaction {emoji}: {e}")
+            # Large catalogs are split across linked messages (20 reactions each)
+            shards = await self.bot.panel_builder.publish(self.channel, self.title_input.value, pairs, bot_config.ROLE_BOT_FOOTER)
+            parts = f" ({len(shards)} messages)" if len(shards) > 1 else ""
+            await interaction.followup.send(f"Reaction Role message created in {self.channel.mention}{parts}. Adding reactions...", ephemeral=True)
+            failed = await self.bot.panel_builder.seed(shards)
+            if failed:
+                await interaction.followup.send(f"⚠️ {failed} reactions could not be added. Check the emojis and add them by hand.", ephemeral=True)
         except discord.Forbidden:
-             await interaction.response.send_message(f"Error: I do not have permission to send messages in {self.channel.mention}", ephemeral=True)
+             await interaction.followup.send(f"Error: I do not have permission to send messages in {self.channel.mention}", ephemeral=True)
         except Exception as e:
-             await interaction.response.send_message(f"Error: {e}", ephemeral=True)
+             await interaction.followup.send(f"Error: {e}", ephemeral=True)
 
 
 class RoleBot(discord.Client):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.reaction_index = ReactionRoleIndex() # (message_id, emoji) -> role_id
+        self.panel_builder = ReactionPanelBuilder(self.reaction_index)
+        self.role_guard = RoleGuard() # (guild, role) -> can we manage it, checked before any role edit
+        self.role_counter = RoleCounter() # guild -> role -> member count, updated from gateway events
+        self.role_stats_cache = {} # guild_id -> (counter version, embed)
+        self.index_scan_task = None
+        self.migration_engine = MigrationEngine() # Checkpointed bulk role edits
+        self.migration_task = None
+        self.job_store = JobStore() # Per-run metadata + edit journal, used for undo
+        self.reconciler = ReactionReconciler(self.reaction_index, guard=self.role_guard)
+        self.reconcile_task = None
+        self.auto_role_queue = AutoRoleQueue(self.assign_auto_role) # Join bursts drain through one paced worker
+        self.reaction_coalescer = ReactionCoalescer(self.apply_reaction_role, window=bot_config.REACTION_SETTLE_SECONDS)
 
     async def on_ready(self):
         print(f'Logged in as {self.user} (ID: {self.user.id})')
+
+        # Role membership counts: one pass over the member cache, then kept current from events
+        for guild in self.guilds:
+            self.role_counter.rebuild(guild)
         
         # Set nickname
         for guild in self.guilds:
@@ -126,6 +206,89 @@ class RoleBot(discord.Client):
             except Exception as e:
                 print(f"Nickname change failed in {guild.name}: {e}")
 
+        # Panels created before the index existed are picked up by a one-time history scan
+        if not os.path.exists(self.reaction_index.path) and not self.index_scan_task:
+            self.index_scan_task = asyncio.create_task(self.rebuild_reaction_index())
+
+        # Catch up on reactions added/removed while we were offline, without blocking startup
+        if not self.reconcile_task:
+            self.reconcile_task = asyncio.create_task(self.reconcile_reaction_roles())
+
+        if self.migration_engine.has_unfinished() and not self.migration_task:
+            self.migration_task = asyncio.create_task(self.resume_migration())
+
+    @staticmethod
+    def is_panel_footer(text) -> bool:
+        # "Sudo Master" is the legacy footer of panels created before it became configurable
+        text = text or ""
+        return bot_config.ROLE_BOT_FOOTER in text or "Sudo Master" in text
+
+    async def rebuild_reaction_index(self, history_limit=200):
+        """Scans recent channel history for our reaction-role panels and indexes them, dropping deleted ones."""
+        found = 0
+        seen = set()
+        for guild in self.guilds:
+            for channel in guild.text_channels:
+                if not channel.permissions_for(guild.me).read_message_history:
+                    continue
+                try:
+                    async for msg in channel.history(limit=history_limit):
+                        if msg.author.id != self.user.id or not msg.embeds:
+                            continue
+                        embed = msg.embeds[0]
+                        if not embed.footer or not self.is_panel_footer(embed.footer.text):
+                            continue
+                        roles = parse_panel_description(embed.description)
+                        if roles:
+                            self.reaction_index.register_panel(msg.id, guild.id, channel.id, roles, save=False)
+                            seen.add(msg.id)
+                            found += 1
+                except (discord.Forbidden, discord.HTTPException) as e:
+                    print(f"Reaction index scan skipped #{channel.name}: {e}")
+        pruned = await self.prune_reaction_index(skip=seen)
+        self.reaction_index.save()
+        print(f"Reaction role index rebuilt: {found} panels found, {pruned} deleted panels removed.")
+        return found, pruned
+
+    async def prune_reaction_index(self, skip=()):
+        """Removes indexed panels whose message or channel no longer exists. Returns how many were removed."""
+        pruned = 0
+        for message_id, panel in list(self.reaction_index.panels.items()):
+            if message_id in skip:
+                continue
+            guild = self.get_guild(panel['guild_id'])
+            if guild is None:
+                continue # Not in that guild (or it's unavailable): can't tell
+            channel = guild.get_channel(panel['channel_id'])
+            if channel is not None:
+                try:
+                    await channel.fetch_message(message_id)
+                    continue
+                except discord.NotFound:
+                    pass
+                except discord.HTTPException as e:
+                    print(f"Reaction index: could not check panel {message_id}: {e}")
+                    continue
+            self.reaction_index.remove_panel(message_id, save=False)
+            pruned += 1
+        return pruned
+
+    async def reconcile_reaction_roles(self):
+        """Diffs panel reactors against role membership in every guild and fixes the drift."""
+        if self.index_scan_task:
+            await self.index_scan_task
+        fixed = 0
+        for guild in self.guilds:
+            try:
+                stats = await self.reconciler.reconcile_guild(guild, remove=bot_config.REACTION_RECONCILE_REMOVE)
+            except Exception as e:
+                print(f"Reaction role reconciliation failed in {guild.name}: {e}")
+                continue
+            fixed += stats['fixed']
+            print(f"Reaction roles reconciled in {guild.name}: {stats['fixed']} drifts fixed, "
+                  f"{stats['errors']} errors, {stats['skipped_roles']} roles skipped.")
+        return fixed
+
     async def on_message(self, message):
         # Ignore own messages
         if message.author == self.user:
@@ -194,33 +357,16 @@ class RoleBot(discord.Client):
                     await message.reply('Usage: `!setup_reaction #channel "Title" <Emoji> @Role ...`\nExample: `!setup_reaction #gen "Roles" 🔴 @Red 🔵 @Blue`')
                     return
 
-                # 5. Build Description and Role Map
-                description = ""
-                emojis_to_add = []
-                
-                for emoji, role_mention in matches:
-                    description += f"{emoji} : {role_mention}\n"
-                    emojis_to_add.append(emoji)
-                
-                # 6. Create and Send Embed
-                embed = discord.Embed(
-                    title=title,
-                    description=description,
-                    color=0x3498DB # Blue for info
-                )
-                embed.set_footer(text=bot_config.ROLE_BOT_FOOTER)
-
-                sent_msg = await target_channel.send(embed=embed)
-                
-                # 7. Add Reactions
-                for emoji in emojis_to_add:
-                    try:
-                        await sent_msg.add_reaction(emoji)
-                    except Exception as e:
-                        print(f"Failed to add reaction {emoji}: {e}")
-                        # Continue adding others even if one fails
+                # 5. Publish (sharded across linked messages past 20 pairs) and index every part
+                pairs = [(emoji, int(role_mention[3:-1])) for emoji, role_mention in matches]
+                shards = await self.panel_builder.publish(target_channel, title, pairs, bot_config.ROLE_BOT_FOOTER)
+
+                # 6. Seed Reactions concurrently (failures are logged, the rest still get added)
+                failed = await self.panel_builder.seed(shards)
                 
-                await message.reply(f"Reaction Role message created in {target_channel.mention}")
+                parts = f" ({len(shards)} messages)" if len(shards) > 1 else ""
+                failures = f"\n⚠️ {failed} reactions could not be added." if failed else ""
+                await message.reply(f"Reaction Role message created in {target_channel.mention}{parts}{failures}")
 
             except Exception as e:
                 await message.reply(f"Error: {e}")
@@ -228,6 +374,76 @@ class RoleBot(discord.Client):
 
 
 
+        # Command: !reindex_reactions (rescan history for reaction-role panels)
+        if message.content.startswith('!reindex_reactions'):
+            if not message.author.guild_permissions.administrator:
+                await message.reply("`sudo` access denied.")
+                return
+            found, pruned = await self.rebuild_reaction_index()
+            await message.reply(f"Reaction role index rebuilt: **{found}** panels found, **{pruned}** deleted panels removed.")
+            return
+
+        # Command: !reconcile_reactions (fix roles that drifted from panel reactions)
+        if message.content.startswith('!reconcile_reactions'):
+            if not message.author.guild_permissions.administrator:
+                await message.reply("`sudo` access denied.")
+                return
+            stats = await self.reconciler.reconcile_guild(message.guild, remove=bot_config.REACTION_RECONCILE_REMOVE)
+            await message.reply(f"Reaction roles reconciled: **{stats['fixed']}** drifts fixed ({stats['errors']} errors).")
+            return
+
+        # Command: !reaction_stats (how many role edits the settle window saved)
+        if message.content.startswith('!reaction_stats'):
+            if not message.author.guild_permissions.administrator:
+                await message.reply("`sudo` access denied.")
+                return
+            stats = self.reaction_coalescer.stats()
+            await message.reply(
+                f"Reaction events: **{stats['events']}** | Role edits: **{stats['edits']}** | "
+                f"Calls saved: **{stats['saved']}** ({stats['noops']} settled to no change, {stats['pending']} pending)"
+            )
+            return
+
+        # Command: !role_stats [@Role] (membership counts without walking the member list)
+        if message.content.startswith('!role_stats'):
+            if not message.author.guild_permissions.administrator:
+                await message.reply("`sudo` access denied.")
+                return
+            if message.role_mentions:
+                role = message.role_mentions[0]
+                await message.reply(f"{role.mention} has **{self.role_counter.count(message.guild.id, role.id)}** members.")
+            else:
+                await message.reply(embed=self.get_role_stats_embed(message.guild))
+            return
+
+        # Command: !autorole_stats (join queue depth and time-to-role)
+        if message.content.startswith('!autorole_stats'):
+            if not message.author.guild_permissions.administrator:
+                await message.reply("`sudo` access denied.")
+                return
+            stats = self.auto_role_queue.stats()
+            await message.reply(
+                f"Auto-role queue depth: **{stats['depth']}** | Assigned: **{stats['assigned']}** | "
+                f"Deduped: {stats['deduped']} | Failures: {stats['failures']}\n"
+                f"Time to role: p50 {stats['p50']:.1f}s / p95 {stats['p95']:.1f}s / p99 {stats['p99']:.1f}s"
+            )
+            return
+
+        # Command: !migration_jobs / !undo_migration <job_id>
+        if message.content.startswith('!migration_jobs') or message.content.startswith('!undo_migration'):
+            if not message.author.guild_permissions.administrator:
+                await message.reply("`sudo` access denied.")
+                return
+            if message.content.startswith('!migration_jobs'):
+                await message.reply(embed=self.get_migration_jobs_embed(message.guild))
+                return
+            parts = message.content.split()
+            if len(parts) < 2:
+                await message.reply("Usage: `!undo_migration <job_id>` (see `!migration_jobs`)")
+                return
+            await self.undo_migration_job(message.channel, message.guild, parts[1])
+            return
+
         # Command: !migrate_alumni @Alumni @Member [Optional:@OldMsg]
         if message.content.startswith('!migrate_alumni'):
              print(f"DEBUG: RoleBot received !migrate_alumni command from {message.author}")
@@ -243,7 +459,7 @@ class RoleBot(discord.Client):
         """
         Migrates users to Alumni or Member roles based on join date.
         Cutoff: May 1st, 2024
-        Usage: !migrate_alumni @AlumniRole @MemberRole [Optional:@OldRoleToRemove]
+        Usage: !migrate_alumni @AlumniRole @MemberRole [Optional:@OldRoleToRemove] [YYYY-MM-DD] [--dry-run]
         """
         # 1. Permission Check
         if not message.author.guild_permissions.administrator:
@@ -256,7 +472,7 @@ class RoleBot(discord.Client):
         role_matches = re.findall(r'<@&(\d+)>', message.content)
 
         if len(role_matches) < 2:
-            await message.reply("Usage: `!migrate_alumni @AlumniRole @OngoingMemberRole [Optional:@OldRoleToRemove]`")
+            await message.reply("Usage: `!migrate_alumni @AlumniRole @OngoingMemberRole [Optional:@OldRoleToRemove] [YYYY-MM-DD] [--dry-run]`")
             return
 
         guild = message.guild
@@ -290,115 +506,121 @@ class RoleBot(discord.Client):
              # Default Cutoff Date: May 1st, 2024 (UTC)
              cutoff_date = datetime(2024, 5, 1, tzinfo=timezone.utc)
 
-        # 4. START MIGRATION HELPER
-        await self._perform_migration(message.channel, guild, alumni_role, member_role, cutoff_date, remove_role)
+        # 4. START MIGRATION HELPER (--dry-run only previews the plan)
+        dry_run = '--dry-run' in message.content
+        await self._perform_migration(message.channel, guild, alumni_role, member_role, cutoff_date, remove_role, dry_run=dry_run)
 
-    async def _perform_migration(self, channel, guild, alumni_role, member_role, cutoff_date, remove_role=None):
+    async def _perform_migration(self, channel, guild, alumni_role, member_role, cutoff_date, remove_role=None, dry_run=False):
         """
         Reusable migration logic for both Chat Command and Admin UI.
+        Plans the migration from a join-date index, then either previews it or executes it.
         """
-        stats = {
-            "processed": 0,
-            "alumni_added": 0,
-            "members_added": 0,
-            "roles_removed": 0,
-            "errors": 0
-        }
-
-        # Notify Start
-        status_msg = await channel.send(
-            f"**Starting Migration**\n"
-            f"Cutoff Date: {cutoff_date.strftime('%Y-%m-%d')}\n"
-            f"Alumni Role: {alumni_role.mention}\n"
-            f"Member Role: {member_role.mention}\n"
-            f"Remove Role: {remove_role.mention if remove_role else 'None'}\n"
-            f"Total Members to Check: {len(guild.members)}\n"
-            f"Processing..."
+        plan = MigrationPlan.build(
+            guild, alumni_role.id, member_role.id, cutoff_date,
+            remove_role.id if remove_role else None
+        )
+        if dry_run:
+            await self.send_migration_preview(channel, guild, plan)
+        else:
+            await self.execute_migration_plan(channel, guild, plan)
+
+    def format_migration_plan(self, plan):
+        counts = plan.counts
+        return (
+            f"Cutoff Date: {plan.cutoff.strftime('%Y-%m-%d')}\n"
+            f"Alumni Role: <@&{plan.alumni_role_id}>\n"
+            f"Member Role: <@&{plan.member_role_id}>\n"
+            f"Remove Role: {f'<@&{plan.remove_role_id}>' if plan.remove_role_id else 'None'}\n"
+            f"Cohorts: {plan.cohorts['alumni']} alumni / {plan.cohorts['member']} members\n"
+            f"Add Alumni: **{counts['add_alumni']}** | Remove Member: **{counts['remove_member']}**\n"
+            f"Add Member: **{counts['add_member']}** | Remove Alumni: **{counts['remove_alumni']}**\n"
+            f"Remove Legacy Role: **{counts['remove_legacy']}**\n"
+            f"Members Needing Changes: **{len(plan.changes)}**"
         )
 
+    async def send_migration_preview(self, channel, guild, plan):
+        """Posts the plan's diff and a CSV of every change, with a button to execute it as-is."""
+        role_ids = {plan.alumni_role_id, plan.member_role_id, plan.remove_role_id}
+        role_names = {r.id: r.name for r in guild.roles if r.id in role_ids}
+        buffer = io.StringIO()
+        plan.write_csv(buffer, role_names)
+        file = discord.File(io.BytesIO(buffer.getvalue().encode('utf-8')),
+                            filename=f"migration_plan_{plan.cutoff.strftime('%Y%m%d')}.csv")
+
+        embed = discord.Embed(title="🔍 Migration Plan (Dry Run)", description=self.format_migration_plan(plan), color=0x3498db)
+        embed.set_footer(text="Nothing has been changed yet. The CSV lists every planned edit.")
+        await channel.send(embed=embed, file=file, view=MigrationPlanView(self, plan))
+
+    async def guard_preflight(self, channel, guild, role_ids, action):
+        """Refuses a bulk edit up front, instead of failing once per member, if any of its roles can't be managed."""
+        for role in filter(None, map(guild.get_role, role_ids)):
+            reason = self.role_guard.reason(guild, role)
+            if reason:
+                await channel.send(f"❌ Cannot {action}: I can't manage {role.mention} ({reason}).")
+                return False
+        return True
+
+    async def execute_migration_plan(self, channel, guild, plan, resume=False):
+        """Applies a plan through the migration engine, one edit per member, with checkpoints."""
+        if self.migration_engine.running:
+            await channel.send("⚠️ A migration is already running. Wait for it to finish.")
+            return
+        # Every entry point (command, Execute button, resume) goes through here
+        role_ids = {plan.alumni_role_id, plan.member_role_id, plan.remove_role_id} - {None}
+        if not await self.guard_preflight(channel, guild, role_ids, "migrate"):
+            return
+
+        if not resume:
+            job = self.job_store.create('migration', plan.to_job(channel.id))
+            self.migration_engine.start(dict(plan.to_job(channel.id), kind='migration', job_id=job['id']), plan.changes)
+        else:
+            self.migration_engine.running = True
+        job_id = self.migration_engine.state['job'].get('job_id')
+        already_done = len(set(self.migration_engine.state['done']) & set(plan.changes))
+        # The counter only catches up when gateway events for our edits arrive, so the
+        # report counts from the job's starting point plus the engine's own net changes
+        # (on resume the counter already includes the edits made before the restart)
+        tracked = (plan.alumni_role_id, plan.member_role_id)
+        stats_so_far = self.migration_engine.state['stats']
+        baseline = {rid: self.role_counter.count(guild.id, rid) - net_role_change(stats_so_far, rid) for rid in tracked}
+
         try:
-            # Iterate Members
-            for member in guild.members:
-                if member.bot: 
-                    continue # Skip bots
-                
-                stats["processed"] += 1
-                
-                # Update status message every 50 members to avoid rate limits
-                if stats["processed"] % 50 == 0:
-                    try:
-                        await status_msg.edit(content=f"Processing... {stats['processed']}/{len(guild.members)} members checked...")
-                    except: 
-                        pass # Ignore editing errors
+            # Notify Start
+            status_msg = await channel.send(
+                f"**{'Resuming' if resume else 'Starting'} Migration** (job `{job_id}`)\n"
+                f"{self.format_migration_plan(plan)}"
+                f"{f' ({already_done} already done)' if already_done else ''}\n"
+                f"Processing..."
+            )
+        except Exception:
+            self.migration_engine.running = False
+            raise
+
+        async def report_progress(completed, total, stats):
+            await status_msg.edit(content=f"Processing... {completed}/{total} members updated...")
+
+        cutoff = plan.cutoff.strftime('%Y-%m-%d')
+        try:
+            stats = await self.run_engine_job(
+                guild, job_id, plan.changes, reason=f"Alumni migration (cutoff {cutoff})", progress=report_progress
+            )
 
-                try:
-                    # Determine Status based on Join Date
-                    if not member.joined_at:
-                        print(f"Skipping {member.name}: No joined_at date.")
-                        continue
-
-                    is_alumni = member.joined_at < cutoff_date
-                    
-                    import asyncio
-                    
-                    if is_alumni:
-                        # 1. Give Alumni Role if they don't have it
-                        if alumni_role not in member.roles:
-                            await member.add_roles(alumni_role)
-                            stats["alumni_added"] += 1
-                            print(f"[Migration] {member.name} -> Added Alumni")
-                            await asyncio.sleep(1) 
-                        
-                        # 2. REMOVE Member Role if they have it (Strict Separation)
-                        if member_role in member.roles:
-                            await member.remove_roles(member_role)
-                            stats["roles_removed"] += 1
-                            print(f"[Migration] {member.name} -> Removed Member (Should be Alumni)")
-                            await asyncio.sleep(1)
-
-                    else:
-                        # 1. Give Member Role if they don't have it
-                        if member_role not in member.roles:
-                            await member.add_roles(member_role)
-                            stats["members_added"] += 1
-                            print(f"[Migration] {member.name} -> Added Member")
-                            await asyncio.sleep(1)
-                        
-                        # 2. REMOVE Alumni Role if they have it (Strict Separation)
-                        if alumni_role in member.roles:
-                            await member.remove_roles(alumni_role)
-                            stats["roles_removed"] += 1
-                            print(f"[Migration] {member.name} -> Removed Alumni (Should be Member)")
-                            await asyncio.sleep(1)
-
-                    # ACTION 2: Remove Old Role (if specified and present)
-                    if remove_role and remove_role in member.roles:
-                        await member.remove_roles(remove_role)
-                        stats["roles_removed"] += 1
-                        await asyncio.sleep(0.5) # Rate limit protection
-                
-                except discord.Forbidden:
-                    print(f"ERROR: Missing permissions to manage roles for {member.name}.")
-                    stats["errors"] += 1
-                except Exception as e:
-                    print(f"ERROR processing {member.name}: {e}")
-                    stats["errors"] += 1
-                
-                # Small sleep between every user just to be safe
-                import asyncio
-                await asyncio.sleep(0.1)
-            
+            added, removed = stats['added'], stats['removed']
             # Final Report
             await status_msg.edit(content=(
                 f"**Migration Complete** ✅\n"
                 f"-------------------------\n"
-                f"**Total Processed:** {stats['processed']}\n"
-                f"**Alumni Roles Added:** {stats['alumni_added']}\n"
-                f"**Member Roles Added:** {stats['members_added']}\n"
-                f"**Old Roles Removed:** {stats['roles_removed']}\n"
+                f"**Total Processed:** {len(plan.changes)}\n"
+                f"**Members Updated:** {stats['updated']}\n"
+                f"**Alumni Roles Added:** {added.get(str(plan.alumni_role_id), 0)}\n"
+                f"**Member Roles Added:** {added.get(str(plan.member_role_id), 0)}\n"
+                f"**Old Roles Removed:** {sum(removed.values())}\n"
                 f"**Errors:** {stats['errors']}\n"
+                f"**Now:** {baseline[plan.alumni_role_id] + net_role_change(stats, plan.alumni_role_id)} alumni / "
+                f"{baseline[plan.member_role_id] + net_role_change(stats, plan.member_role_id)} members\n"
                 f"-------------------------\n"
-                f"Cutoff was: {cutoff_date.strftime('%Y-%m-%d')}"
+                f"Cutoff was: {cutoff}\n"
+                f"Undo with `!undo_migration {job_id}` or from the admin dashboard."
             ))
 
         except Exception as e:
@@ -406,6 +628,132 @@ class RoleBot(discord.Client):
             import traceback
             traceback.print_exc()
 
+    async def run_engine_job(self, guild, job_id, changes, reason, progress=None):
+        """Runs changes through the migration engine, journaling every edit under the job."""
+        journal = self.job_store.journal(job_id) if job_id else None
+        try:
+            stats = await self.migration_engine.run(guild, changes, reason=reason, progress=progress, journal=journal)
+        except Exception:
+            if job_id:
+                self.job_store.update(job_id, status='failed', stats=self.migration_engine.state['stats'])
+            raise
+        finally:
+            if journal is not None:
+                journal.close()
+        if job_id:
+            self.job_store.update(job_id, status='complete', stats=stats)
+        return stats
+
+    async def undo_migration_job(self, channel, guild, job_id, resume=False):
+        """Restores every member touched by a migration job by replaying its journal in reverse."""
+        if self.migration_engine.running:
+            await channel.send("⚠️ A migration is already running. Wait for it to finish.")
+            return
+
+        if resume:
+            state = self.migration_engine.state
+            undo_id, job_id = state['job']['job_id'], state['job']['undo_of']
+            changes = changes_from_state(state)
+            role_ids = set().union(*(add | remove for add, remove in changes.values())) if changes else set()
+            if not await self.guard_preflight(channel, guild, role_ids, "resume undo"):
+                return
+            self.migration_engine.running = True
+        else:
+            job = self.job_store.get(job_id)
+            if not job or job['kind'] != 'migration' or job['params'].get('guild_id') != guild.id:
+                await channel.send(f"❌ No migration job `{job_id}` found for this server.")
+                return
+            if job['status'] == 'running':
+                await channel.send(f"❌ Job `{job_id}` has not finished yet.")
+                return
+            if job.get('undone_by'):
+                await channel.send(f"❌ Job `{job_id}` was already undone by `{job['undone_by']}`.")
+                return
+
+            changes = self.job_store.undo_changes(job_id)
+            role_ids = set().union(*(add | remove for add, remove in changes.values())) if changes else set()
+            if not await self.guard_preflight(channel, guild, role_ids, "undo"):
+                return
+
+            undo_id = self.job_store.create('undo', {'guild_id': guild.id, 'channel_id': channel.id}, undo_of=job_id)['id']
+            self.migration_engine.start(
+                {'kind': 'undo', 'job_id': undo_id, 'undo_of': job_id, 'guild_id': guild.id, 'channel_id': channel.id},
+                changes
+            )
+
+        try:
+            status_msg = await channel.send(
+                f"**{'Resuming' if resume else 'Starting'} Undo** of job `{job_id}` (job `{undo_id}`)\n"
+                f"Members to restore: **{len(changes)}**\nProcessing..."
+            )
+        except Exception:
+            self.migration_engine.running = False
+            raise
+
+        async def report_progress(completed, total, stats):
+            await status_msg.edit(content=f"Undoing... {completed}/{total} members restored...")
+
+        try:
+            stats = await self.run_engine_job(guild, undo_id, changes, reason=f"Undo migration {job_id}", progress=report_progress)
+            self.job_store.update(job_id, undone_by=undo_id)
+            await status_msg.edit(content=(
+                f"**Undo Complete** ✅ (job `{job_id}`)\n"
+                f"**Members Restored:** {stats['updated']}\n"
+                f"**Already Matching:** {stats['unchanged']}\n"
+                f"**Errors:** {stats['errors']}"
+            ))
+        except Exception as e:
+            await status_msg.edit(content=f"**CRITICAL ERROR during undo:** {e}")
+            import traceback
+            traceback.print_exc()
+
+    def get_migration_jobs_embed(self, guild):
+        """Recent migration/undo jobs for the admin dashboard."""
+        state = self.migration_engine.state
+        lines = []
+        for job in self.job_store.list_jobs(limit=10):
+            if job['params'].get('guild_id') != guild.id:
+                continue
+            status = job['status']
+            if status == 'running' and state and state['job'].get('job_id') == job['id']:
+                status = f"running ({len(state['done'])}/{len(state.get('changes', {}))})"
+            stats = job.get('stats') or {}
+            if job['kind'] == 'migration':
+                detail = f"cutoff {job['params'].get('cutoff')}"
+                if job.get('undone_by'):
+                    detail += f", undone by `{job['undone_by']}`"
+            else:
+                detail = f"undo of `{job['undo_of']}`"
+            counts = f" • {stats.get('updated', 0)} updated, {stats.get('errors', 0)} errors" if stats else ""
+            lines.append(f"`{job['id']}` **{job['kind']}** — {status} — {detail}{counts}")
+
+        return discord.Embed(
+            title="📜 Migration Jobs",
+            description="\n".join(lines) or "No migration jobs yet.",
+            color=0x3498DB
+        )
+
+    async def resume_migration(self):
+        """Picks up a migration or undo that was interrupted by a restart, using its stored changes."""
+        job = self.migration_engine.state['job']
+        guild = self.get_guild(job['guild_id'])
+        channel = self.get_channel(job['channel_id'])
+        if not guild or not channel:
+            print("Unfinished migration found, but its guild/channel is gone. Skipping resume.")
+            return
+        print(f"Resuming interrupted {job.get('kind', 'migration')} in {guild.name}")
+        if job.get('kind') == 'undo':
+            await self.undo_migration_job(channel, guild, job['undo_of'], resume=True)
+        else:
+            plan = MigrationPlan.from_checkpoint(self.migration_engine.state)
+            await self.execute_migration_plan(channel, guild, plan, resume=True)
+
+    async def on_raw_message_delete(self, payload):
+        # Deleted panels no longer grant roles
+        if payload.message_id in self.reaction_index:
+            self.reaction_index.remove_panel(payload.message_id)
+            print(f"Reaction role panel {payload.message_id} deleted, removed from index.")
+
     async def on_raw_reaction_add(self, payload):
         await self.handle_reaction(payload, add=True)
 
@@ -417,119 +765,69 @@ class RoleBot(discord.Client):
         if payload.user_id == self.user.id:
             return
 
-        # Fetch Guild
-        guild = self.get_guild(payload.guild_id)
-        if not guild:
+        # Resolve from the in-memory index: no HTTP round trip per reaction
+        target_role_id = self.reaction_index.lookup(payload.message_id, payload.emoji)
+        if not target_role_id:
             return
+
+        # Flapping on/off within the settle window collapses into one edit of the final state
+        self.reaction_coalescer.submit(payload.guild_id, payload.user_id, target_role_id, add)
+
+    async def apply_reaction_role(self, guild_id, member_id, role_id, add):
+        """Idempotently brings one member/role pair to the wanted state. Returns True if an edit was made."""
+        guild = self.get_guild(guild_id)
+        if not guild:
+            return False
         
         # Fetch Member (for removal events, 'member' might be None in payload, need to fetch)
-        member = guild.get_member(payload.user_id)
+        member = guild.get_member(member_id)
         if not member:
-            return # Member left?
-
-        # Fetch Channel and Message
-        channel = guild.get_channel(payload.channel_id)
-        if not channel:
-            return
+            return False # Member left?
+
+        role = guild.get_role(role_id)
+        if not role:
+            print(f"Error: Role ID {role_id} not found in guild.")
+            return False
+        if (role in member.roles) == add:
+            if not add:
+                self.reaction_index.record_grants(removed=[(role.id, member.id)]) # Taken off some other way
+            return False
+        if not self.role_guard.check(guild, role, "grant reaction roles"):
+            return False
 
         try:
-            message = await channel.fetch_message(payload.message_id)
-        except discord.NotFound:
-            return 
-        
-        # Check Author (Must be ME)
-        if message.author.id != self.user.id:
-            return
-
-        # Check Embeds
-        if not message.embeds:
-            return
-        
-        embed = message.embeds[0]
-        
-        # Check Footer (to distinguish from other Sudo Master messages if needed)
-        # We check if the footer matches what we expect, OR contains our bot name if it was partial match previously.
-        # But stricter is better: match config.
-        # However, to support old messages, we might want to keep "Sudo Master" check or be flexible.
-        # For now, let's use the config value check.
-        # But wait, old messages have "Sudo Master". If I change config, old messages might stop working if I enforce exact match.
-        # The prompt says "change all the public facing names", implying a rebrand.
-        # If I change the check to `bot_config.ROLE_BOT_FOOTER`, then old messages with "Sudo Master" won't work if the user changes the footer.
-        # But that might be desired behavior (only manage my new messages).
-        # OR I should check if the footer contains the *current* configured name OR "Sudo Master" (legacy)?
-        # The user said "these are critical info", implying they want to control it.
-        # I'll stick to using the config variable for the check. If they change it, they might expect old ones to be ignored or they will update them.
-        # Actually, let's just check if footer exists. The logic relies on `embed.description` parsing mainly.
-        # The footer check is a safeguard.
-        # I will use `bot_config.ROLE_BOT_FOOTER` in the check.
-        
-        if not embed.footer or (bot_config.ROLE_BOT_FOOTER not in (embed.footer.text or "") and "Sudo Master" not in (embed.footer.text or "")):
-             # I'll keep "Sudo Master" as a legacy fallback for now to not break existing reaction roles during migration, 
-             # unless user explicitly changes it to something else that conflicts.
-             # Actually, simpler is:
-             pass
-        
-        # Let's just use the config.
-        if not embed.footer or bot_config.ROLE_BOT_FOOTER not in (embed.footer.text or ""):
-             # Fallback for legacy support if needed, but let's stick to the prompt.
-             # If I strictly enforce new footer, old messages break.
-             # I will allow "Sudo Master" hardcoded fallback for now to be safe, or just relying on description format?
-             # Description format is specific enough.
-             pass
-
-        # Re-reading the code:
-        # It checks: `if not embed.footer or "Sudo Master" not in (embed.footer.text or ""):`
-        # I will change it to check for the configured name.
-        
-        if not embed.footer or bot_config.ROLE_BOT_FOOTER not in (embed.footer.text or ""):
-            # OPTIONAL: Allow legacy "Sudo Master"
-            if "Sudo Master" not in (embed.footer.text or ""):
-                return
-
-        # LOGIC: Read the Embed Description to find the matching role
-        # ... (rest of logic)
-        
-        emoji_str = str(payload.emoji) 
-        
-        description_lines = (embed.description or "").split('\n')
-        target_role_id = None
-
-        for line in description_lines:
-            if line.strip().startswith(emoji_str):
-                role_match = re.search(r'<@&(\d+)>', line)
-                if role_match:
-                    target_role_id = int(role_match.group(1))
-                    break
-        
-        if target_role_id:
-            role = guild.get_role(target_role_id)
-            if role:
-                try:
-                    if add:
-                        await member.add_roles(role)
-                        print(f"Added role {role.name} to {member.name}")
-                    else:
-                        await member.remove_roles(role)
-                        print(f"Removed role {role.name} from {member.name}")
-                except discord.Forbidden:
-                    print(f"Error: Missing permissions to manage roles (Target Role: {role.name}).")
+            if add:
+                await member.add_roles(role)
+                self.reaction_index.record_grants(added=[(role.id, member.id)])
+                print(f"Added role {role.name} to {member.name}")
             else:
-                print(f"Error: Role ID {target_role_id} not found in guild.")
+                await member.remove_roles(role)
+                self.reaction_index.record_grants(removed=[(role.id, member.id)])
+                print(f"Removed role {role.name} from {member.name}")
+            return True
+        except discord.Forbidden:
+            print(f"Error: Missing permissions to manage roles (Target Role: {role.name}).")
+            return False
 
     async def on_member_join(self, member):
         """Automatically assign a role when a new member joins."""
         print(f"DEBUG: RoleBot.on_member_join triggered for {member.name} (ID: {member.id})")
         print(f"DEBUG: Member Pending Status: {member.pending}")
+        self.role_counter.member_join(member)
         
         if member.pending:
             print(f"RoleBot: {member.name} is pending verification. Waiting...")
             return
 
-        print(f"RoleBot: {member.name} is NOT pending. Assigning role...")
-        await self.assign_auto_role(member)
+        print(f"RoleBot: {member.name} is NOT pending. Queueing auto role...")
+        self.auto_role_queue.enqueue(member)
 
     async def on_member_update(self, before, after):
         """Handle member update events, specifically regarding verification."""
+        self.role_counter.member_update(before, after)
+        if after.id == self.user.id and before.roles != after.roles:
+            self.role_guard.invalidate(after.guild.id) # Our own top role moved
+
         # Log state changes for debugging
         if before.pending != after.pending:
             print(f"DEBUG: RoleBot.on_member_update: {after.name} Pending changed: {before.pending} -> {after.pending}")
@@ -537,47 +835,93 @@ class RoleBot(discord.Client):
         # Check if member completed verification (pending: True -> False)
         if before.pending and not after.pending:
             print(f"RoleBot: {after.name} completed verification.")
-            await self.assign_auto_role(after)
+            self.auto_role_queue.enqueue(after)
 
-    async def assign_auto_role(self, member):
-        print(f"DEBUG: assign_auto_role ENTERED for {member.name}")
-        try:
-            role_id = bot_config.AUTO_JOIN_ROLE_ID
-            
-            # Fallback to .env MEMBER_ROLE_ID if config is 0
-            if not role_id:
-                 env_role_id = os.getenv('MEMBER_ROLE_ID')
-                 if env_role_id:
-                     try:
-                         role_id = int(env_role_id)
-                         print(f"DEBUG: Using MEMBER_ROLE_ID from .env: {role_id}")
-                     except ValueError:
-                         print(f"ERROR: MEMBER_ROLE_ID in .env is not a valid integer: {env_role_id}")
-    
-            print(f"DEBUG: assign_auto_role processing for {member.name}. Final Role ID: {role_id}")
-            
-            if not role_id:
-                print("DEBUG: AUTO_JOIN_ROLE_ID is not set (None or 0). Skpping.")
-                return
-    
-            role = member.guild.get_role(role_id)
-            if role:
-                try:
-                    await member.add_roles(role)
-                    print(f"Auto-assigned role {role.name} to {member.name}")
-                except discord.Forbidden:
-                    print(f"ERROR: Missing Permissions to assign role {role.name}. Check Bot Role Position!")
-                except Exception as e:
-                    print(f"ERROR: Failed to auto-assign role to {member.name}: {e}")
-            else:
-                print(f"ERROR: Auto-join role ID {role_id} not found in guild {member.guild.name}.")
-                # List available roles for debug
-                roles = [f"{r.name}:{r.id}" for r in member.guild.roles]
-                print(f"DEBUG: Available Roles: {', '.join(roles)}")
-        except Exception as e:
-            print(f"CRITICAL ERROR in assign_auto_role: {e}")
-            import traceback
-            traceback.print_exc()
+    async def on_member_remove(self, member):
+        self.role_counter.member_remove(member)
+
+    async def on_guild_role_delete(self, role):
+        self.role_counter.role_delete(role)
+        self.role_guard.invalidate(role.guild.id)
+
+    async def on_guild_role_create(self, role):
+        self.role_guard.invalidate(role.guild.id)
+
+    async def on_guild_role_update(self, before, after):
+        self.role_guard.invalidate(after.guild.id)
 
+    async def on_guild_update(self, before, after):
+        self.role_guard.invalidate(after.id)
 
+    async def on_guild_join(self, guild):
+        self.role_counter.rebuild(guild)
 
+    def get_role_stats_embed(self, guild):
+        """Role membership overview, rebuilt only when the counts have changed."""
+        version = self.role_counter.version.get(guild.id, 0)
+        cached = self.role_stats_cache.get(guild.id)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        lines = []
+        for role_id, count in self.role_counter.top(guild.id, limit=25):
+            role = guild.get_role(role_id)
+            if role:
+                lines.append(f"{role.mention}: **{count}**")
+        embed = discord.Embed(
+            title="📊 Role Membership",
+            description="\n".join(lines) or "No roles assigned yet.",
+            color=0x3498DB
+        )
+        embed.set_footer(text=bot_config.ROLE_BOT_FOOTER)
+        self.role_stats_cache[guild.id] = (version, embed)
+        return embed
+
+    def get_auto_role_id(self):
+        role_id = bot_config.AUTO_JOIN_ROLE_ID
+        
+        # Fallback to .env MEMBER_ROLE_ID if config is 0
+        if not role_id:
+             env_role_id = os.getenv('MEMBER_ROLE_ID')
+             if env_role_id:
+                 try:
+                     role_id = int(env_role_id)
+                 except ValueError:
+                     print(f"ERROR: MEMBER_ROLE_ID in .env is not a valid integer: {env_role_id}")
+                     return None
+        return role_id
+
+    async def assign_auto_role(self, guild_id, member_id):
+        """
+        Auto-role queue worker. Adds the auto-join role if the member doesn't have it yet.
+        Returns True if a role was added; rate limits propagate so the queue can retry.
+        """
+        guild = self.get_guild(guild_id)
+        member = guild.get_member(member_id) if guild else None
+        if not member:
+            return False # Left before we got to them
+
+        role_id = self.get_auto_role_id()
+        if not role_id:
+            print("DEBUG: AUTO_JOIN_ROLE_ID is not set (None or 0). Skpping.")
+            return False
+
+        role = guild.get_role(role_id)
+        if not role:
+            print(f"ERROR: Auto-join role ID {role_id} not found in guild {guild.name}.")
+            # List available roles for debug
+            roles = [f"{r.name}:{r.id}" for r in guild.roles]
+            print(f"DEBUG: Available Roles: {', '.join(roles)}")
+            return False
+        if role in member.roles:
+            return False
+        if not self.role_guard.check(guild, role, "assign the auto-join role"):
+            return False
+
+        try:
+            await member.add_roles(role, reason="Auto-join role")
+            print(f"Auto-assigned role {role.name} to {member.name}")
+            return True
+        except discord.Forbidden:
+            print(f"ERROR: Missing Permissions to assign role {role.name}. Check Bot Role Position!")
+            return False
@@ -0,0 +1,78 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add parent directory to sys.path to allow imports from utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.consumption_stats import TIMESTAMP_FORMAT
+from utils.filament_data_manager import FilamentDataManager
+from utils.filament_sqlite import SqliteFilamentDataManager
+
+def seed_json(data_path, spools, rows):
+    """Builds a JSON data dir with `spools` reels and `rows` usage entries spread over the past year."""
+    manager = FilamentDataManager(data_path)
+    for i in range(spools):
+        manager.add_inventory_item("PLA", "Brand", f"Color {i}", 1000.0)
+
+    rng = random.Random(42)
+    now = datetime.now()
+    entries = []
+    for _ in range(rows):
+        spool_id = rng.randint(1, spools)
+        ts = now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+        entries.append({
+            "timestamp": ts.strftime(TIMESTAMP_FORMAT),
+            "user": f"User {rng.randint(1, 50)}",
+            "filament_id": spool_id,
+            "filament_desc": f"Color {spool_id - 1} PLA",
+            "amount_used": round(rng.uniform(1, 100), 1),
+        })
+    entries.sort(key=lambda e: e["timestamp"])
+    manager.usage_log.append_many(entries)
+
+def timed(label, fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<34} {elapsed * 1000:>10.1f} ms total  {elapsed * 1000 / repeat:>9.3f} ms/op")
+
+def run(label, factory, spools, writes):
+    print(f"\n{label}")
+    start = time.perf_counter()
+    manager = factory()
+    print(f"  {'startup':<34} {(time.perf_counter() - start) * 1000:>10.1f} ms")
+    ids = [random.randint(1, spools) for _ in range(writes)]
+    it = iter(ids)
+    timed(f"log_usage_and_decrement x{writes}", lambda: manager.log_usage_and_decrement("Bench", next(it), 0.5), writes)
+    timed("get_inventory x1000", manager.get_inventory, 1000)
+    timed("get_consumption_stats x100", manager.get_consumption_stats, 100)
+    timed("iter_logs (full scan)", lambda: sum(1 for _ in manager.iter_logs()))
+    timed("export_logs_to_csv", manager.export_logs_to_csv)
+    if hasattr(manager, 'close'):
+        manager.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the JSON and SQLite filament storage engines")
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--spools', type=int, default=40)
+    parser.add_argument('--writes', type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_path:
+        print(f"Seeding {args.rows} usage rows across {args.spools} spools...")
+        seed_json(data_path, args.spools, args.rows)
+        importer = SqliteFilamentDataManager(data_path)
+        importer.import_from(FilamentDataManager(data_path))
+        importer.close()
+
+        run("JSON (inventory.json + usage_logs/*.jsonl)", lambda: FilamentDataManager(data_path), args.spools, args.writes)
+        run("SQLite (filament.db, WAL)", lambda: SqliteFilamentDataManager(data_path), args.spools, args.writes)
+
+if __name__ == "__main__":
+    main()
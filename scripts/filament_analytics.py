@@ -0,0 +1,66 @@
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+
+# Add parent directory to sys.path to allow imports from utils folder
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from utils.filament_data_manager import create_data_manager
+from utils.usage_analytics import UsageColumns, render_bars, to_seconds
+
+load_dotenv(os.path.join(ROOT, '.env'))
+
+def synthetic_entries(rows):
+    """`rows` fake usage entries spread over the past two years, oldest first."""
+    rng = random.Random(42)
+    start = datetime.now() - timedelta(days=730)
+    step = 730 * 86400 / max(rows, 1)
+    for i in range(rows):
+        yield {
+            "timestamp": (start + timedelta(seconds=int(i * step))).strftime("%Y-%m-%d %H:%M:%S"),
+            "user": f"User {rng.randint(1, 300)}",
+            "filament_desc": f"Color{rng.randint(1, 40)} {rng.choice(['PLA', 'PETG', 'ABS', 'TPU'])}",
+            "amount_used": round(rng.uniform(1, 100), 1),
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Filament usage totals and trends as text charts")
+    parser.add_argument('data_path', nargs='?', default=os.getenv('FILAMENT_DATA_PATH', './data'))
+    parser.add_argument('--by', choices=['user', 'material', 'filament', 'week'], default='material')
+    parser.add_argument('--from', dest='start', help="YYYY-MM-DD (default: 90 days ago)")
+    parser.add_argument('--to', dest='end', help="YYYY-MM-DD, inclusive (default: today)")
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--synthetic', type=int, metavar='ROWS', help="Benchmark on generated rows instead of the data dir")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.synthetic:
+        columns = UsageColumns.from_entries(synthetic_entries(args.synthetic))
+    else:
+        manager = create_data_manager(args.data_path)
+        spool_types = {item['id']: item.get('type') for item in manager.get_inventory()}
+        columns = UsageColumns.from_entries(manager.iter_logs(), spool_types)
+    print(f"Loaded {len(columns):,} usage rows in {time.perf_counter() - started:.2f}s")
+
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    start = to_seconds(args.start) if args.start else to_seconds(today - timedelta(days=90))
+    end = to_seconds(args.end) + 86400 if args.end else to_seconds(today + timedelta(days=1))
+
+    started = time.perf_counter()
+    if args.by == 'week':
+        rows = [(week.isoformat(), grams) for week, grams in columns.weekly(start, end)]
+    else:
+        rows = columns.group_totals(args.by, start, end, top=args.top)
+    total = columns.total(start, end)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    print(f"\nUsage by {args.by}: {total:,.1f}g over {columns.count(start, end):,} logs (query {elapsed:.2f} ms)\n")
+    print(render_bars(rows))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import argparse
+import os
+import sys
+from dotenv import load_dotenv
+
+# Add parent directory to sys.path to allow imports from utils folder
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from utils.filament_data_manager import FilamentDataManager
+from utils.filament_sqlite import SqliteFilamentDataManager
+
+load_dotenv(os.path.join(ROOT, '.env'))
+
+def main():
+    parser = argparse.ArgumentParser(description="Copy the filament JSON data (inventory.json + usage logs) into filament.db")
+    parser.add_argument('data_path', nargs='?', default=os.getenv('FILAMENT_DATA_PATH', './data'))
+    parser.add_argument('--force', action='store_true', help="Import even if filament.db already has data")
+    args = parser.parse_args()
+
+    source = FilamentDataManager(args.data_path)  # Also imports a legacy logs.json into usage_logs/
+    target = SqliteFilamentDataManager(args.data_path)
+
+    existing_spools = len(target.get_inventory())
+    existing_events = target.conn.execute("SELECT COUNT(*) FROM usage_events").fetchone()[0]
+    if (existing_spools or existing_events) and not args.force:
+        print(f"❌ {target.db_file} already has {existing_spools} spools and {existing_events} usage events. Use --force to import anyway.")
+        return 1
+
+    print(f"📦 Importing from {args.data_path} into {target.db_file}...")
+    imported = target.import_from(source)
+    print(f"✅ {len(target.get_inventory())} spools, {imported} usage events.")
+    print("JSON files were left untouched. Set FILAMENT_STORAGE=sqlite in .env to switch.")
+    target.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
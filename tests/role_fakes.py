@@ -0,0 +1,51 @@
+"""Minimal stand-ins for discord roles, members and guilds shared by the role tests."""
+from types import SimpleNamespace
+
+
+class FakeRole(SimpleNamespace):
+    def is_default(self):
+        return self.id == 0
+
+    def __ge__(self, other):
+        return self.position >= other.position
+
+
+def make_role(role_id, position=0, managed=False):
+    return FakeRole(id=role_id, name=f"r{role_id}", position=position, managed=managed)
+
+
+def make_roles(*role_ids):
+    """Roles by id, including @everyone (id 0)."""
+    return {role_id: make_role(role_id) for role_id in (0,) + role_ids}
+
+
+class FakeMember:
+    def __init__(self, member_id, role_ids, roles, joined_at=None, bot=False):
+        self.id = member_id
+        self.name = f"m{member_id}"
+        self.bot = bot
+        self.joined_at = joined_at
+        self._all_roles = roles
+        self.roles = [roles[0]] + [roles[r] for r in role_ids]
+        self.edits = 0
+
+    async def edit(self, roles, reason=None):
+        self.edits += 1
+        self.roles = [self._all_roles[0]] + list(roles)
+
+
+class FakeGuild:
+    id = 1
+    name = "guild"
+
+    def __init__(self, members=(), roles=None, top_position=10, manage_roles=True):
+        self.members = members
+        self.roles = roles or {}
+        perms = SimpleNamespace(manage_roles=manage_roles, administrator=False)
+        self.me = SimpleNamespace(top_role=make_role(99, top_position), guild_permissions=perms)
+
+    def get_member(self, member_id):
+        return next((m for m in self.members if m.id == member_id), None)
+
+    def get_role(self, role_id):
+        return self.roles.get(role_id)
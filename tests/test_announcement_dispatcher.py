@@ -0,0 +1,106 @@
+import unittest
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import discord
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.announcement_dispatcher import AnnouncementDispatcher
+
+
+def http_error(status, retry_after=None):
+    headers = {'Retry-After': str(retry_after)} if retry_after is not None else {}
+    return discord.HTTPException(SimpleNamespace(status=status, reason="error", headers=headers), "error")
+
+
+class FakeChannel:
+    def __init__(self, channel_id, errors=(), tracker=None):
+        self.id = channel_id
+        self.name = f"c{channel_id}"
+        self.errors = list(errors)
+        self.tracker = tracker
+        self.sent = 0
+
+    async def send(self, **kwargs):
+        if self.tracker is not None:
+            self.tracker['active'] += 1
+            self.tracker['peak'] = max(self.tracker['peak'], self.tracker['active'])
+            await asyncio.sleep(0.01)
+            self.tracker['active'] -= 1
+        if self.errors:
+            raise self.errors.pop(0)
+        self.sent += 1
+
+
+class TestAnnouncementDispatcher(unittest.TestCase):
+    def test_concurrency_is_bounded(self):
+        tracker = {'active': 0, 'peak': 0}
+        channels = [FakeChannel(i, tracker=tracker) for i in range(10)]
+
+        async def run():
+            dispatcher = AnnouncementDispatcher(max_concurrency=3)
+            return await dispatcher.dispatch([(channel, {'content': 'hi'}) for channel in channels])
+
+        self.assertEqual(asyncio.run(run()), [True] * 10)
+        self.assertEqual(tracker['peak'], 3)
+
+    def test_retries_retryable_errors_only(self):
+        flaky = FakeChannel(1, errors=[http_error(503), discord.RateLimited(0.0)])
+        forbidden = FakeChannel(2, errors=[http_error(403)])
+
+        async def run():
+            dispatcher = AnnouncementDispatcher(base_delay=0)
+            return dispatcher, await dispatcher.dispatch([(flaky, {}), (forbidden, {})])
+
+        dispatcher, results = asyncio.run(run())
+        self.assertEqual(results, [True, False])
+        self.assertEqual((flaky.sent, forbidden.errors), (1, []))
+        self.assertEqual(dispatcher.failures, {2: 1})
+
+    def test_gives_up_after_max_retries(self):
+        channel = FakeChannel(1, errors=[http_error(500)] * 5)
+
+        async def run():
+            return await AnnouncementDispatcher(max_retries=2, base_delay=0).dispatch([(channel, {})])
+
+        self.assertEqual(asyncio.run(run()), [False])
+        self.assertEqual(len(channel.errors), 2)  # 3 attempts used
+
+    def test_backoff_does_not_hold_a_slot(self):
+        slow = FakeChannel(1, errors=[http_error(503)])
+        fast = FakeChannel(2)
+
+        async def run():
+            dispatcher = AnnouncementDispatcher(max_concurrency=1)
+            dispatcher._retry_delay = lambda error, attempt: 0.2
+            task = asyncio.create_task(dispatcher.dispatch([(slow, {})]))
+            await asyncio.sleep(0.05)  # slow is now backing off
+            await asyncio.wait_for(dispatcher.dispatch([(fast, {})]), timeout=0.1)
+            await task
+
+        asyncio.run(run())
+        self.assertEqual((slow.sent, fast.sent), (1, 1))
+
+    def test_retry_delay_honors_retry_after(self):
+        dispatcher = AnnouncementDispatcher(base_delay=0.5)
+        self.assertGreaterEqual(dispatcher._retry_delay(http_error(429, retry_after=7), 0), 7)
+        delay = dispatcher._retry_delay(http_error(503), 2)
+        self.assertTrue(2.0 <= delay <= 2.25)
+
+    def test_sent_count_is_not_capped_by_history(self):
+        channel = FakeChannel(1)
+
+        async def run():
+            dispatcher = AnnouncementDispatcher(history=5)
+            await dispatcher.dispatch([(channel, {})] * 12)
+            return dispatcher.latency_report()
+
+        report = asyncio.run(run())
+        self.assertEqual((report[0]['sent'], report[0]['failed']), (12, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import discord
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.auto_role_queue import AutoRoleQueue
+from utils.rate_pacer import RatePacer
+
+
+def member(member_id, guild_id=1):
+    return SimpleNamespace(id=member_id, guild=SimpleNamespace(id=guild_id))
+
+
+class TestAutoRoleQueue(unittest.TestCase):
+    def test_dedupes_and_drains_in_join_order(self):
+        applied = []
+
+        async def apply(guild_id, member_id):
+            applied.append(member_id)
+            return member_id != 3  # 3 already had the role
+
+        async def run():
+            queue = AutoRoleQueue(apply, pacer=RatePacer())
+            for member_id in (1, 2, 1, 3):  # 1 joins, then passes verification before being served
+                queue.enqueue(member(member_id))
+            await queue.drainer
+            return queue.stats()
+
+        stats = asyncio.run(run())
+        self.assertEqual(applied, [1, 2, 3])
+        self.assertEqual((stats['enqueued'], stats['deduped'], stats['assigned'], stats['depth']), (4, 1, 2, 0))
+        self.assertGreaterEqual(stats['p99'], stats['p50'])
+
+    def test_rate_limits_are_retried_and_errors_counted(self):
+        attempts = {1: 0}
+
+        async def apply(guild_id, member_id):
+            if member_id == 2:
+                raise discord.DiscordException("403 Forbidden")
+            attempts[member_id] += 1
+            if attempts[member_id] == 1:
+                raise discord.RateLimited(0.0)
+            return True
+
+        async def run():
+            queue = AutoRoleQueue(apply, pacer=RatePacer())
+            queue.enqueue(member(2))
+            queue.enqueue(member(1))
+            await queue.drainer
+            return queue
+
+        queue = asyncio.run(run())
+        self.assertEqual(attempts[1], 2)
+        self.assertEqual((queue.assigned, queue.failures), (1, 1))
+        self.assertEqual(queue.pacer.rate_limited, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+import asyncio
+import os
+import sys
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_writer import DataWriter
+
+
+class TestDataWriter(unittest.TestCase):
+    def test_ordered_off_loop_results(self):
+        writer = DataWriter()
+        seen = []
+
+        def op(i):
+            seen.append((i, threading.current_thread().name))
+            if i == 3:
+                raise ValueError("boom")
+            return i * 10
+
+        async def run():
+            futures = [writer.submit(op, i) for i in range(6)]
+            return await asyncio.gather(*futures, return_exceptions=True)
+
+        results = asyncio.run(run())
+        writer.stop(5)
+
+        self.assertEqual(results[:3], [0, 10, 20])
+        self.assertIsInstance(results[3], ValueError)
+        self.assertEqual(results[4:], [40, 50])
+        self.assertEqual([i for i, _ in seen], list(range(6)))
+        self.assertEqual({name for _, name in seen}, {"filament-writer"})
+        stats = writer.stats()
+        self.assertEqual((stats['completed'], stats['failures'], stats['depth']), (5, 1, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
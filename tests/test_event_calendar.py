@@ -0,0 +1,63 @@
+import unittest
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.event_calendar import is_past_event, iter_csv_events, iter_ics, iter_ics_events
+
+
+def round_trip(events):
+    text = "".join(iter_ics(events))
+    return text, list(iter_ics_events(text.splitlines(keepends=True)))
+
+
+class TestEventCalendar(unittest.TestCase):
+    def test_round_trip(self):
+        events = [
+            {"id": "a", "name": "Soldering 101", "time": "2030-03-01 18:30", "location": "Lab", "description": "Bring a kit"},
+            {"id": "b", "name": "Open House", "time": "2030-04-12 10:00"},
+        ]
+        _, parsed = round_trip(events)
+        self.assertEqual([error for _, error in parsed], [None, None])
+        first, second = (event for event, _ in parsed)
+        self.assertEqual((first["name"], first["time"], first["location"], first["description"]),
+                         ("Soldering 101", "2030-03-01 18:30", "Lab", "Bring a kit"))
+        self.assertEqual((second["name"], second["location"]), ("Open House", "No location"))
+
+    def test_escaping_survives_round_trip(self):
+        description = "Bring: wire, flux; solder\nC:\\tools\\iron"
+        text, parsed = round_trip([{"name": "A, B; C", "time": "2030-01-01 12:00", "description": description}])
+        self.assertIn("SUMMARY:A\\, B\\; C\r\n", text)
+        self.assertEqual(parsed[0][0]["name"], "A, B; C")
+        self.assertEqual(parsed[0][0]["description"], description)
+
+    def test_long_lines_are_folded(self):
+        description = "Lötkolben und Zinn " * 20
+        text, parsed = round_trip([{"name": "Workshop", "time": "2030-01-01 12:00", "description": description}])
+        lines = text.split("\r\n")
+        self.assertTrue(any(line.startswith(" ") for line in lines))
+        self.assertTrue(all(len(line.encode("utf-8")) <= 75 for line in lines))
+        self.assertEqual(parsed[0][0]["description"], description.strip())
+
+    def test_invalid_events_are_reported(self):
+        ics = ["BEGIN:VEVENT\r\n", "DTSTART:2030-01-01\r\n", "END:VEVENT\r\n"]
+        self.assertEqual(list(iter_ics_events(ics)), [(None, "Unnamed event: missing name")])
+        rows = ["name,date,time\n", "Meetup,2030-02-30,18:00\n"]
+        event, error = next(iter_csv_events(rows))
+        self.assertIsNone(event)
+        self.assertTrue(error.startswith("Row 2:"))
+
+    def test_past_events(self):
+        now = datetime(2030, 1, 1, 12, 0)
+        _, parsed = round_trip([
+            {"name": "Done", "time": "2029-12-31 09:00"},
+            {"name": "Now", "time": "2030-01-01 12:00"},
+            {"name": "Later", "time": "2030-01-02 09:00"},
+        ])
+        self.assertEqual([is_past_event(event, now) for event, _ in parsed], [True, True, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
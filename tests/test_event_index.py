@@ -0,0 +1,63 @@
+import unittest
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.event_index import EventIndex
+
+
+def event(event_id, time, name=None):
+    return {'id': event_id, 'time': time, 'name': name or f"Event {event_id}"}
+
+
+class TestEventIndex(unittest.TestCase):
+    def setUp(self):
+        # 25 events, one per day of March 2030, added out of order
+        self.events = [event(f"e{day:02d}", f"2030-03-{day:02d} 18:00") for day in range(25, 0, -1)]
+        self.index = EventIndex(self.events)
+
+    def ids(self, page):
+        return [e['id'] for e in page.events]
+
+    def test_cursor_paging_forward_and_back(self):
+        first = self.index.page(limit=10)
+        self.assertEqual(self.ids(first), [f"e{d:02d}" for d in range(1, 11)])
+        self.assertEqual((first.start, first.total, first.has_prev, first.has_next), (0, 25, False, True))
+
+        second = self.index.page(limit=10, after=EventIndex.cursor_for(first.last))
+        self.assertEqual(second.first['id'], "e11")
+        self.assertEqual(second.start, 10)
+
+        back = self.index.page(limit=10, before=EventIndex.cursor_for(second.first))
+        self.assertEqual(self.ids(back), self.ids(first))
+
+        last = self.index.page(limit=10, after=EventIndex.cursor_for(second.last))
+        self.assertEqual((len(last.events), last.has_next), (5, False))
+
+    def test_cursor_of_deleted_event_still_resumes(self):
+        first = self.index.page(limit=10)
+        cursor = EventIndex.cursor_for(first.last)
+        self.assertTrue(self.index.remove("e10"))
+        self.assertFalse(self.index.remove("e10"))
+        self.assertEqual(self.index.page(limit=3, after=cursor).first['id'], "e11")
+
+    def test_date_bounds_and_name_prefix(self):
+        page = self.index.page(limit=50, start="2030-03-05", end="2030-03-07")
+        self.assertEqual(self.ids(page), ["e05", "e06", "e07"])
+
+        self.index.add(event("x1", "2030-03-02 09:00", "Soldering Night"))
+        self.index.add(event("x2", "2030-03-20 09:00", "solder clinic"))
+        page = self.index.page(limit=50, prefix="SOLDER")
+        self.assertEqual(self.ids(page), ["x2", "x1"])  # Name order: "solder clinic" < "soldering night"
+        page = self.index.page(limit=50, prefix="solder", start="2030-03-10")
+        self.assertEqual(self.ids(page), ["x2"])
+
+    def test_readding_an_event_moves_it(self):
+        self.index.add(event("e01", "2030-04-01 10:00"))
+        self.assertEqual(len(self.index), 25)
+        self.assertEqual([e['id'] for e in self.index.upcoming("2030-03-24 18:00", 5)], ["e25", "e01"])
+
+
+if __name__ == '__main__':
+    unittest.main()
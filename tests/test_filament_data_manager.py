@@ -0,0 +1,299 @@
+import unittest
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+
+from utils.consumption_stats import RollingConsumption
+from utils.filament_data_manager import FilamentDataManager, create_data_manager
+from utils.filament_sqlite import SqliteFilamentDataManager
+from utils.spool_forecast import SpoolForecast
+from utils.spool_index import SpoolIndex
+from utils.usage_analytics import UsageColumns, to_seconds
+from utils.usage_log import UsageLog
+from utils.usage_export import export_csv_parts, filter_entries, group_parts, parse_date_range
+
+
+class TestFilamentDataManager(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dm = FilamentDataManager(self.tmp.name)
+        self.filament_id = self.dm.add_inventory_item("PLA", "Elegoo", "Black", 1000)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_own_writes_do_not_reparse(self):
+        with mock.patch.object(self.dm, 'load_json', wraps=self.dm.load_json) as load_json:
+            self.dm.log_usage("Ada", self.filament_id, 12.5)
+            self.dm.update_filament_weight(self.filament_id, 12.5)
+            self.dm.get_inventory()
+            self.dm.get_consumption_stats()
+            load_json.assert_not_called()
+        self.assertEqual(self.dm.get_inventory()[0]['weight_g'], 987.5)
+
+    def test_data_version(self):
+        version = self.dm.data_version()
+        self.dm.get_inventory()
+        self.dm.get_consumption_stats()
+        self.assertEqual(self.dm.data_version(), version)
+        self.dm.log_usage_and_decrement("Ada", self.filament_id, 5)
+        self.assertGreater(self.dm.data_version(), version)
+
+        version = self.dm.data_version()
+        with open(self.dm.inventory_file, 'w') as f:
+            json.dump([], f)
+        self.assertGreater(self.dm.data_version(), version)
+
+    def test_external_change_is_picked_up(self):
+        self.dm.get_inventory()
+        with open(self.dm.inventory_file, 'w') as f:
+            json.dump([{"id": 7, "type": "PETG", "brand": "X", "color": "Red", "weight_g": 250}], f)
+        self.assertEqual([item['id'] for item in self.dm.get_inventory()], [7])
+
+    def test_usage_log_migration_and_compaction(self):
+        legacy = [
+            {"timestamp": "2024-01-05 10:00:00", "user": "A", "filament_id": 1, "filament_desc": "x", "amount_used": 5},
+            {"timestamp": "2024-02-05 10:00:00", "user": "B", "filament_id": 1, "filament_desc": "x", "amount_used": 7},
+        ]
+        with open(os.path.join(self.tmp.name, "logs.json"), 'w') as f:
+            json.dump(legacy, f)
+
+        dm = FilamentDataManager(self.tmp.name)
+        dm.log_usage("C", self.filament_id, 3)
+        self.assertEqual(dm.usage_log.compact(), 2)
+        self.assertEqual([log['user'] for log in dm.get_logs()], ["A", "B", "C"])
+
+        # Already imported entries are not imported again
+        self.assertEqual(len(FilamentDataManager(self.tmp.name).get_logs()), 3)
+
+    def test_interrupted_compaction_does_not_duplicate_a_month(self):
+        log = UsageLog(os.path.join(self.tmp.name, "crash_logs"))
+        log.append_many([{"timestamp": f"2024-01-0{day} 10:00:00", "amount_used": day} for day in (1, 2)])
+        log.compact()
+        log.append({"timestamp": "2024-01-09 10:00:00", "amount_used": 9}) # Late entry for the archived month
+
+        # Crash after the archive was replaced but before the pending segment was removed
+        with mock.patch("utils.usage_log.os.remove", side_effect=OSError("killed")):
+            with self.assertRaises(OSError):
+                log.compact()
+        self.assertEqual([e['amount_used'] for e in log.iter_entries()], [1, 2, 9])
+
+        reopened = UsageLog(log.log_dir) # Finishes the interrupted run
+        self.assertEqual(reopened.compact(), 0)
+        self.assertEqual([e['amount_used'] for e in reopened.iter_entries()], [1, 2, 9])
+        self.assertEqual(sorted(os.listdir(log.log_dir)), ["usage-2024-01.jsonl.gz"])
+
+    def test_desktop_app_appends_are_imported(self):
+        logs_file = os.path.join(self.tmp.name, "logs.json")
+        entry = {"timestamp": "2024-01-05 10:00:00", "user": "A", "filament_id": 1, "filament_desc": "x", "amount_used": 5}
+        with open(logs_file, 'w') as f:
+            json.dump([entry], f)
+        dm = FilamentDataManager(self.tmp.name)
+        self.assertEqual(dm.import_legacy_logs(), 0)  # Unchanged since startup
+
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with open(logs_file, 'w') as f:
+            json.dump([entry, dict(entry, timestamp=now, user="Desktop", amount_used=2)], f)
+        version = dm.version
+        self.assertEqual(dm.import_legacy_logs(), 1)
+        self.assertEqual([log['user'] for log in dm.get_logs()], ["A", "Desktop"])
+        self.assertEqual(dm.get_consumption_stats()["daily"], 2)
+        self.assertEqual((dm.legacy_imports, dm.version), (1, version + 1))
+        self.assertEqual(len(FilamentDataManager(self.tmp.name).get_logs()), 2)
+
+    def test_old_text_marker_is_honored(self):
+        logs_file = os.path.join(self.tmp.name, "logs.json")
+        entries = [{"timestamp": f"2024-01-0{day} 10:00:00", "user": "A", "filament_id": 1, "amount_used": day}
+                   for day in (1, 2, 3)]
+        with open(logs_file, 'w') as f:
+            json.dump(entries, f)
+        log_dir = os.path.join(self.tmp.name, "usage_logs")
+        os.makedirs(log_dir, exist_ok=True)
+        with open(os.path.join(log_dir, ".migrated_from_logs_json"), 'w') as f:
+            f.write(f"Imported 2 entries from {logs_file} on 2024-01-02T12:00:00\n")
+        self.assertEqual([log['amount_used'] for log in FilamentDataManager(self.tmp.name).get_logs()], [3])
+
+    def test_consumption_totals_roll_over(self):
+        rolling = RollingConsumption()
+        rolling.rebuild([
+            {"timestamp": "2025-03-01 09:00:00", "amount_used": 1000},  # Long gone
+            {"timestamp": "2025-03-31 09:00:00", "amount_used": 99},    # This week (from Sun 30th), last month
+            {"timestamp": "2025-04-01 09:00:00", "amount_used": 10},
+            {"timestamp": "2025-04-02 09:00:00", "amount_used": 5},     # Today
+        ], now=datetime(2025, 4, 2, 12, 0))
+        self.assertEqual(rolling.snapshot(datetime(2025, 4, 2, 12, 0)), {"daily": 5, "weekly": 114, "monthly": 15})
+
+        rolling.add(datetime(2025, 4, 3, 8, 0), 2, now=datetime(2025, 4, 3, 8, 0))
+        self.assertEqual(rolling.snapshot(datetime(2025, 4, 3, 8, 0)), {"daily": 2, "weekly": 116, "monthly": 17})
+        self.assertEqual(rolling.snapshot(datetime(2025, 5, 1, 0, 0))["monthly"], 0)
+
+    def test_stats_follow_log_usage(self):
+        self.dm.log_usage("Ada", self.filament_id, 4.25)
+        self.dm.log_usage("Ada", self.filament_id, 1)
+        self.assertEqual(self.dm.get_consumption_stats()["daily"], 5.25)
+        self.assertEqual(FilamentDataManager(self.tmp.name).get_consumption_stats()["daily"], 5.25)
+
+
+
+class TestSqliteFilamentDataManager(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_import_and_transactional_log(self):
+        source = FilamentDataManager(self.tmp.name)
+        first = source.add_inventory_item("PLA", "Elegoo", "Black", 1000)
+        second = source.add_inventory_item("PETG", "Sunlu", "Red", 500)
+        source.delete_inventory_item(first)
+        source.log_usage("Ada", second, 20)
+
+        dm = create_data_manager(self.tmp.name, storage="sqlite")
+        self.assertIsInstance(dm, SqliteFilamentDataManager)
+        self.assertEqual(dm.import_from(source), 1)
+        self.assertEqual([item['id'] for item in dm.get_inventory()], [second])  # Ids survive the import
+
+        self.assertTrue(dm.log_usage_and_decrement("Bob", second, 30.25))
+        self.assertEqual(dm.get_item(second)['weight_g'], 469.75)
+        logs = dm.get_logs()
+        self.assertEqual([log['user'] for log in logs], ["Ada", "Bob"])
+        self.assertEqual(logs[1]['filament_desc'], "Red PETG")
+        self.assertEqual(dm.get_consumption_stats()['daily'], 50.25)
+
+        self.assertGreater(dm.add_inventory_item("ABS", "X", "White", 750), second)
+        self.assertTrue(dm.update_inventory_item(second, color="Blue", bogus=1))
+        self.assertEqual(dm.get_item(second)['color'], "Blue")
+        dm.close()
+
+
+class TestUsageExport(unittest.TestCase):
+    def test_parts_quoting_and_filters(self):
+        entries = [
+            {"timestamp": f"2025-04-0{day} 10:00:00", "user": name, "filament_desc": 'Black "Matte", PLA', "amount_used": day}
+            for day, name in [(1, "Ada (ada)"), (2, "Bob (bob)"), (3, "ada again")]
+        ]
+        start, end = parse_date_range("2025-04-01", "2025-04-02")
+        parts, rows = export_csv_parts(filter_entries(entries, start, end, user="ADA"), part_limit=10_000)
+        self.assertEqual(rows, 1)
+        parsed = list(csv.reader(io.TextIOWrapper(parts[0], encoding="utf-8")))
+        self.assertEqual(parsed[1], ["2025-04-01 10:00:00", "Ada (ada)", 'Black "Matte", PLA', "1"])
+
+        parts, rows = export_csv_parts(entries, part_limit=120)
+        self.assertEqual((rows, len(parts)), (3, 3))
+        for part in parts:
+            self.assertTrue(part.read().startswith(b"Timestamp,User"))
+        with self.assertRaises(ValueError):
+            parse_date_range("2025-04-02", "2025-04-01")
+
+    def test_group_parts_keeps_each_message_under_the_limit(self):
+        entries = [{"timestamp": f"2025-04-01 10:00:{i:02d}", "user": "Ada", "filament_desc": "Black PLA", "amount_used": i}
+                   for i in range(30)]
+        parts, _ = export_csv_parts(entries, part_limit=120)
+        sizes = [len(part.read()) for part in parts]
+        groups = group_parts(parts, limit=250, max_files=3)
+        self.assertEqual(sum(len(group) for group in groups), len(parts))
+        offset = 0
+        for group in groups:
+            self.assertLessEqual(len(group), 3)
+            self.assertLessEqual(sum(sizes[offset:offset + len(group)]), 250)
+            offset += len(group)
+        self.assertTrue(all(part.tell() == 0 for part in parts))
+
+
+class TestSpoolIndex(unittest.TestCase):
+    def test_prefix_search_and_pages(self):
+        inventory = [
+            {"id": 1, "brand": "Sunlu", "type": "PLA", "color": "Galaxy Blue", "weight_g": 900},
+            {"id": 2, "brand": "Elegoo", "type": "PLA", "color": "Black", "weight_g": 500},
+            {"id": 3, "brand": "Sunlu", "type": "PETG", "color": "Blue", "weight_g": 250},
+        ] + [{"id": i, "brand": "Generic", "type": "TPU", "color": f"Shade {i}", "weight_g": 1} for i in range(4, 60)]
+        index = SpoolIndex(inventory)
+
+        self.assertEqual([item['id'] for item in index.search("sun bl")], [3, 1]) # PETG sorts before PLA
+        self.assertEqual([item['id'] for item in index.search("PL B")], [2, 1])
+        self.assertEqual(index.search("sun tpu"), [])
+        self.assertEqual(len(index.search("shade")), 25)
+
+        items, page, pages = index.page(9)
+        self.assertEqual((len(items), page, pages), (9, 2, 3))
+
+
+class TestUsageColumns(unittest.TestCase):
+    def test_range_group_and_weekly_sums(self):
+        entries = [
+            {"timestamp": "2025-04-03 09:00:00", "user": "Ada", "filament_desc": "Black PLA", "amount_used": 10},
+            {"timestamp": "2025-04-01 12:00:00", "user": "Bob", "filament_desc": "Red PETG", "amount_used": 5}, # Out of order
+            {"timestamp": "2025-04-07 08:00:00", "user": "Ada", "filament_desc": "Red PLA", "amount_used": 2.5},
+            {"timestamp": "garbage", "user": "Eve", "amount_used": 99},
+        ]
+        columns = UsageColumns.from_entries(entries)
+        self.assertEqual(len(columns), 3)
+        self.assertEqual(columns.total(), 17.5)
+        self.assertEqual(columns.total(to_seconds("2025-04-02"), to_seconds("2025-04-07")), 10)
+        self.assertEqual(columns.group_totals("material"), [("PLA", 12.5), ("PETG", 5)])
+        self.assertEqual(columns.group_totals("user", to_seconds("2025-04-02")), [("Ada", 12.5)])
+        self.assertEqual(
+            [grams for _, grams in columns.weekly(to_seconds("2025-04-01"), to_seconds("2025-04-08"))],
+            [15, 2.5] # Weeks start on Sunday: Mar 30 and Apr 6
+        )
+
+    def test_extend_appends_only_new_entries(self):
+        log = [
+            {"timestamp": "2025-04-01 10:00:00", "user": "Ada", "filament_id": 1, "filament_desc": "Red PLA Silk", "amount_used": 1},
+            {"timestamp": "2025-04-02 10:00:00", "user": "Bob", "filament_id": 9, "filament_desc": "Red PLA Silk", "amount_used": 2},
+        ]
+        columns = UsageColumns.from_entries(log, spool_types={1: "PLA Silk"})
+        log += [
+            {"timestamp": "2025-04-02 10:00:00", "user": "Eve", "filament_id": 2, "filament_desc": "Blue PETG", "amount_used": 4},
+            {"timestamp": "2025-04-03 10:00:00", "user": "Ada", "filament_id": 2, "filament_desc": "Blue PETG", "amount_used": 8},
+        ]
+        since = columns.last_timestamp()
+        self.assertEqual(since, "2025-04-02 10:00:00")
+        added = columns.extend(entry for entry in log if entry["timestamp"] >= since)
+        self.assertEqual((added, len(columns), columns.total()), (2, 4, 15))
+        self.assertEqual(columns.group_totals("material"), [("PETG", 12), ("PLA Silk", 3)])
+
+
+class TestSpoolForecast(unittest.TestCase):
+    def test_rate_decay_and_days_left(self):
+        forecast = SpoolForecast(window_days=14, low_grams=100, low_days=7)
+        start = datetime(2025, 4, 1)
+        forecast.record(1, 140, start)
+        self.assertAlmostEqual(forecast.rate(1, start), 10.0)
+        self.assertAlmostEqual(forecast.days_left(1, 500, start), 50.0)
+        self.assertLess(forecast.rate(1, datetime(2025, 4, 15)), 4.0) # Idle spools slow down
+        self.assertIsNone(forecast.days_left(2, 500, start))
+
+    def test_alerts_fire_once_per_crossing(self):
+        for storage in ("json", "sqlite"):
+            with tempfile.TemporaryDirectory() as path:
+                dm = create_data_manager(path, storage=storage)
+                spool = dm.add_inventory_item("PLA", "Elegoo", "Black", 1000)
+                alerts = []
+                dm.configure_low_stock(100, 7, lambda item, levels, days: alerts.append((item['id'], levels)))
+
+                dm.log_usage_and_decrement("Ada", spool, 850) # 150g left, but ~16g/day of it
+                self.assertEqual(alerts, [(spool, ["days"])])
+                dm.log_usage_and_decrement("Ada", spool, 60) # Crosses 100g; "days" already reported
+                self.assertEqual(alerts[1:], [(spool, ["grams"])])
+                dm.log_usage_and_decrement("Ada", spool, 5)
+                self.assertEqual(len(alerts), 2)
+
+                dm.update_inventory_item(spool, weight_g=1000) # A refill re-arms both alerts
+                dm.update_inventory_item(spool, weight_g=50)
+                self.assertEqual(alerts[2:], [(spool, ["grams", "days"])])
+                if storage == "sqlite":
+                    dm.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
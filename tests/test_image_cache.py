@@ -0,0 +1,58 @@
+import unittest
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.image_cache import ImageCache
+
+
+def blob(tag, size=400):
+    # Not a decodable image, so it is cached as-is whether or not Pillow is installed
+    return tag.encode() * (size // len(tag))
+
+
+class TestImageCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = os.path.join(self.tmp.name, "images")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_store_is_content_addressed(self):
+        cache = ImageCache(self.dir)
+        first = cache.store(blob("a"), "poster.jpg")
+        self.assertEqual(cache.store(blob("a"), "copy.jpg"), first)
+        self.assertTrue(first.endswith(".jpg"))
+        self.assertEqual(cache.total_bytes, 400)
+        self.assertTrue(cache.store(blob("b"), "notes.txt").endswith(".png"))
+
+    def test_evicts_least_recently_used_except_pinned(self):
+        cache = ImageCache(self.dir, max_bytes=1000)
+        a = cache.store(blob("a"), "a.png")
+        b = cache.store(blob("b"), "b.png")
+        cache.path(a)  # a is now the most recently used
+        c = cache.store(blob("c"), "c.png", pinned={b})
+
+        self.assertIsNone(cache.path(a))
+        self.assertIsNotNone(cache.path(b))
+        self.assertIsNotNone(cache.path(c))
+        self.assertEqual(sorted(os.listdir(self.dir)), sorted([b, c]))
+        self.assertEqual(cache.total_bytes, 800)
+
+    def test_index_survives_restart(self):
+        cache = ImageCache(self.dir)
+        name = cache.store(blob("a"), "a.png")
+        reloaded = ImageCache(self.dir)
+        self.assertEqual(reloaded.total_bytes, 400)
+        self.assertTrue(reloaded.path(name).endswith(name))
+
+        os.remove(os.path.join(self.dir, name))
+        self.assertIsNone(reloaded.path(name))
+        self.assertEqual(reloaded.total_bytes, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
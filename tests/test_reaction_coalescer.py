@@ -0,0 +1,87 @@
+import unittest
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.reaction_coalescer import ReactionCoalescer
+
+
+class FakeRoles:
+    """Idempotent apply target that records every call and checks calls never overlap per pair."""
+
+    def __init__(self, delay=0.0, fail=False):
+        self.held = set()
+        self.calls = []
+        self.active = set()
+        self.overlapped = False
+        self.delay = delay
+        self.fail = fail
+
+    async def apply(self, guild_id, member_id, role_id, add):
+        key = (guild_id, member_id, role_id)
+        self.overlapped |= key in self.active
+        self.active.add(key)
+        self.calls.append((member_id, role_id, add))
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("403 Forbidden")
+            if (key in self.held) == add:
+                return False
+            (self.held.add if add else self.held.discard)(key)
+            return True
+        finally:
+            self.active.discard(key)
+
+
+class TestReactionCoalescer(unittest.TestCase):
+    def test_burst_collapses_to_final_state(self):
+        roles = FakeRoles()
+
+        async def run():
+            coalescer = ReactionCoalescer(roles.apply, window=0.01)
+            for add in (True, False, True, False, True):
+                coalescer.submit(1, 10, 100, add)
+            coalescer.submit(1, 11, 100, True)
+            coalescer.submit(1, 12, 100, True)
+            coalescer.submit(1, 12, 100, False)  # Net no-op for a member who never had the role
+            await coalescer.drain()
+            return coalescer.stats()
+
+        stats = asyncio.run(run())
+        self.assertEqual(sorted(roles.calls), [(10, 100, True), (11, 100, True), (12, 100, False)])
+        self.assertEqual(stats, {'events': 8, 'edits': 2, 'noops': 1, 'saved': 6, 'pending': 0})
+
+    def test_events_during_an_edit_get_their_own_window(self):
+        roles = FakeRoles(delay=0.03)
+
+        async def run():
+            coalescer = ReactionCoalescer(roles.apply, window=0.01)
+            coalescer.submit(1, 10, 100, True)
+            await asyncio.sleep(0.02)  # First edit is now in flight
+            coalescer.submit(1, 10, 100, False)
+            await coalescer.drain()
+
+        asyncio.run(run())
+        self.assertEqual(roles.calls, [(10, 100, True), (10, 100, False)])
+        self.assertFalse(roles.overlapped)
+        self.assertEqual(roles.held, set())
+
+    def test_failed_apply_is_logged_and_cleared(self):
+        roles = FakeRoles(fail=True)
+
+        async def run():
+            coalescer = ReactionCoalescer(roles.apply, window=0.01)
+            coalescer.submit(1, 10, 100, True)
+            await coalescer.drain()
+            return coalescer
+
+        coalescer = asyncio.run(run())
+        self.assertEqual(coalescer.tasks, {})
+        self.assertEqual((coalescer.edits, coalescer.noops), (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
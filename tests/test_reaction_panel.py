@@ -0,0 +1,105 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+import discord
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.reaction_panel import MAX_FIELD_LENGTH, ReactionPanelBuilder, link_fields, shard_pairs
+from utils.reaction_role_index import ReactionRoleIndex
+
+PAIRS = [(f"<:e{i}:{1000 + i}>", 500 + i) for i in range(45)]
+
+
+class FakeMessage:
+    def __init__(self, message_id, embed):
+        self.id = message_id
+        self.embeds = [embed]
+        self.jump_url = f"https://discord.com/channels/1/2/{message_id}"
+        self.reactions = []
+        self.deleted = False
+
+    async def edit(self, embed):
+        self.embeds = [embed]
+
+    async def delete(self):
+        self.deleted = True
+
+    async def add_reaction(self, emoji):
+        if emoji == PAIRS[3][0]:
+            raise discord.DiscordException("Unknown Emoji")
+        self.reactions.append(emoji)
+
+
+class FakeChannel:
+    id = 2
+
+    def __init__(self, fail_on=None):
+        self.guild = SimpleNamespace(id=1)
+        self.sent = []
+        self.fail_on = fail_on
+
+    async def send(self, embed):
+        if len(self.sent) + 1 == self.fail_on:
+            raise discord.DiscordException("send failed")
+        msg = FakeMessage(100 + len(self.sent), embed)
+        self.sent.append(msg)
+        return msg
+
+
+class TestReactionPanelBuilder(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index = ReactionRoleIndex(os.path.join(self.tmp.name, "reaction_roles.json"))
+        self.builder = ReactionPanelBuilder(self.index, reaction_interval=0)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_shard_pairs(self):
+        shards = shard_pairs(PAIRS + [PAIRS[0]])
+        self.assertEqual([len(shard) for shard in shards], [20, 20, 5])
+        self.assertEqual([pair for shard in shards for pair in shard], PAIRS)
+
+    def test_link_fields_respect_embed_limits(self):
+        links = [f"[Part {i}](https://discord.com/channels/{10**17}/{10**17}/{10**18 + i})" for i in range(1, 81)]
+        fields = link_fields(links, 5000)
+        self.assertGreater(len(fields), 1)
+        self.assertTrue(all(len(value) <= MAX_FIELD_LENGTH for value in fields))
+        self.assertLessEqual(sum(len(value) for value in fields), 5000)
+        shown = sum(value.count("[Part ") for value in fields)
+        self.assertTrue(fields[-1].endswith(f"+{80 - shown} more"))
+        self.assertEqual(link_fields(links[:3], 5000), [" | ".join(links[:3])])
+
+    def test_publish_indexes_and_links_every_shard(self):
+        channel = FakeChannel()
+        shards = asyncio.run(self.builder.publish(channel, "Roles", PAIRS, "footer"))
+
+        self.assertEqual([msg.id for msg, _ in shards], [100, 101, 102])
+        self.assertEqual(channel.sent[2].embeds[0].title, "Roles (3/3)")
+        self.assertIn("Part 3", channel.sent[0].embeds[0].fields[0].value)
+        reloaded = ReactionRoleIndex(self.index.path)
+        self.assertEqual(len(reloaded), 3)
+        self.assertEqual(reloaded.lookup(102, PAIRS[44][0]), 544)
+
+    def test_failed_publish_removes_partial_panel(self):
+        channel = FakeChannel(fail_on=3)
+        with self.assertRaises(discord.DiscordException):
+            asyncio.run(self.builder.publish(channel, "Roles", PAIRS, "footer"))
+        self.assertTrue(all(msg.deleted for msg in channel.sent))
+        self.assertEqual(len(self.index), 0)
+
+    def test_seed_reports_failures(self):
+        channel = FakeChannel()
+        shards = asyncio.run(self.builder.publish(channel, "Roles", PAIRS[:25], "footer"))
+        failed = asyncio.run(self.builder.seed(shards))
+        self.assertEqual(failed, 1)
+        self.assertEqual(sum(len(msg.reactions) for msg in channel.sent), 24)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.reaction_reconciler import ReactionReconciler, diff_reaction_roles
+from utils.reaction_role_index import ReactionRoleIndex
+from role_fakes import FakeGuild, FakeMember, make_roles
+
+RED, BLUE = 100, 200
+ROLES = make_roles(RED, BLUE)
+
+
+class TestDiffReactionRoles(unittest.TestCase):
+    def test_add_set(self):
+        changes = diff_reaction_roles({RED: {1, 2}, BLUE: {2}}, {RED: {1}, BLUE: set()})
+        self.assertEqual(changes, {2: ({RED, BLUE}, set())})
+
+    def test_no_removals_by_default(self):
+        changes = diff_reaction_roles({RED: set()}, {RED: {1, 2}}, granted={RED: {1, 2}})
+        self.assertEqual(changes, {})
+
+    def test_remove_set_only_covers_granted_roles(self):
+        # 1 reacted and was granted RED by the bot, then un-reacted offline; 2 got RED from an admin
+        changes = diff_reaction_roles({RED: set(), BLUE: {3}}, {RED: {1, 2}, BLUE: {4}},
+                                      remove=True, granted={RED: {1}})
+        self.assertEqual(changes, {1: (set(), {RED}), 3: ({BLUE}, set())})
+
+    def test_add_and_remove_merge_per_member(self):
+        changes = diff_reaction_roles({RED: {1}, BLUE: set()}, {RED: set(), BLUE: {1}},
+                                      remove=True, granted={BLUE: {1}})
+        self.assertEqual(changes, {1: ({RED}, {BLUE})})
+
+
+class TestReactionReconciler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index = ReactionRoleIndex(os.path.join(self.tmp.name, "reaction_roles.json"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_apply_records_grants(self):
+        guild = FakeGuild([FakeMember(1, [BLUE], ROLES), FakeMember(2, [], ROLES)], ROLES)
+        self.index.record_grants(added=[(BLUE, 1)])
+        reconciler = ReactionReconciler(self.index, batch_pause=0)
+        stats = asyncio.run(reconciler.apply(guild, {1: (set(), {BLUE}), 2: ({RED}, set())}))
+
+        self.assertEqual(stats, {'fixed': 2, 'errors': 0})
+        reloaded = ReactionRoleIndex(self.index.path)
+        self.assertEqual(reloaded.granted(RED), {2})
+        self.assertEqual(reloaded.granted(BLUE), set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.reaction_role_index import ReactionRoleIndex, emoji_key, parse_panel_description
+
+
+class TestReactionRoleIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "reaction_roles.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_emoji_key(self):
+        self.assertEqual(emoji_key("<:party:123>"), "123")
+        self.assertEqual(emoji_key("<a:party_blob:123>"), "123")  # Animated and renamed: same emoji
+        self.assertEqual(emoji_key("❤️"), "❤")
+
+    def test_parse_panel_description(self):
+        description = "🔴 : <@&11>\n<:printer:42> : <@&22>\nnot a role line\n🔵:<@&33>"
+        self.assertEqual(parse_panel_description(description), {"🔴": 11, "42": 22, "🔵": 33})
+        self.assertEqual(parse_panel_description(None), {})
+
+    def test_lookup_and_persistence(self):
+        index = ReactionRoleIndex(self.path)
+        index.register_panel(1000, guild_id=1, channel_id=5, roles={"<:printer:42>": 22, "❤️": 33})
+        index.register_panel(2000, guild_id=2, channel_id=6, roles={"🔴": 11})
+
+        reloaded = ReactionRoleIndex(self.path)
+        self.assertEqual(reloaded.lookup(1000, "<:printer_renamed:42>"), 22)
+        self.assertEqual(reloaded.lookup(1000, "❤"), 33)
+        self.assertIsNone(reloaded.lookup(1000, "🔴"))
+        self.assertIsNone(reloaded.lookup(3000, "🔴"))
+        self.assertEqual([mid for mid, _ in reloaded.panels_for_guild(2)], [2000])
+
+    def test_remove_panel(self):
+        index = ReactionRoleIndex(self.path)
+        index.register_panel(1000, 1, 5, {"🔴": 11})
+        self.assertTrue(index.remove_panel(1000))
+        self.assertFalse(index.remove_panel(1000))
+        self.assertNotIn(1000, ReactionRoleIndex(self.path))
+
+    def test_grants_are_recorded_and_persisted(self):
+        index = ReactionRoleIndex(self.path)
+        self.assertTrue(index.record_grants(added=[(11, 1), (11, 2)]))
+        self.assertFalse(index.record_grants(added=[(11, 1)]))
+        index.record_grants(removed=[(11, 2)])
+        self.assertEqual(ReactionRoleIndex(self.path).granted(11), {1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.reminder_wheel import ReminderWheel
+
+
+class TestReminderWheel(unittest.TestCase):
+    def setUp(self):
+        self.wheel = ReminderWheel()
+        self.start = datetime(2025, 3, 1, 12, 0)
+
+    def test_fires_in_order_once(self):
+        self.wheel.schedule("a", self.start + timedelta(minutes=10), payload="a")
+        self.wheel.schedule("b", self.start + timedelta(minutes=5), payload="b")
+
+        self.assertEqual(self.wheel.advance(self.start), [])
+        self.assertEqual(self.wheel.advance(self.start + timedelta(minutes=5)), ["b"])
+        self.assertEqual(self.wheel.advance(self.start + timedelta(minutes=30)), ["a"])
+        self.assertEqual(self.wheel.advance(self.start + timedelta(minutes=31)), [])
+        self.assertEqual(len(self.wheel), 0)
+
+    def test_cancel_owner(self):
+        for offset in (1440, 60, 10, 0):
+            self.wheel.schedule(("evt", offset), self.start - timedelta(minutes=offset), payload=offset, owner="evt")
+        self.wheel.schedule(("other", 0), self.start, payload="other", owner="other")
+
+        self.assertEqual(self.wheel.cancel_owner("evt"), 4)
+        self.assertEqual(self.wheel.advance(self.start + timedelta(days=1)), ["other"])
+
+    def test_overdue_after_downtime(self):
+        # First advance long after everything was due (bot was offline)
+        self.wheel.schedule("old", self.start - timedelta(days=3), payload="old")
+        self.assertEqual(self.wheel.advance(self.start), ["old"])
+
+        # Scheduling into the past after the cursor moved still fires on the next tick
+        self.wheel.schedule("late", self.start - timedelta(hours=1), payload="late")
+        self.assertEqual(self.wheel.advance(self.start), ["late"])
+
+    def test_reschedule_replaces(self):
+        self.wheel.schedule("a", self.start + timedelta(minutes=1), payload=1)
+        self.wheel.schedule("a", self.start + timedelta(minutes=2), payload=2)
+        self.assertEqual(self.wheel.advance(self.start + timedelta(minutes=1)), [])
+        self.assertEqual(self.wheel.advance(self.start + timedelta(minutes=2)), [2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.role_counter import RoleCounter
+from utils.role_migration import net_role_change
+from role_fakes import FakeRole
+
+GUILD = SimpleNamespace(id=1)
+
+
+def member(*role_ids):
+    return SimpleNamespace(guild=GUILD, roles=[FakeRole(id=0)] + [FakeRole(id=r, guild=GUILD) for r in role_ids])
+
+
+class TestRoleCounter(unittest.TestCase):
+    def setUp(self):
+        self.counter = RoleCounter()
+        self.counter.rebuild(SimpleNamespace(id=1, members=[member(10), member(10, 20), member()]))
+
+    def test_rebuild_skips_everyone(self):
+        self.assertEqual(self.counter.top(1), [(10, 2), (20, 1)])
+        self.assertEqual(self.counter.count(1, 0), 0)
+
+    def test_events_adjust_counts(self):
+        self.counter.member_join(member(20))
+        self.counter.member_update(member(10, 20), member(30))
+        self.counter.member_remove(member(10))
+        self.assertEqual(self.counter.count(1, 10), 0)
+        self.assertEqual(self.counter.count(1, 20), 1)
+        self.assertEqual(self.counter.count(1, 30), 1)
+        self.assertNotIn(10, self.counter.counts[1])
+
+    def test_version_only_bumps_on_change(self):
+        version = self.counter.version[1]
+        self.counter.member_update(member(10), member(10))
+        self.assertEqual(self.counter.version[1], version)
+        self.counter.role_delete(FakeRole(id=20, guild=GUILD))
+        self.assertEqual(self.counter.version[1], version + 1)
+        self.assertEqual(self.counter.count(1, 20), 0)
+
+    def test_net_role_change(self):
+        stats = {'added': {'10': 5, '20': 1}, 'removed': {'10': 2, '30': 4}}
+        self.assertEqual([net_role_change(stats, r) for r in (10, 20, 30, 40)], [3, 1, -4, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
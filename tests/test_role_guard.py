@@ -0,0 +1,44 @@
+import unittest
+import os
+import sys
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.role_guard import RoleGuard
+from role_fakes import FakeGuild, make_role
+
+
+class TestRoleGuard(unittest.TestCase):
+    def test_reasons(self):
+        guard = RoleGuard()
+        guild = FakeGuild()
+        self.assertIsNone(guard.reason(guild, make_role(1, 5)))
+        self.assertIn("top role", guard.reason(guild, make_role(2, 10)))
+        self.assertIn("managed", guard.reason(guild, make_role(3, 1, managed=True)))
+        self.assertIn("@everyone", guard.reason(guild, make_role(0, 0)))
+        self.assertIn("Manage Roles", RoleGuard().reason(FakeGuild(manage_roles=False), make_role(1, 5)))
+
+    def test_decisions_are_cached_until_invalidated(self):
+        guard = RoleGuard()
+        guild = FakeGuild(top_position=3)
+        role = make_role(1, 5)
+        self.assertFalse(guard.can_manage(guild, role))
+
+        guild.me.top_role.position = 10  # Bot's role moved up: stale until the guild is invalidated
+        self.assertFalse(guard.can_manage(guild, role))
+        guard.invalidate(guild.id)
+        self.assertTrue(guard.can_manage(guild, role))
+
+    def test_check_reports_each_role_once(self):
+        guard = RoleGuard()
+        guild = FakeGuild(top_position=3)
+        role = make_role(1, 5)
+        with mock.patch("builtins.print") as printed:
+            self.assertFalse(guard.check(guild, role))
+            self.assertFalse(guard.check(guild, role))
+        self.assertEqual(printed.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
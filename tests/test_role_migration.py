@@ -0,0 +1,110 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.migration_jobs import JobStore
+from utils.role_migration import JoinDateIndex, MigrationEngine, MigrationPlan
+from role_fakes import FakeGuild, FakeMember, make_roles
+
+ALUMNI, MEMBER, OLD = 1, 2, 3
+CUTOFF = datetime(2024, 5, 1, tzinfo=timezone.utc)
+ROLES = make_roles(ALUMNI, MEMBER, OLD)
+
+
+def member(member_id, joined, role_ids, bot=False):
+    return FakeMember(member_id, role_ids, ROLES, joined_at=joined, bot=bot)
+
+
+class TestRoleMigration(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "checkpoint.json")
+        old = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        new = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        self.members = [
+            member(10, old, [MEMBER, OLD]),   # -> alumni, drop member + old
+            member(11, new, []),              # -> member
+            member(12, new, [MEMBER]),        # already correct
+            member(13, old, [], bot=True),    # ignored
+        ]
+        self.guild = FakeGuild(self.members, ROLES)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_join_date_index_split(self):
+        alumni, members = JoinDateIndex(self.members).split(CUTOFF)
+        self.assertEqual([m.id for m in alumni], [10])
+        self.assertEqual([m.id for m in members], [11, 12])
+
+    def test_plan(self):
+        plan = MigrationPlan.build(self.guild, ALUMNI, MEMBER, CUTOFF, OLD)
+        self.assertEqual(plan.considered, 3)
+        self.assertEqual(plan.changes, {10: ({ALUMNI}, {MEMBER, OLD}), 11: ({MEMBER}, set())})
+        self.assertEqual(plan.counts, {
+            "add_alumni": 1, "remove_member": 1, "add_member": 1, "remove_alumni": 0, "remove_legacy": 1,
+        })
+
+    def test_run_makes_one_edit_per_member_and_resumes(self):
+        plan = MigrationPlan.build(self.guild, ALUMNI, MEMBER, CUTOFF, OLD)
+        engine = MigrationEngine(self.path, checkpoint_every=1)
+        engine.start(plan.to_job(channel_id=5), plan.changes)
+        engine.state['done'] = [10]  # Pretend a previous run got this far
+
+        # Resuming executes the plan stored in the checkpoint
+        resumed = MigrationPlan.from_checkpoint(MigrationEngine(self.path).state)
+        self.assertEqual(resumed.changes, plan.changes)
+        stats = asyncio.run(engine.run(self.guild))
+
+        self.assertEqual(self.members[0].edits, 0)
+        self.assertEqual(self.members[1].edits, 1)
+        self.assertEqual([r.id for r in self.members[1].roles], [0, MEMBER])
+        self.assertEqual(stats['updated'], 1)
+
+        reloaded = MigrationEngine(self.path)
+        self.assertFalse(reloaded.has_unfinished())
+        self.assertEqual(reloaded.state['done'], [10, 11])
+
+    def test_journal_undo_restores_roles(self):
+        store = JobStore(os.path.join(self.tmp.name, "jobs"))
+        plan = MigrationPlan.build(self.guild, ALUMNI, MEMBER, CUTOFF, OLD)
+        job = store.create('migration', plan.to_job(channel_id=5))
+        engine = MigrationEngine(self.path)
+        engine.start(plan.to_job(channel_id=5), plan.changes)
+        journal = store.journal(job['id'])
+        asyncio.run(engine.run(self.guild, journal=journal))
+        journal.close()
+        self.assertEqual(len(list(store.read_journal(job['id']))), 2)
+
+        engine.start({'kind': 'undo'}, store.undo_changes(job['id']))
+        asyncio.run(engine.run(self.guild))
+        self.assertEqual(sorted(r.id for r in self.members[0].roles), [0, MEMBER, OLD])
+        self.assertEqual([r.id for r in self.members[1].roles], [0])
+
+    def test_journal_is_written_before_the_edit(self):
+        store = JobStore(os.path.join(self.tmp.name, "jobs"))
+        job = store.create('migration', {})
+        journaled_at_edit = []
+        member = self.members[1]
+        original_edit = member.edit
+
+        async def edit(roles, reason=None):
+            journaled_at_edit.extend(entry['member_id'] for entry in store.read_journal(job['id']))
+            await original_edit(roles, reason)
+
+        member.edit = edit
+        engine = MigrationEngine(self.path)
+        engine.start({}, {11: ({MEMBER}, set())})
+        journal = store.journal(job['id'])
+        asyncio.run(engine.run(self.guild, journal=journal))
+        journal.close()
+        self.assertEqual(journaled_at_edit, [11])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Dict, List, Tuple
+
+import discord
+
+from utils.latency_stats import percentile
+
+class AnnouncementDispatcher:
+    """
+    Sends announcements to many channels concurrently.
+
+    Concurrency is bounded by a semaphore, rate-limited or failed sends are retried
+    with exponential backoff, and delivery latency is recorded per target channel.
+    """
+
+    def __init__(self, max_concurrency: int = 4, max_retries: int = 3, base_delay: float = 1.0, history: int = 50):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.history = history
+        self.latencies: Dict[int, deque] = {}  # channel_id -> recent delivery times (s)
+        self.sent: Dict[int, int] = {}  # channel_id -> deliveries ever (latencies only keeps the last `history`)
+        self.failures: Dict[int, int] = {}
+        self.labels: Dict[int, str] = {}
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        delay = self.base_delay * (2 ** attempt)
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after is None and isinstance(error, discord.HTTPException) and error.response is not None:
+            try:
+                retry_after = float(error.response.headers.get('Retry-After', 0))
+            except (TypeError, ValueError):
+                retry_after = None
+        if retry_after:
+            delay = max(delay, float(retry_after))
+        return delay + random.uniform(0, self.base_delay / 2)
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        if isinstance(error, discord.RateLimited):
+            return True
+        if isinstance(error, discord.HTTPException):
+            return error.status == 429 or error.status >= 500
+        return isinstance(error, (asyncio.TimeoutError, OSError))
+
+    async def _send(self, channel, payload) -> bool:
+        label = f"{getattr(getattr(channel, 'guild', None), 'name', 'DM')}#{getattr(channel, 'name', channel.id)}"
+        self.labels[channel.id] = label
+        started = time.monotonic()
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.semaphore: # Held per attempt only, so a backoff doesn't block other channels
+                    kwargs = payload() if callable(payload) else payload
+                    await channel.send(**kwargs)
+                elapsed = time.monotonic() - started
+                self.latencies.setdefault(channel.id, deque(maxlen=self.history)).append(elapsed)
+                self.sent[channel.id] = self.sent.get(channel.id, 0) + 1
+                print(f"Announcement delivered to {label} in {elapsed:.2f}s")
+                return True
+            except Exception as e:
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    self.failures[channel.id] = self.failures.get(channel.id, 0) + 1
+                    print(f"Announcement to {label} failed: {e}")
+                    return False
+                delay = self._retry_delay(e, attempt)
+                print(f"Announcement to {label} retrying in {delay:.1f}s ({e})")
+                await asyncio.sleep(delay)
+        return False
+
+    async def dispatch(self, jobs: List[Tuple[object, object]]) -> List[bool]:
+        """
+        Sends every (channel, payload) job concurrently. The payload is the send() kwargs,
+        or a callable returning them (called per attempt, e.g. to build fresh Files).
+        Returns per-job success.
+        """
+        if not jobs:
+            return []
+        return await asyncio.gather(*(self._send(channel, payload) for channel, payload in jobs))
+
+    def latency_report(self) -> List[Dict]:
+        """Per-target delivery stats, slowest first. Latencies cover the last `history` deliveries."""
+        report = []
+        for channel_id in set(self.latencies) | set(self.failures):
+            samples = sorted(self.latencies.get(channel_id, ()))
+            report.append({
+                "channel_id": channel_id,
+                "label": self.labels.get(channel_id, str(channel_id)),
+                "sent": self.sent.get(channel_id, 0),
+                "failed": self.failures.get(channel_id, 0),
+                "avg": sum(samples) / len(samples) if samples else 0.0,
+                "p95": percentile(samples, 0.95),
+                "last": self.latencies[channel_id][-1] if samples else 0.0,
+            })
+        report.sort(key=lambda r: r["p95"], reverse=True)
+        return report
@@ -0,0 +1,67 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from utils.latency_stats import percentile
+from utils.rate_pacer import RatePacer
+
+class AutoRoleQueue:
+    """
+    Work queue for auto-join role assignment.
+
+    Joins are deduped per member (a join followed by the pending -> verified update
+    is one entry) and drained by a single task that paces itself through RatePacer,
+    so a join burst turns into a steady stream of role adds instead of a 429 storm.
+    """
+
+    def __init__(self, apply: Callable[[int, int], Awaitable[bool]], pacer: Optional[RatePacer] = None,
+                 history: int = 500):
+        self.apply = apply
+        self.pacer = pacer or RatePacer(min_interval=0.25)
+        self.pending: "OrderedDict[Tuple[int, int], float]" = OrderedDict()
+        self.drainer: Optional[asyncio.Task] = None
+        self.latencies = deque(maxlen=history)  # enqueue -> role added (s)
+        self.enqueued = 0
+        self.deduped = 0
+        self.assigned = 0
+        self.failures = 0
+
+    def enqueue(self, member):
+        key = (member.guild.id, member.id)
+        self.enqueued += 1
+        if key in self.pending:
+            self.deduped += 1
+        else:
+            self.pending[key] = time.monotonic()
+        if self.drainer is None or self.drainer.done():
+            self.drainer = asyncio.create_task(self._drain())
+
+    async def _drain(self):
+        while self.pending:
+            (guild_id, member_id), enqueued_at = self.pending.popitem(last=False)
+            try:
+                changed = await self.pacer.call(lambda: self.apply(guild_id, member_id))
+            except Exception as e:
+                print(f"ERROR: Failed to auto-assign role to member {member_id}: {e}")
+                self.failures += 1
+                continue
+            if changed:
+                self.assigned += 1
+                self.latencies.append(time.monotonic() - enqueued_at)
+
+    def __len__(self):
+        return len(self.pending)
+
+    def stats(self) -> Dict:
+        samples = sorted(self.latencies)
+        return {
+            'depth': len(self.pending),
+            'enqueued': self.enqueued,
+            'deduped': self.deduped,
+            'assigned': self.assigned,
+            'failures': self.failures,
+            'p50': percentile(samples, 0.50),
+            'p95': percentile(samples, 0.95),
+            'p99': percentile(samples, 0.99),
+        }
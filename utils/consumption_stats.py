@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+def period_keys(dt: datetime) -> Dict[str, str]:
+    return {
+        "daily": dt.strftime("%Y-%m-%d"),
+        "weekly": dt.strftime("%Y-W%U"),
+        "monthly": dt.strftime("%Y-%m"),
+    }
+
+def period_starts(now: datetime) -> Dict[str, datetime]:
+    """Start of the current day, week (%U weeks start on Sunday) and month."""
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return {
+        "daily": today,
+        "weekly": today - timedelta(days=(today.weekday() + 1) % 7),
+        "monthly": today.replace(day=1),
+    }
+
+def earliest_period_start(now: datetime) -> datetime:
+    """Start of the older of the current week and the current month."""
+    starts = period_starts(now)
+    return min(starts["weekly"], starts["monthly"])
+
+class RollingConsumption:
+    """
+    Usage totals for the current day, week and month.
+
+    Each logged entry is added to whichever current periods it falls in; when the
+    calendar moves past a period boundary that total starts again from zero. The
+    full log only has to be read once, at startup, to seed the totals.
+    """
+
+    def __init__(self):
+        self.keys: Dict[str, Optional[str]] = {"daily": None, "weekly": None, "monthly": None}
+        self.totals: Dict[str, float] = {"daily": 0.0, "weekly": 0.0, "monthly": 0.0}
+
+    def roll(self, now: datetime):
+        for period, key in period_keys(now).items():
+            if self.keys[period] != key:
+                self.keys[period] = key
+                self.totals[period] = 0.0
+
+    def add(self, dt: datetime, amount: float, now: Optional[datetime] = None):
+        self.roll(now or datetime.now())
+        for period, key in period_keys(dt).items():
+            if key == self.keys[period]:
+                self.totals[period] += amount
+
+    def rebuild(self, entries: Iterable[Dict], now: Optional[datetime] = None):
+        """Seeds the totals from the log. Entries before the current week/month are skipped without parsing."""
+        now = now or datetime.now()
+        self.keys = {period: None for period in self.keys}
+        self.roll(now)
+        cutoff = earliest_period_start(now).strftime(TIMESTAMP_FORMAT)
+        for entry in entries:
+            ts = str(entry.get('timestamp', ''))
+            if ts < cutoff:
+                continue
+            try:
+                amount = float(entry.get('amount_used', 0))
+                dt = datetime.strptime(ts, TIMESTAMP_FORMAT)
+            except (ValueError, TypeError):
+                continue
+            self.add(dt, amount, now)
+
+    def snapshot(self, now: Optional[datetime] = None) -> Dict[str, float]:
+        self.roll(now or datetime.now())
+        return {period: round(total, 2) for period, total in self.totals.items()}
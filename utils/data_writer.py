@@ -0,0 +1,96 @@
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+from utils.latency_stats import percentile
+
+_STOP = object()
+
+class DataWriter:
+    """
+    Single-writer actor for the filament data files.
+
+    Every mutation is queued and run, one at a time and in submission order, on
+    a dedicated thread, so fsyncs never block the event loop and concurrent
+    modal submissions can't read-modify-write over each other. Callers await
+    the result (or the exception) of their own operation.
+    """
+
+    def __init__(self, name: str = "filament-writer", history: int = 500):
+        self.name = name
+        self.queue: "queue.Queue" = queue.Queue()
+        self.thread: Optional[threading.Thread] = None
+        self.waits = deque(maxlen=history)     # submitted -> started (s)
+        self.services = deque(maxlen=history)  # started -> finished (s)
+        self.submitted = 0
+        self.completed = 0
+        self.failures = 0
+
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self.thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Lets already queued operations finish, then ends the thread."""
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.put(_STOP)
+            self.thread.join(timeout)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> "asyncio.Future":
+        """Queues fn(*args, **kwargs) for the writer thread; await the returned future for its result."""
+        self.start()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.submitted += 1
+        self.queue.put((fn, args, kwargs, loop, future, time.monotonic()))
+        return future
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                return
+            fn, args, kwargs, loop, future, submitted_at = item
+            started = time.monotonic()
+            try:
+                result, error = fn(*args, **kwargs), None
+            except Exception as e:
+                result, error = None, e
+            finished = time.monotonic()
+            self.waits.append(started - submitted_at)
+            self.services.append(finished - started)
+            if error is None:
+                self.completed += 1
+            else:
+                self.failures += 1
+            try:
+                loop.call_soon_threadsafe(self._resolve, future, result, error)
+            except RuntimeError:
+                pass  # Loop already closed; nobody is waiting any more
+
+    @staticmethod
+    def _resolve(future: "asyncio.Future", result: Any, error: Optional[Exception]):
+        if future.cancelled():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def stats(self) -> Dict:
+        waits, services = sorted(self.waits), sorted(self.services)
+        return {
+            'depth': self.queue.qsize(),
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failures': self.failures,
+            'wait_p50': percentile(waits, 0.50),
+            'wait_p95': percentile(waits, 0.95),
+            'wait_p99': percentile(waits, 0.99),
+            'service_p50': percentile(services, 0.50),
+            'service_p95': percentile(services, 0.95),
+        }
@@ -0,0 +1,235 @@
+import csv
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+EVENT_TIME_FORMAT = "%Y-%m-%d %H:%M"
+PRODID = "-//Engineering Leadership Council//Event Loop//EN"
+
+# --- Export ---
+
+def _escape(text: str) -> str:
+    return (
+        str(text or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+def _fold(line: str) -> str:
+    """Folds a content line to 75 octets as required by RFC 5545."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts = []
+    while encoded:
+        limit = 75 if not parts else 74  # continuation lines start with a space
+        cut = min(limit, len(encoded))
+        # Never split a multi-byte character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+    return "\r\n ".join(parts) + "\r\n"
+
+def iter_ics(events: Iterable[Dict], calendar_name: str = "ELC Events") -> Iterator[str]:
+    """Yields the calendar one folded content line at a time."""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield _fold("BEGIN:VCALENDAR")
+    yield _fold("VERSION:2.0")
+    yield _fold(f"PRODID:{PRODID}")
+    yield _fold(f"X-WR-CALNAME:{_escape(calendar_name)}")
+    for event in events:
+        try:
+            start = datetime.strptime(event["time"], EVENT_TIME_FORMAT)
+        except (KeyError, ValueError):
+            continue
+        yield _fold("BEGIN:VEVENT")
+        yield _fold(f"UID:{event.get('id', '')}-{start.strftime('%Y%m%dT%H%M')}@elc-event-loop")
+        yield _fold(f"DTSTAMP:{stamp}")
+        # Floating local time, matching how events.json stores it
+        yield _fold(f"DTSTART:{start.strftime('%Y%m%dT%H%M%S')}")
+        yield _fold(f"SUMMARY:{_escape(event.get('name', ''))}")
+        if event.get("location"):
+            yield _fold(f"LOCATION:{_escape(event['location'])}")
+        if event.get("description"):
+            yield _fold(f"DESCRIPTION:{_escape(event['description'])}")
+        yield _fold("END:VEVENT")
+    yield _fold("END:VCALENDAR")
+
+def iter_ics_chunks(events: Iterable[Dict], chunk_lines: int = 256, **kwargs) -> Iterator[str]:
+    """Groups `iter_ics` output into larger string chunks for efficient writes."""
+    buffer = []
+    for line in iter_ics(events, **kwargs):
+        buffer.append(line)
+        if len(buffer) >= chunk_lines:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+def events_fingerprint(events: Iterable[Dict]) -> str:
+    """Content hash over the fields that end up in the calendar."""
+    digest = hashlib.sha256()
+    for event in events:
+        digest.update(json.dumps(
+            [event.get("id"), event.get("time"), event.get("name"), event.get("location"), event.get("description")]
+        ).encode("utf-8"))
+    return digest.hexdigest()
+
+class IcsExportCache:
+    """
+    Keeps the last exported calendar on disk, keyed by the content hash of the events.
+    Unchanged calendars are served from the existing file without re-serializing.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.last_hash: Optional[str] = None
+
+    def path_for(self, content_hash: str) -> str:
+        return os.path.join(self.cache_dir, f"events-{content_hash[:16]}.ics")
+
+    def get(self, events: List[Dict]) -> str:
+        """Returns the path of an up-to-date .ics file for `events`."""
+        content_hash = events_fingerprint(events)
+        path = self.path_for(content_hash)
+        if os.path.exists(path):
+            self.last_hash = content_hash
+            return path
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            for chunk in iter_ics_chunks(sorted(events, key=lambda e: e.get("time", ""))):
+                f.write(chunk)
+        os.replace(tmp_path, path)
+
+        # Drop stale exports
+        for name in os.listdir(self.cache_dir):
+            stale = os.path.join(self.cache_dir, name)
+            if name.endswith(".ics") and stale != path:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+
+        self.last_hash = content_hash
+        return path
+
+# --- Import ---
+
+def _unescape(text: str) -> str:
+    out = []
+    chars = iter(text)
+    for ch in chars:
+        if ch == "\\":
+            nxt = next(chars, "")
+            out.append("\n" if nxt in ("n", "N") else nxt)
+        else:
+            out.append(ch)
+    return "".join(out)
+
+def _unfold(lines: Iterable[str]) -> Iterator[str]:
+    """Joins RFC 5545 continuation lines while streaming."""
+    current = None
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+def _parse_dtstart(params: str, value: str) -> datetime:
+    value = value.strip()
+    if "VALUE=DATE" in params.upper() and "T" not in value:
+        return datetime.strptime(value, "%Y%m%d")
+    if value.endswith("Z"):
+        utc = datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+        return utc.astimezone().replace(tzinfo=None)
+    # TZID-qualified and floating times are taken as local time
+    return datetime.strptime(value[:15], "%Y%m%dT%H%M%S")
+
+def validate_event(raw: Dict) -> Dict:
+    """Normalizes an imported event. Raises ValueError if it is unusable."""
+    name = (raw.get("name") or "").strip()
+    if not name:
+        raise ValueError("missing name")
+    start = raw.get("start")
+    if not isinstance(start, datetime):
+        try:
+            start = datetime.strptime(str(raw.get("time", "")).strip(), EVENT_TIME_FORMAT)
+        except ValueError:
+            raise ValueError(f"invalid time '{raw.get('time', '')}' (expected YYYY-MM-DD HH:MM)")
+    return {
+        "name": name[:100],
+        "time": start.strftime(EVENT_TIME_FORMAT),
+        "location": (raw.get("location") or "").strip()[:100] or "No location",
+        "description": (raw.get("description") or "").strip()[:1000],
+        "image_url": None,
+    }
+
+def is_past_event(event: Dict, now: Optional[datetime] = None) -> bool:
+    """True if a validated event has already started (its reminders would all fire at once)."""
+    return datetime.strptime(event["time"], EVENT_TIME_FORMAT) <= (now or datetime.now())
+
+def iter_ics_events(lines: Iterable[str]) -> Iterator[Tuple[Optional[Dict], Optional[str]]]:
+    """Yields (event, None) or (None, error) for every VEVENT in a streamed .ics file."""
+    current = None
+    for line in _unfold(lines):
+        if line == "BEGIN:VEVENT":
+            current = {}
+            continue
+        if line == "END:VEVENT":
+            if current is not None:
+                try:
+                    yield validate_event(current), None
+                except ValueError as e:
+                    yield None, f"{current.get('name') or 'Unnamed event'}: {e}"
+            current = None
+            continue
+        if current is None or ":" not in line:
+            continue
+
+        key, value = line.split(":", 1)
+        prop, _, params = key.partition(";")
+        prop = prop.upper()
+        if prop == "SUMMARY":
+            current["name"] = _unescape(value)
+        elif prop == "LOCATION":
+            current["location"] = _unescape(value)
+        elif prop == "DESCRIPTION":
+            current["description"] = _unescape(value)
+        elif prop == "DTSTART":
+            try:
+                current["start"] = _parse_dtstart(params, value)
+            except ValueError:
+                current["time"] = value
+
+def iter_csv_events(lines: Iterable[str]) -> Iterator[Tuple[Optional[Dict], Optional[str]]]:
+    """
+    Streams events from CSV with a header row.
+    Columns: name, date, time, location, description (or name, time as "YYYY-MM-DD HH:MM", ...).
+    """
+    reader = csv.DictReader(lines)
+    for row_num, row in enumerate(reader, start=2):
+        row = {(k or "").strip().lower(): (v or "") for k, v in row.items()}
+        if row.get("date"):
+            row["time"] = f"{row['date'].strip()} {row.get('time', '').strip()}"
+        try:
+            yield validate_event(row), None
+        except ValueError as e:
+            yield None, f"Row {row_num}: {e}"
+
+def iter_imported_events(lines: Iterable[str], filename: str) -> Iterator[Tuple[Optional[Dict], Optional[str]]]:
+    if filename.lower().endswith(".csv"):
+        return iter_csv_events(lines)
+    return iter_ics_events(lines)
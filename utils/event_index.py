@@ -0,0 +1,147 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class EventPage:
+    def __init__(self, events: List[Dict], start: int, total: int, has_prev: bool, has_next: bool):
+        self.events = events
+        self.start = start    # 0-based rank of the first event within the filtered set
+        self.total = total    # size of the filtered set
+        self.has_prev = has_prev
+        self.has_next = has_next
+
+    @property
+    def first(self) -> Optional[Dict]:
+        return self.events[0] if self.events else None
+
+    @property
+    def last(self) -> Optional[Dict]:
+        return self.events[-1] if self.events else None
+
+
+class EventIndex:
+    """
+    Sorted indexes over the event list for cursor-based paging.
+
+    Events are kept ordered by (time, id), and by (lowercase name, time, id) for
+    prefix searches. A page is located by bisecting the cursor, so serving one costs
+    O(log n + page) regardless of how many events exist. Event times use the
+    "YYYY-MM-DD HH:MM" format, which sorts chronologically as plain strings.
+    """
+
+    def __init__(self, events: Iterable[Dict] = ()):
+        self.rebuild(events)
+
+    def rebuild(self, events: Iterable[Dict]):
+        self._events: Dict[str, Dict] = {}
+        self._by_time: List[Tuple[str, str]] = []
+        self._by_name: List[Tuple[str, str, str]] = []
+        for event in events:
+            if event.get('id'):
+                self._events[event['id']] = event
+                self._by_time.append(self._time_key(event))
+                self._by_name.append(self._name_key(event))
+        self._by_time.sort()
+        self._by_name.sort()
+
+    def __len__(self):
+        return len(self._events)
+
+    def get(self, event_id: str) -> Optional[Dict]:
+        return self._events.get(event_id)
+
+    @staticmethod
+    def _time_key(event: Dict) -> Tuple[str, str]:
+        return (event.get('time', ''), event['id'])
+
+    @staticmethod
+    def _name_key(event: Dict) -> Tuple[str, str, str]:
+        return (event.get('name', '').lower(), event.get('time', ''), event['id'])
+
+    def add(self, event: Dict):
+        if event['id'] in self._events:
+            self.remove(event['id'])
+        self._events[event['id']] = event
+        insort(self._by_time, self._time_key(event))
+        insort(self._by_name, self._name_key(event))
+
+    def remove(self, event_id: str) -> bool:
+        event = self._events.pop(event_id, None)
+        if event is None:
+            return False
+        for keys, key in ((self._by_time, self._time_key(event)), (self._by_name, self._name_key(event))):
+            i = bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                del keys[i]
+        return True
+
+    def upcoming(self, after_time: str, limit: int) -> List[Dict]:
+        """The next `limit` events strictly after `after_time`."""
+        i = bisect_right(self._by_time, (after_time, '\uffff'))
+        return [self._events[eid] for _, eid in self._by_time[i:i + limit]]
+
+    def _cursor_key(self, cursor: Optional[str], by_name: bool):
+        """Turns a cursor from `cursor_for` into a sort key, tolerating deleted events."""
+        if not cursor:
+            return None
+        event_id, _, digits = cursor.partition('@')
+        event = self._events.get(event_id)
+        if event is not None:
+            return self._name_key(event) if by_name else self._time_key(event)
+        if by_name or len(digits) != 12:
+            return None
+        time = f"{digits[0:4]}-{digits[4:6]}-{digits[6:8]} {digits[8:10]}:{digits[10:12]}"
+        return (time, event_id)
+
+    def page(self, limit: int = 10, after: Optional[str] = None, before: Optional[str] = None,
+             start: Optional[str] = None, end: Optional[str] = None, prefix: Optional[str] = None) -> EventPage:
+        """
+        Returns up to `limit` events following the `after` cursor (or preceding `before`).
+        `start`/`end` bound the event time (inclusive, "YYYY-MM-DD" or full timestamps),
+        `prefix` filters by case-insensitive name prefix.
+        """
+        prefix = (prefix or '').lower()
+        by_name = bool(prefix)
+
+        if by_name:
+            keys = self._by_name
+            lo = bisect_left(keys, (prefix,))
+            hi = bisect_left(keys, (prefix + '\uffff',))
+        else:
+            keys = self._by_time
+            lo = bisect_left(keys, (start,)) if start else 0
+            hi = bisect_right(keys, (end + '\uffff',)) if end else len(keys)
+
+        if by_name and (start or end):
+            # Date bounds on a name-ordered scan: filter within the prefix range only
+            matching = [
+                k for k in keys[lo:hi]
+                if (not start or k[1] >= start) and (not end or k[1][:len(end)] <= end)
+            ]
+            keys, lo, hi = matching, 0, len(matching)
+
+        total = hi - lo
+        if before:
+            key = self._cursor_key(before, by_name)
+            end_pos = bisect_left(keys, key, lo, hi) if key else lo
+            begin = max(lo, end_pos - limit)
+            window = keys[begin:end_pos]
+        else:
+            key = self._cursor_key(after, by_name)
+            begin = bisect_right(keys, key, lo, hi) if key else lo
+            window = keys[begin:min(hi, begin + limit)]
+
+        events = [self._events[k[-1]] for k in window]
+        return EventPage(
+            events,
+            start=begin - lo,
+            total=total,
+            has_prev=begin > lo,
+            has_next=begin + len(window) < hi
+        )
+
+    @staticmethod
+    def cursor_for(event: Dict) -> str:
+        """Compact 'id@YYYYMMDDHHMM' cursor, safe to embed in a component custom_id."""
+        digits = ''.join(ch for ch in event.get('time', '') if ch.isdigit())
+        return f"{event['id']}@{digits}"
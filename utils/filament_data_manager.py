@@ -1,15 +1,125 @@
 import json
 import os
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta
+from utils.consumption_stats import RollingConsumption, earliest_period_start
+from utils.usage_export import export_csv_parts, filter_entries
+from utils.spool_forecast import SpoolForecast
+from utils.usage_log import UsageLog
+
+class BaseFilamentDataManager:
+    """
+    Behaviour shared by the storage engines: forecasting and low-stock alerts,
+    plus helpers built on the engine's get_inventory/iter_logs. Subclasses set up
+    their storage, then call _init_forecast().
+    """
 
-class FilamentDataManager:
     def __init__(self, data_path: str):
         self.data_path = data_path
+        self.version = 0 # Bumped on every change to inventory or logs, ours or another writer's
+        self.inventory = []
+
+    def _init_forecast(self):
+        # Per-spool consumption rates, seeded from the last few rate windows of history
+        self.forecast = SpoolForecast()
+        self.on_low_stock = None # on_low_stock(item, levels, days_left), called from the writing thread
+        start = datetime.now() - timedelta(days=self.forecast.window_days * 5)
+        self.forecast.rebuild(self.iter_logs(start=start.strftime("%Y-%m-%d %H:%M:%S")))
+        self.forecast.arm(self.get_inventory())
+
+    def configure_low_stock(self, low_grams, low_days, on_alert):
+        """Sets the alert thresholds and callback; spools already below them are not reported."""
+        self.forecast.low_grams = low_grams
+        self.forecast.low_days = low_days
+        self.forecast.arm(self.get_inventory())
+        self.on_low_stock = on_alert
+
+    def get_days_left(self, item):
+        return self.forecast.days_left(item['id'], item.get('weight_g', 0))
+
+    def _stock_changed(self, item):
+        """Reports low-stock thresholds this write pushed the spool across."""
+        if item is None:
+            return
+        levels = self.forecast.check(item['id'], item.get('weight_g', 0))
+        if levels and self.on_low_stock:
+            try:
+                self.on_low_stock(dict(item), levels, self.get_days_left(item))
+            except Exception as e:
+                print(f"Low stock alert failed for filament {item['id']}: {e}")
+
+    def get_item(self, filament_id):
+        return next((item for item in self.get_inventory() if item['id'] == filament_id), None)
+
+    def get_logs(self):
+        return list(self.iter_logs())
+
+    def log_usage_and_decrement(self, user_name, filament_id, amount_used):
+        """Records usage and reduces the spool weight. Returns False if the spool doesn't exist."""
+        self.log_usage(user_name, filament_id, amount_used)
+        return self.update_filament_weight(filament_id, amount_used)
+
+    def export_logs(self, part_limit, start=None, end=None, user=None):
+        """
+        Streams the (filtered) history into CSV parts of at most part_limit bytes.
+        Returns (parts, row count); parts are rewound spooled temp files the caller closes.
+        Blocking: call it from a worker thread.
+        """
+        entries = filter_entries(self.iter_logs(start=start, end=end), user=user)
+        return export_csv_parts(entries, part_limit)
+
+    def export_logs_to_csv(self):
+        """Converts logs to CSV string."""
+        parts, rows = self.export_logs(part_limit=float('inf'))
+        if not rows:
+            return "No logs available."
+        with parts[0] as part:
+            return part.read().decode("utf-8")
+
+class FilamentDataManager(BaseFilamentDataManager):
+    def __init__(self, data_path: str):
+        super().__init__(data_path)
         self.inventory_file = os.path.join(data_path, "inventory.json")
-        self.logs_file = os.path.join(data_path, "logs.json")
-        self.inventory = self.load_json(self.inventory_file)
-        self.logs = self.load_json(self.logs_file)
+        self.logs_file = os.path.join(data_path, "logs.json") # Desktop app's log, new entries imported on each check
+        self.legacy_imports = 0 # Bumped when desktop entries are imported (they may be older than the bot's latest)
+        self._cache = {} # filename -> ((mtime_ns, size), parsed data)
+        self.inventory = self.load_cached(self.inventory_file)
+
+        # Usage history: append-only monthly JSONL segments
+        self.usage_log = UsageLog(os.path.join(data_path, "usage_logs"))
+        migrated = self.usage_log.import_from_json(self.logs_file)
+        if migrated:
+            print(f"Imported {migrated} usage log entries from {self.logs_file} to {self.usage_log.log_dir}")
+
+        # Day/week/month totals: seeded from recent segments once, then updated per log_usage
+        self.consumption = RollingConsumption()
+        since_month = earliest_period_start(datetime.now()).strftime("%Y-%m")
+        self.consumption.rebuild(self.usage_log.iter_entries(since_month=since_month))
+
+        self._init_forecast()
+
+    @staticmethod
+    def _file_signature(filename):
+        try:
+            st = os.stat(filename)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def load_cached(self, filename):
+        """
+        Returns the parsed file, re-reading it only when stat() shows that another
+        writer changed it since we last loaded or saved it.
+        """
+        signature = self._file_signature(filename)
+        cached = self._cache.get(filename)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        data = self.load_json(filename)
+        if cached is not None:
+            self.version += 1 # Changed on disk behind our back
+        self._cache[filename] = (signature, data)
+        return data
 
     def load_json(self, filename):
         if not os.path.exists(filename):
@@ -34,32 +144,44 @@ class FilamentDataManager:
                 f.flush()
                 os.fsync(f.fileno())
             os.replace(tmp_filename, filename)
+            # Our own write: remember the new signature so it doesn't trigger a reload
+            self._cache[filename] = (self._file_signature(filename), data)
+            self.version += 1
         except Exception as e:
             print(f"Error saving {filename}: {e}")
+            self._cache.pop(filename, None) # Memory may now differ from disk: re-read next time
+
+    def data_version(self):
+        """Monotonic change counter for cheap "did anything change?" checks (costs one stat())."""
+        self.load_cached(self.inventory_file)
+        return self.version
 
     def get_inventory(self):
-        # Reload to ensure fresh data
-        self.inventory = self.load_json(self.inventory_file)
+        # Only re-parsed if the file changed on disk
+        self.inventory = self.load_cached(self.inventory_file)
         return self.inventory
 
-    def get_logs(self):
-         # Reload to ensure fresh data
-        self.logs = self.load_json(self.logs_file)
-        return self.logs
+    def iter_logs(self, start=None, end=None):
+        """Streams usage entries oldest first, optionally limited to start <= timestamp < end."""
+        entries = self.usage_log.iter_entries(since_month=start[:7] if start else None)
+        if start or end:
+            entries = filter_entries(entries, start=start, end=end)
+        return entries
 
     def update_filament_weight(self, filament_id, amount_used):
         """Reduces the weight of a filament by amount_used."""
-        self.inventory = self.load_json(self.inventory_file) # Ensure fresh data before update
+        self.inventory = self.load_cached(self.inventory_file) # Ensure fresh data before update
         for item in self.inventory:
             if item['id'] == filament_id:
                 item['weight_g'] = round(max(0, item['weight_g'] - amount_used), 2)
                 self.save_json(self.inventory_file, self.inventory)
+                self._stock_changed(item)
                 return True
         return False
 
     def add_inventory_item(self, type_name, brand, color, weight):
         """Adds a new filament reel to inventory."""
-        self.inventory = self.load_json(self.inventory_file) # Ensure fresh
+        self.inventory = self.load_cached(self.inventory_file) # Ensure fresh
         new_id = 1
         if self.inventory:
             new_id = max(item['id'] for item in self.inventory) + 1
@@ -73,11 +195,12 @@ class FilamentDataManager:
         }
         self.inventory.append(new_item)
         self.save_json(self.inventory_file, self.inventory)
+        self.forecast.check(new_id, new_item['weight_g']) # A new spool starts armed; no alert for its initial weight
         return new_id
 
     def update_inventory_item(self, item_id, **kwargs):
         """Updates an existing inventory item with new values."""
-        self.inventory = self.load_json(self.inventory_file)
+        self.inventory = self.load_cached(self.inventory_file)
         for item in self.inventory:
             if item['id'] == item_id:
                 for key, value in kwargs.items():
@@ -87,102 +210,84 @@ class FilamentDataManager:
                         else:
                             item[key] = value
                 self.save_json(self.inventory_file, self.inventory)
+                self._stock_changed(item)
                 return True
         return False
 
     def delete_inventory_item(self, item_id):
         """Removes an item from the inventory."""
-        self.inventory = self.load_json(self.inventory_file)
+        self.inventory = self.load_cached(self.inventory_file)
         original_len = len(self.inventory)
         self.inventory = [item for item in self.inventory if item['id'] != item_id]
         
         if len(self.inventory) < original_len:
             self.save_json(self.inventory_file, self.inventory)
+            self.forecast.forget(item_id)
             return True
         return False
 
     def log_usage(self, user_name, filament_id, amount_used):
         """Records a usage event."""
+        item = self._append_usage(user_name, filament_id, amount_used)
+        self._stock_changed(item) # A faster rate can cross the days-left threshold
+
+    def _append_usage(self, user_name, filament_id, amount_used):
         # Find filament details for the log
-        self.inventory = self.load_json(self.inventory_file)
+        self.inventory = self.load_cached(self.inventory_file)
         filament_details = next((item for item in self.inventory if item['id'] == filament_id), None)
         filament_str = f"{filament_details['color']} {filament_details['type']}" if filament_details else "Unknown"
 
+        now = datetime.now()
         log_entry = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": now.strftime("%Y-%m-%d %H:%M:%S"),
             "user": user_name,
             "filament_id": filament_id,
             "filament_desc": filament_str,
             "amount_used": amount_used
         }
         
-        self.logs = self.load_json(self.logs_file)
-        self.logs.append(log_entry)
-        self.save_json(self.logs_file, self.logs)
+        self.usage_log.append(log_entry)
+        self.consumption.add(now, float(amount_used), now)
+        self.forecast.record(filament_id, amount_used, now)
+        self.version += 1
+        return filament_details
 
-    def get_consumption_stats(self):
-        """Calculates total usage for current Day, Week, and Month."""
-        self.logs = self.load_json(self.logs_file) # Ensure fresh
-        now = datetime.now()
-        current_day = now.strftime("%Y-%m-%d")
-        current_week = now.strftime("%Y-W%U")
-        current_month = now.strftime("%Y-%m")
-
-        stats = {
-            "daily": 0.0,
-            "weekly": 0.0,
-            "monthly": 0.0
-        }
+    def log_usage_and_decrement(self, user_name, filament_id, amount_used):
+        """Records usage and reduces the spool weight. Returns False if the spool doesn't exist."""
+        self._append_usage(user_name, filament_id, amount_used)
+        return self.update_filament_weight(filament_id, amount_used) # Checks low stock once, after both changes
 
-        for log in self.logs:
-            try:
-                amt = float(log.get('amount_used', 0))
-            except (ValueError, TypeError):
-                continue
+    def import_legacy_logs(self):
+        """
+        Imports usage the desktop app appended to logs.json since the last check
+        (one stat() if it hasn't changed). Run it on the writer thread. Returns entries imported.
+        """
+        imported = self.usage_log.import_from_json(self.logs_file)
+        if not imported:
+            return 0
+        # The new entries are the tail of the log: re-seed the derived stats from it
+        now = datetime.now()
+        self.consumption.rebuild(self.usage_log.iter_entries(since_month=earliest_period_start(now).strftime("%Y-%m")), now)
+        start = now - timedelta(days=self.forecast.window_days * 5)
+        self.forecast.rebuild(self.iter_logs(start=start.strftime("%Y-%m-%d %H:%M:%S")))
+        self.legacy_imports += 1
+        self.version += 1
+        print(f"Imported {imported} usage log entries from {self.logs_file}")
+        return imported
 
-            ts_str = log.get('timestamp', '')
-            try:
-                dt = datetime.strptime(ts_str, "%Y-%m-%d %H:%M:%S")
-                
-                day_key = dt.strftime("%Y-%m-%d")
-                week_key = dt.strftime("%Y-W%U")
-                month_key = dt.strftime("%Y-%m")
-
-                if day_key == current_day:
-                    stats["daily"] += amt
-                
-                if week_key == current_week:
-                    stats["weekly"] += amt
-                
-                if month_key == current_month:
-                    stats["monthly"] += amt
-
-            except ValueError:
-                pass
-        
-        # Round values for display
-        for k in stats:
-            stats[k] = round(stats[k], 2)
-        
-        return stats
+    def get_consumption_stats(self):
+        """Total usage for the current Day, Week, and Month (maintained incrementally)."""
+        return self.consumption.snapshot()
 
-    def export_logs_to_csv(self):
-        """Converts logs to CSV string."""
-        self.logs = self.load_json(self.logs_file)
-        if not self.logs:
-            return "No logs available."
-        
-        # CSV Header
-        csv_content = "Timestamp,User,Filament,Amount Used (g)\n"
-        
-        for log in self.logs:
-            ts = log.get('timestamp', '')
-            user = log.get('user', 'Unknown')
-            filament = log.get('filament_desc', 'Unknown')
-            amount = log.get('amount_used', 0)
-            
-            # Simple manual CSV formatting to avoid imports if possible, 
-            # but wrapping in quotes handles commas in names
-            csv_content += f'"{ts}","{user}","{filament}",{amount}\n'
-            
-        return csv_content
+def create_data_manager(data_path: str, storage: str = None) -> BaseFilamentDataManager:
+    """
+    Picks the storage engine from FILAMENT_STORAGE: "json" (default, compatible
+    with the desktop app) or "sqlite" (data_path/filament.db).
+    """
+    storage = (storage or os.getenv('FILAMENT_STORAGE') or 'json').strip().lower()
+    if storage == 'sqlite':
+        from utils.filament_sqlite import SqliteFilamentDataManager
+        return SqliteFilamentDataManager(data_path)
+    if storage != 'json':
+        print(f"Unknown FILAMENT_STORAGE '{storage}', using json")
+    return FilamentDataManager(data_path)
@@ -0,0 +1,224 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from utils.consumption_stats import TIMESTAMP_FORMAT, period_starts
+from utils.filament_data_manager import BaseFilamentDataManager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS spools (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    type TEXT NOT NULL DEFAULT '',
+    brand TEXT NOT NULL DEFAULT '',
+    color TEXT NOT NULL DEFAULT '',
+    weight_g REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_spools_type_color ON spools(type, color);
+
+CREATE TABLE IF NOT EXISTS usage_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    user TEXT NOT NULL DEFAULT '',
+    filament_id INTEGER,
+    filament_desc TEXT NOT NULL DEFAULT '',
+    amount_used REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_usage_timestamp ON usage_events(timestamp);
+CREATE INDEX IF NOT EXISTS idx_usage_filament ON usage_events(filament_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_usage_user ON usage_events(user, timestamp);
+"""
+
+# Fixed SQL text so sqlite3's statement cache reuses the prepared statements
+SQL_SELECT_SPOOLS = "SELECT id, type, brand, color, weight_g FROM spools ORDER BY id"
+SQL_SELECT_SPOOL = "SELECT id, type, brand, color, weight_g FROM spools WHERE id = ?"
+SQL_INSERT_SPOOL = "INSERT INTO spools (type, brand, color, weight_g) VALUES (?, ?, ?, ?)"
+SQL_DECREMENT_SPOOL = "UPDATE spools SET weight_g = ROUND(MAX(0, weight_g - ?), 2) WHERE id = ?"
+SQL_DELETE_SPOOL = "DELETE FROM spools WHERE id = ?"
+SQL_INSERT_USAGE = ("INSERT INTO usage_events (timestamp, user, filament_id, filament_desc, amount_used) "
+                    "VALUES (?, ?, ?, ?, ?)")
+SQL_SELECT_USAGE = "SELECT timestamp, user, filament_id, filament_desc, amount_used FROM usage_events ORDER BY id"
+SQL_SELECT_USAGE_RANGE = ("SELECT timestamp, user, filament_id, filament_desc, amount_used FROM usage_events "
+                          "WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp, id")
+SQL_SUM_USAGE_SINCE = "SELECT COALESCE(SUM(amount_used), 0) FROM usage_events WHERE timestamp >= ?"
+
+SPOOL_COLUMNS = ("id", "type", "brand", "color", "weight_g")
+USAGE_COLUMNS = ("timestamp", "user", "filament_id", "filament_desc", "amount_used")
+
+class SqliteFilamentDataManager(BaseFilamentDataManager):
+    """
+    Filament data manager backed by SQLite in WAL mode (data_path/filament.db).
+
+    Same public API as the JSON manager: spools and usage events live in indexed
+    tables, ids come from AUTOINCREMENT, and logging usage together with the
+    weight decrement is one transaction. Selected with FILAMENT_STORAGE=sqlite.
+    Writes are expected to come from a single thread (the bot's DataWriter).
+    """
+
+    def __init__(self, data_path: str, db_name: str = "filament.db"):
+        super().__init__(data_path)
+        os.makedirs(data_path, exist_ok=True)
+        self.db_file = os.path.join(data_path, db_name)
+        # One connection per thread: WAL lets the event loop and export threads read
+        # while the writer thread commits, without sharing a transaction
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self.conn.executescript(SCHEMA)
+        self._seen_data_version = None
+        self.inventory = self.get_inventory()
+        self._init_forecast()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, check_same_thread=False, cached_statements=64)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")  # Same durability as the fsync'd JSON files
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+
+    @contextmanager
+    def _transaction(self):
+        """Commits (or rolls back) on exit and bumps the version after a commit."""
+        with self.conn:
+            yield self.conn
+        self.version += 1
+
+    def data_version(self):
+        """
+        Monotonic change counter. Our own writes bump it directly; PRAGMA data_version
+        on this thread's connection also catches commits from other connections.
+        """
+        seen = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._seen_data_version is not None and seen != self._seen_data_version:
+            self.version += 1
+        self._seen_data_version = seen
+        return self.version
+
+    # --- Inventory ---
+
+    def get_inventory(self):
+        self.inventory = [dict(zip(SPOOL_COLUMNS, row)) for row in self.conn.execute(SQL_SELECT_SPOOLS)]
+        return self.inventory
+
+    def get_item(self, filament_id):
+        row = self.conn.execute(SQL_SELECT_SPOOL, (filament_id,)).fetchone()
+        return dict(zip(SPOOL_COLUMNS, row)) if row else None
+
+    def update_filament_weight(self, filament_id, amount_used):
+        """Reduces the weight of a filament by amount_used."""
+        with self._transaction():
+            updated = self.conn.execute(SQL_DECREMENT_SPOOL, (amount_used, filament_id)).rowcount > 0
+        if updated:
+            self._stock_changed(self.get_item(filament_id))
+        return updated
+
+    def add_inventory_item(self, type_name, brand, color, weight):
+        """Adds a new filament reel to inventory."""
+        with self._transaction():
+            new_id = self.conn.execute(SQL_INSERT_SPOOL, (type_name, brand, color, round(weight, 2))).lastrowid
+        self.forecast.check(new_id, round(weight, 2)) # A new spool starts armed; no alert for its initial weight
+        return new_id
+
+    def update_inventory_item(self, item_id, **kwargs):
+        """Updates an existing inventory item with new values."""
+        fields = {k: v for k, v in kwargs.items() if k in SPOOL_COLUMNS and k != "id"}
+        if 'weight_g' in fields:
+            fields['weight_g'] = round(float(fields['weight_g']), 2)
+        if not fields:
+            return self.get_item(item_id) is not None
+        assignments = ", ".join(f"{column} = ?" for column in sorted(fields))
+        with self._transaction():
+            cursor = self.conn.execute(
+                f"UPDATE spools SET {assignments} WHERE id = ?",
+                [fields[column] for column in sorted(fields)] + [item_id]
+            )
+        if cursor.rowcount > 0:
+            self._stock_changed(self.get_item(item_id))
+        return cursor.rowcount > 0
+
+    def delete_inventory_item(self, item_id):
+        """Removes an item from the inventory."""
+        with self._transaction():
+            deleted = self.conn.execute(SQL_DELETE_SPOOL, (item_id,)).rowcount > 0
+        if deleted:
+            self.forecast.forget(item_id)
+        return deleted
+
+    # --- Usage ---
+
+    def _usage_row(self, user_name, filament_id, amount_used, now):
+        item = self.get_item(filament_id)
+        filament_str = f"{item['color']} {item['type']}" if item else "Unknown"
+        return (now.strftime(TIMESTAMP_FORMAT), user_name, filament_id, filament_str, amount_used)
+
+    def log_usage(self, user_name, filament_id, amount_used):
+        """Records a usage event."""
+        now = datetime.now()
+        with self._transaction():
+            self.conn.execute(SQL_INSERT_USAGE, self._usage_row(user_name, filament_id, amount_used, now))
+        self.forecast.record(filament_id, amount_used, now)
+        self._stock_changed(self.get_item(filament_id))
+
+    def log_usage_and_decrement(self, user_name, filament_id, amount_used):
+        """Records usage and reduces the spool weight in a single transaction."""
+        now = datetime.now()
+        with self._transaction():
+            self.conn.execute(SQL_INSERT_USAGE, self._usage_row(user_name, filament_id, amount_used, now))
+            updated = self.conn.execute(SQL_DECREMENT_SPOOL, (amount_used, filament_id)).rowcount > 0
+        self.forecast.record(filament_id, amount_used, now)
+        self._stock_changed(self.get_item(filament_id))
+        return updated
+
+    def iter_logs(self, start=None, end=None):
+        """Streams usage entries oldest first; a start/end range uses the timestamp index."""
+        if start or end:
+            cursor = self.conn.execute(SQL_SELECT_USAGE_RANGE, (start or "", end or "\uffff"))
+        else:
+            cursor = self.conn.execute(SQL_SELECT_USAGE)
+        for row in cursor:
+            yield dict(zip(USAGE_COLUMNS, row))
+
+    def get_consumption_stats(self):
+        """Total usage for the current Day, Week, and Month via indexed range sums."""
+        return {
+            period: round(self.conn.execute(SQL_SUM_USAGE_SINCE, (start.strftime(TIMESTAMP_FORMAT),)).fetchone()[0], 2)
+            for period, start in period_starts(datetime.now()).items()
+        }
+
+    # --- Migration ---
+
+    def import_from(self, source: BaseFilamentDataManager, batch_size: int = 5000):
+        """Copies inventory (keeping ids) and the full usage history from another manager."""
+        with self._transaction():
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO spools (id, type, brand, color, weight_g) VALUES (?, ?, ?, ?, ?)",
+                [tuple(item.get(column, '') for column in SPOOL_COLUMNS) for item in source.get_inventory()]
+            )
+
+        imported, batch = 0, []
+        for entry in source.iter_logs():
+            batch.append(tuple(entry.get(column, '') for column in USAGE_COLUMNS))
+            if len(batch) >= batch_size:
+                with self._transaction():
+                    self.conn.executemany(SQL_INSERT_USAGE, batch)
+                imported += len(batch)
+                batch = []
+        if batch:
+            with self._transaction():
+                self.conn.executemany(SQL_INSERT_USAGE, batch)
+            imported += len(batch)
+        self.get_inventory()
+        return imported
@@ -0,0 +1,144 @@
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; images are then cached at their original size
+    Image = None
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.webp')
+
+class ImageCache:
+    """
+    Content-addressed on-disk image cache with LRU eviction by total size.
+
+    Files are named after the SHA-256 of the uploaded bytes, so the same image is only
+    stored once. Access order is tracked in memory and mirrored to file mtimes, so it
+    survives restarts. Callers pass the names still in use (`pinned`), computed on
+    the event loop, and those are never evicted.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 200 * 1024 * 1024, max_dimensions=(1024, 1024)):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_dimensions = max_dimensions
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # name -> size, least recent first
+        self.total_bytes = 0
+        self._lock = threading.Lock()  # store() runs in a worker thread
+        self._scan()
+
+    def _scan(self):
+        if not os.path.isdir(self.cache_dir):
+            return
+        found = []
+        for name in os.listdir(self.cache_dir):
+            if not name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            try:
+                st = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            found.append((st.st_mtime, name, st.st_size))
+        for _, name, size in sorted(found):
+            self._entries[name] = size
+            self.total_bytes += size
+
+    def _prepare(self, data: bytes, filename: str):
+        """Resizes to embed-friendly dimensions. Returns (bytes, extension)."""
+        ext = os.path.splitext(filename or '')[1].lower()
+        if ext not in IMAGE_EXTENSIONS:
+            ext = '.png'
+        if Image is None:
+            return data, ext
+
+        try:
+            with Image.open(io.BytesIO(data)) as img:
+                if getattr(img, 'is_animated', False):
+                    return data, ext  # Keep animations intact
+                if img.width <= self.max_dimensions[0] and img.height <= self.max_dimensions[1] and len(data) < 1024 * 1024:
+                    return data, ext
+
+                img.thumbnail(self.max_dimensions)
+                out = io.BytesIO()
+                if img.mode in ('RGBA', 'LA', 'P'):
+                    img.save(out, format='PNG', optimize=True)
+                    return out.getvalue(), '.png'
+                img.convert('RGB').save(out, format='JPEG', quality=85, optimize=True)
+                return out.getvalue(), '.jpg'
+        except Exception as e:
+            print(f"Image resize failed, caching original: {e}")
+            return data, ext
+
+    def store(self, data: bytes, filename: str = '', pinned: Iterable[str] = ()) -> str:
+        """
+        Stores an image (blocking; run it in a thread), then evicts down to the budget
+        without touching `pinned`. Returns the cache file name.
+        """
+        digest = hashlib.sha256(data).hexdigest()[:24]
+        for ext in IMAGE_EXTENSIONS:
+            if f"{digest}{ext}" in self._entries:
+                self.touch(f"{digest}{ext}")
+                return f"{digest}{ext}"
+
+        content, ext = self._prepare(data, filename)
+        name = f"{digest}{ext}"
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._entries[name] = len(content)
+            self.total_bytes += len(content)
+        self.evict(pinned)
+        return name
+
+    def touch(self, name: str):
+        with self._lock:
+            if name not in self._entries:
+                return
+            self._entries.move_to_end(name)
+        try:
+            now = time.time()
+            os.utime(os.path.join(self.cache_dir, name), (now, now))
+        except OSError:
+            pass
+
+    def path(self, name: Optional[str]) -> Optional[str]:
+        """Returns the file path for a cached image, or None if it is gone."""
+        if not name or name not in self._entries:
+            return None
+        path = os.path.join(self.cache_dir, name)
+        if not os.path.exists(path):
+            with self._lock:
+                self.total_bytes -= self._entries.pop(name, 0)
+            return None
+        self.touch(name)
+        return path
+
+    def evict(self, pinned: Iterable[str] = ()):
+        """Drops least recently used files until the cache fits its budget, skipping `pinned` names."""
+        if self.total_bytes <= self.max_bytes:
+            return
+        keep = set(pinned)
+        with self._lock:
+            victims = []
+            for name in list(self._entries):
+                if self.total_bytes <= self.max_bytes:
+                    break
+                if name in keep:
+                    continue
+                self.total_bytes -= self._entries.pop(name)
+                victims.append(name)
+        for name in victims:
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
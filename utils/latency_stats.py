@@ -0,0 +1,5 @@
+def percentile(sorted_values, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence (0.0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
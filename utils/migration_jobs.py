@@ -0,0 +1,146 @@
+import json
+import os
+import secrets
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Set
+
+from utils.role_migration import RoleChanges
+
+class JournalWriter:
+    """
+    Write-ahead journal of (member, roles_before, roles_after) records.
+
+    Each record is appended and fsync'd before its edit is sent, so a crash can
+    never leave an applied edit without a record. A record whose edit then failed
+    is harmless: undoing it asks for roles the member already has.
+
+    record() blocks on the fsync, so async callers run it via asyncio.to_thread.
+    The file stays open for the whole run; close() it when the run ends.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()  # Engine workers record from several threads at once
+
+    def record(self, member_id: int, before: Set[int], after: Set[int]):
+        line = json.dumps({
+            'member_id': member_id,
+            'before': sorted(before),
+            'after': sorted(after),
+        })
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a')
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+class JobStore:
+    """
+    Migration runs recorded as jobs under data/migration_jobs/<job_id>/.
+
+    job.json holds the parameters, status and final stats; journal.jsonl is an
+    append-only log of every role edit made, which is what undo replays.
+    """
+
+    def __init__(self, root: str = os.path.join("data", "migration_jobs")):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def _dir(self, job_id: str) -> str:
+        return os.path.join(self.root, job_id)
+
+    def _meta_path(self, job_id: str) -> str:
+        return os.path.join(self._dir(job_id), "job.json")
+
+    def create(self, kind: str, params: Dict, undo_of: Optional[str] = None) -> Dict:
+        job_id = f"{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(2)}"
+        os.makedirs(self._dir(job_id))
+        job = {
+            'id': job_id,
+            'kind': kind,  # "migration" or "undo"
+            'status': 'running',
+            'created': datetime.now(timezone.utc).isoformat(),
+            'finished': None,
+            'params': params,
+            'undo_of': undo_of,
+            'undone_by': None,
+            'stats': {},
+        }
+        self._write(job)
+        return job
+
+    def _write(self, job: Dict):
+        path = self._meta_path(job['id'])
+        with open(f"{path}.tmp", 'w') as f:
+            json.dump(job, f, indent=4)
+        os.replace(f"{path}.tmp", path)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        try:
+            with open(self._meta_path(job_id), 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def update(self, job_id: str, **fields) -> Optional[Dict]:
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job.update(fields)
+        if fields.get('status') in ('complete', 'failed'):
+            job['finished'] = datetime.now(timezone.utc).isoformat()
+        self._write(job)
+        return job
+
+    def list_jobs(self, limit: int = 10) -> List[Dict]:
+        """Most recent first (job ids sort by creation time)."""
+        jobs = []
+        for job_id in sorted(os.listdir(self.root), reverse=True):
+            job = self.get(job_id)
+            if job:
+                jobs.append(job)
+            if len(jobs) >= limit:
+                break
+        return jobs
+
+    def journal(self, job_id: str) -> JournalWriter:
+        return JournalWriter(os.path.join(self._dir(job_id), "journal.jsonl"))
+
+    def read_journal(self, job_id: str) -> Iterator[Dict]:
+        path = os.path.join(self._dir(job_id), "journal.jsonl")
+        if not os.path.exists(path):
+            return
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Torn final line from a crash mid-append
+
+    def undo_changes(self, job_id: str) -> RoleChanges:
+        """
+        Replays the journal in reverse into per-member changes that restore roles_before.
+        Newest edits come first; a member edited more than once goes back to their earliest state.
+        """
+        first_before: Dict[int, Set[int]] = {}
+        last_after: Dict[int, Set[int]] = {}
+        for entry in self.read_journal(job_id):
+            first_before.setdefault(entry['member_id'], set(entry['before']))
+            last_after[entry['member_id']] = set(entry['after'])
+
+        changes: RoleChanges = {}
+        for member_id in reversed(list(last_after)):
+            before, after = first_before[member_id], last_after[member_id]
+            changes[member_id] = (before - after, after - before)
+        return changes
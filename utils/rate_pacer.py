@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+import discord
+
+
+class RatePacer:
+    """
+    Paces Discord REST calls from a worker pool.
+
+    discord.py already reads the X-RateLimit-* headers and holds requests while a
+    bucket is exhausted, so workers can simply keep calls in flight. When Discord
+    still answers 429 (or discord.py gives up waiting), the server-provided
+    retry_after is honored, and the gap between calls is widened and then
+    relaxed again on success (AIMD).
+    """
+
+    def __init__(self, min_interval: float = 0.0, max_interval: float = 5.0, max_retries: int = 5):
+        self.base_interval = min_interval
+        self.interval = min_interval
+        self.max_interval = max_interval
+        self.max_retries = max_retries
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+        self.calls = 0
+        self.rate_limited = 0
+
+    async def wait(self):
+        """Reserves the next call slot, sleeping if calls are coming in too fast."""
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def on_success(self):
+        # Additive decrease back towards the configured minimum
+        self.interval = max(self.base_interval, self.interval - 0.05)
+
+    def on_rate_limited(self, retry_after: float):
+        self.rate_limited += 1
+        # Multiplicative increase, and nobody starts a call before the reset
+        self.interval = min(self.max_interval, max(0.25, self.interval * 2))
+        self._next_slot = max(self._next_slot, time.monotonic() + retry_after)
+
+    @staticmethod
+    def retry_after(error: Exception):
+        """Seconds to wait if `error` is a rate limit, otherwise None."""
+        if isinstance(error, discord.RateLimited):
+            return float(error.retry_after)
+        if isinstance(error, discord.HTTPException) and error.status == 429:
+            try:
+                return float(error.response.headers.get('Retry-After', 1))
+            except (AttributeError, TypeError, ValueError):
+                return 1.0
+        return None
+
+    async def call(self, factory):
+        """Runs `await factory()` under pacing, retrying rate-limited attempts."""
+        for attempt in range(self.max_retries + 1):
+            await self.wait()
+            try:
+                self.calls += 1
+                result = await factory()
+                self.on_success()
+                return result
+            except Exception as e:
+                retry_after = self.retry_after(e)
+                if retry_after is None or attempt >= self.max_retries:
+                    raise
+                self.on_rate_limited(retry_after)
+                print(f"Rate limited, retrying in {retry_after:.1f}s (interval now {self.interval:.2f}s)")
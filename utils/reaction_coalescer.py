@@ -0,0 +1,61 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Tuple
+
+# (guild_id, member_id, role_id)
+CoalesceKey = Tuple[int, int, int]
+
+class ReactionCoalescer:
+    """
+    Collapses bursts of reaction add/remove events into their net effect.
+
+    Each (member, role) pair gets a short settle window after its first event; only the
+    last requested state is applied when it closes. Applies for the same pair never
+    overlap, so responses can't land out of order. `apply` must be idempotent and
+    return True only if it actually changed the member's roles.
+    """
+
+    def __init__(self, apply: Callable[[int, int, int, bool], Awaitable[bool]], window: float = 1.5):
+        self.apply = apply
+        self.window = window
+        self.pending: Dict[CoalesceKey, bool] = {}
+        self.tasks: Dict[CoalesceKey, asyncio.Task] = {}
+        self.events = 0
+        self.edits = 0
+        self.noops = 0
+
+    def submit(self, guild_id: int, member_id: int, role_id: int, add: bool):
+        key = (guild_id, member_id, role_id)
+        self.events += 1
+        self.pending[key] = add
+        if key not in self.tasks:
+            self.tasks[key] = asyncio.create_task(self._settle(key))
+
+    async def _settle(self, key: CoalesceKey):
+        try:
+            while key in self.pending:
+                await asyncio.sleep(self.window)
+                want = self.pending.pop(key)
+                try:
+                    if await self.apply(*key, want):
+                        self.edits += 1
+                    else:
+                        self.noops += 1
+                except Exception as e:
+                    print(f"Reaction role update failed for member {key[1]} / role {key[2]}: {e}")
+                # Events that arrived during the edit get their own window
+        finally:
+            self.tasks.pop(key, None)
+
+    async def drain(self):
+        """Waits for every pending window to settle (e.g. before shutdown)."""
+        while self.tasks:
+            await asyncio.gather(*list(self.tasks.values()), return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'events': self.events,
+            'edits': self.edits,
+            'noops': self.noops,
+            'saved': self.events - self.edits,
+            'pending': len(self.tasks),
+        }
@@ -0,0 +1,124 @@
+import asyncio
+from typing import List, Sequence, Tuple
+
+import discord
+
+from utils.rate_pacer import RatePacer
+from utils.reaction_role_index import ReactionRoleIndex
+
+MAX_REACTIONS_PER_MESSAGE = 20
+MAX_FIELD_LENGTH = 1024  # Discord's embed limits
+MAX_FIELDS = 25
+MAX_EMBED_LENGTH = 6000
+MORE_SUFFIX = " | +{} more"
+
+def shard_pairs(pairs: Sequence[Tuple[str, int]], size: int = MAX_REACTIONS_PER_MESSAGE) -> List[List[Tuple[str, int]]]:
+    """Splits (emoji, role_id) pairs into message-sized shards, dropping duplicate emojis."""
+    seen, unique = set(), []
+    for emoji, role_id in pairs:
+        if emoji not in seen:
+            seen.add(emoji)
+            unique.append((emoji, role_id))
+    return [unique[i:i + size] for i in range(0, len(unique), size)]
+
+def link_fields(links: Sequence[str], budget: int) -> List[str]:
+    """
+    Packs links into embed field values within Discord's field, field count and `budget`
+    (remaining embed length) limits. Links that don't fit are summarised as "+N more".
+    """
+    reserve = len(MORE_SUFFIX.format(len(links)))
+    budget -= reserve
+    fields: List[str] = []
+    shown = 0
+    for link in links:
+        if fields and len(fields[-1]) + 3 + len(link) <= MAX_FIELD_LENGTH - reserve:
+            cost = 3 + len(link)
+            if cost > budget:
+                break
+            fields[-1] += " | " + link
+        else:
+            cost = len("Panel Parts (cont.)") + len(link)
+            if len(fields) == MAX_FIELDS or cost > budget:
+                break
+            fields.append(link)
+        budget -= cost
+        shown += 1
+    if fields and shown < len(links):
+        fields[-1] += MORE_SUFFIX.format(len(links) - shown)
+    return fields
+
+class ReactionPanelBuilder:
+    """
+    Publishes reaction-role panels of any size.
+
+    Catalogs over Discord's 20-reactions-per-message cap are sharded across linked
+    messages. All shards are registered in the index with a single save once every
+    message is posted (a failed post deletes the partial panel), and reactions are
+    seeded concurrently while a shared pacer keeps them under the channel's
+    reaction rate limit (about one per 250 ms).
+    """
+
+    def __init__(self, index: ReactionRoleIndex, reaction_interval: float = 0.25, concurrency: int = 4):
+        self.index = index
+        self.reaction_interval = reaction_interval
+        self.concurrency = concurrency
+
+    async def publish(self, channel, title: str, pairs: Sequence[Tuple[str, int]], footer: str,
+                      color: int = 0x3498DB) -> List[Tuple[discord.Message, List[str]]]:
+        """Posts and indexes the panel. Returns [(message, emojis to seed)] per shard."""
+        shards = shard_pairs(pairs)
+        sent: List[Tuple[discord.Message, List[str]]] = []
+        try:
+            for i, shard in enumerate(shards, start=1):
+                embed = discord.Embed(
+                    title=title if len(shards) == 1 else f"{title} ({i}/{len(shards)})",
+                    description="".join(f"{emoji} : <@&{role_id}>\n" for emoji, role_id in shard),
+                    color=color
+                )
+                embed.set_footer(text=footer if len(shards) == 1 else f"{footer} • Part {i}/{len(shards)}")
+                msg = await channel.send(embed=embed)
+                sent.append((msg, [emoji for emoji, _ in shard]))
+        except Exception:
+            for msg, _ in sent:
+                try:
+                    await msg.delete()
+                except discord.HTTPException:
+                    pass
+            raise
+
+        for (msg, _), shard in zip(sent, shards):
+            self.index.register_panel(msg.id, channel.guild.id, channel.id, dict(shard), save=False)
+        self.index.save()
+
+        if len(sent) > 1:
+            await self.link_shards([msg for msg, _ in sent])
+        return sent
+
+    async def link_shards(self, messages: List[discord.Message]):
+        """Adds jump links to every part on the first message."""
+        first = messages[0]
+        embed = first.embeds[0]
+        links = [f"[Part {i}]({m.jump_url})" for i, m in enumerate(messages, start=1)]
+        for i, value in enumerate(link_fields(links, MAX_EMBED_LENGTH - len(embed))):
+            embed.add_field(name="Panel Parts" if i == 0 else "Panel Parts (cont.)", value=value, inline=False)
+        try:
+            await first.edit(embed=embed)
+        except discord.HTTPException as e:
+            print(f"Failed to link reaction panel parts: {e}")
+
+    async def seed(self, shards: List[Tuple[discord.Message, List[str]]]) -> int:
+        """Adds every shard's reactions concurrently. Returns the number that failed."""
+        pacer = RatePacer(min_interval=self.reaction_interval)  # Reactions share one channel bucket
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def add(msg, emoji):
+            async with semaphore:
+                try:
+                    await pacer.call(lambda: msg.add_reaction(emoji))
+                    return True
+                except Exception as e:
+                    print(f"Failed to add reaction {emoji}: {e}")
+                    return False
+
+        results = await asyncio.gather(*(add(msg, emoji) for msg, emojis in shards for emoji in emojis))
+        return results.count(False)
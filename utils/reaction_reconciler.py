@@ -0,0 +1,122 @@
+import asyncio
+from typing import Dict, Optional, Set
+
+import discord
+
+from utils.rate_pacer import RatePacer
+from utils.reaction_role_index import ReactionRoleIndex
+from utils.role_guard import RoleGuard
+from utils.role_migration import RoleChanges, apply_role_change
+
+def diff_reaction_roles(reactors: Dict[int, Set[int]], holders: Dict[int, Set[int]],
+                        remove: bool = False, granted: Optional[Dict[int, Set[int]]] = None) -> RoleChanges:
+    """
+    Compares who reacted for each role with who holds it.
+    Returns per-member (roles to add, roles to remove), merged so each member needs one edit.
+    With remove, only holders the bot itself granted the role to (per `granted`) lose it.
+    """
+    changes: RoleChanges = {}
+    granted = granted or {}
+    for role_id, reactor_ids in reactors.items():
+        held = holders.get(role_id, set())
+        for member_id in reactor_ids - held:
+            changes.setdefault(member_id, (set(), set()))[0].add(role_id)
+        if remove:
+            for member_id in (held & granted.get(role_id, set())) - reactor_ids:
+                changes.setdefault(member_id, (set(), set()))[1].add(role_id)
+    return changes
+
+class ReactionReconciler:
+    """
+    Repairs reaction-role drift from reactions added/removed while the bot was offline.
+
+    Reactors of every indexed panel are paged through (discord.py fetches 100 per
+    request), diffed against role membership, and fixed in small paced batches.
+    A role is only reconciled if every panel that grants it was read successfully.
+    """
+
+    def __init__(self, index: ReactionRoleIndex, pacer: Optional[RatePacer] = None,
+                 batch_size: int = 10, batch_pause: float = 1.0, guard: Optional[RoleGuard] = None):
+        self.index = index
+        self.guard = guard
+        self.pacer = pacer or RatePacer()
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+
+    async def collect_reactors(self, guild) -> Dict[int, Optional[Set[int]]]:
+        """role_id -> human member ids that reacted, or None if a panel could not be read."""
+        reactors: Dict[int, Optional[Set[int]]] = {}
+        for message_id, panel in self.index.panels_for_guild(guild.id):
+            for role_id in panel['roles'].values():
+                reactors.setdefault(role_id, set())
+
+            channel = guild.get_channel(panel['channel_id'])
+            try:
+                if channel is None:
+                    print(f"Reconcile: channel of panel {message_id} is not visible, skipping.")
+                    for role_id in panel['roles'].values():
+                        reactors[role_id] = None
+                    continue
+                message = await channel.fetch_message(message_id)
+                for reaction in message.reactions:
+                    role_id = self.index.lookup(message_id, reaction.emoji)
+                    if not role_id or reactors.get(role_id) is None:
+                        continue
+                    async for user in reaction.users(limit=None):
+                        member = guild.get_member(user.id)
+                        if member and not member.bot:
+                            reactors[role_id].add(user.id)
+            except discord.NotFound:
+                # Panel is gone: stop granting its roles, but don't strip anyone
+                print(f"Reaction role panel {message_id} no longer exists, removing from index.")
+                self.index.remove_panel(message_id)
+                for role_id in panel['roles'].values():
+                    reactors[role_id] = None
+            except discord.HTTPException as e:
+                print(f"Reconcile: could not read panel {message_id}: {e}")
+                for role_id in panel['roles'].values():
+                    reactors[role_id] = None
+        return reactors
+
+    async def apply(self, guild, changes: RoleChanges, reason: str = "Reaction role reconciliation") -> Dict:
+        stats = {'fixed': 0, 'errors': 0}
+        items = list(changes.items())
+        for i in range(0, len(items), self.batch_size):
+            if i:
+                await asyncio.sleep(self.batch_pause)
+            batch = items[i:i + self.batch_size]
+            results = await asyncio.gather(
+                *(apply_role_change(guild, member_id, add, remove, self.pacer, reason)
+                  for member_id, (add, remove) in batch),
+                return_exceptions=True
+            )
+            for (member_id, _), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    print(f"Reconcile: failed to update member {member_id}: {result}")
+                    stats['errors'] += 1
+                elif result is not None:
+                    before, after = result
+                    stats['fixed'] += len(before ^ after)
+                    self.index.record_grants(added=[(r, member_id) for r in after - before],
+                                             removed=[(r, member_id) for r in before - after], save=False)
+        self.index.save()
+        return stats
+
+    async def reconcile_guild(self, guild, remove: bool = False) -> Dict:
+        """Returns {'fixed': role changes applied, 'errors': failed members, 'skipped_roles': n}."""
+        reactors = await self.collect_reactors(guild)
+        complete, holders = {}, {}
+        for role_id, ids in reactors.items():
+            role = guild.get_role(role_id)
+            if ids is None or role is None:
+                continue
+            if self.guard and not self.guard.check(guild, role, "reconcile reaction roles"):
+                continue
+            complete[role_id] = ids
+            holders[role_id] = {m.id for m in role.members if not m.bot}
+
+        granted = {role_id: self.index.granted(role_id) for role_id in complete}
+        changes = diff_reaction_roles(complete, holders, remove=remove, granted=granted)
+        stats = await self.apply(guild, changes)
+        stats['skipped_roles'] = len(reactors) - len(complete)
+        return stats
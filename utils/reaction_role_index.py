@@ -0,0 +1,117 @@
+import json
+import os
+import re
+from typing import Dict, Iterable, Optional, Set
+
+CUSTOM_EMOJI_PATTERN = re.compile(r'<a?:\w+:(\d+)>')
+PANEL_LINE_PATTERN = re.compile(r'^\s*(\S+)\s*:\s*<@&(\d+)>')
+
+def emoji_key(emoji) -> str:
+    """
+    Normalizes an emoji for lookups. Custom emojis are keyed by id (so renames and
+    animated/static markup don't matter), unicode emojis without variation selectors.
+    """
+    text = str(emoji)
+    match = CUSTOM_EMOJI_PATTERN.fullmatch(text)
+    if match:
+        return match.group(1)
+    return text.replace('\ufe0f', '')
+
+def parse_panel_description(description: str) -> Dict[str, int]:
+    """Extracts {emoji_key: role_id} from a reaction-role embed description ("🔴 : <@&123>")."""
+    roles = {}
+    for line in (description or '').split('\n'):
+        match = PANEL_LINE_PATTERN.match(line)
+        if match:
+            roles[emoji_key(match.group(1))] = int(match.group(2))
+    return roles
+
+class ReactionRoleIndex:
+    """
+    Persisted (message_id, emoji) -> role_id map for reaction-role panels.
+
+    Lookups are plain dict access, so reaction events can be resolved without fetching
+    the panel message. The file is rewritten atomically on every change.
+
+    It also records which members got a role from the bot through a reaction, so
+    reconciliation never strips a role that was granted some other way.
+    """
+
+    def __init__(self, path: str = "reaction_roles.json"):
+        self.path = path
+        self.panels: Dict[int, Dict] = {}
+        self.grants: Dict[int, Set[int]] = {} # role_id -> member ids we granted it to via a reaction
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                raw = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Failed to load reaction role index: {e}")
+            return
+        for message_id, panel in raw.get('panels', {}).items():
+            panel['roles'] = {k: int(v) for k, v in panel.get('roles', {}).items()}
+            self.panels[int(message_id)] = panel
+        for role_id, member_ids in raw.get('grants', {}).items():
+            self.grants[int(role_id)] = {int(m) for m in member_ids}
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'panels': {str(k): v for k, v in self.panels.items()},
+                'grants': {str(k): sorted(v) for k, v in self.grants.items() if v},
+            }, f, indent=4)
+        os.replace(tmp_path, self.path)
+
+    def __len__(self):
+        return len(self.panels)
+
+    def __contains__(self, message_id):
+        return message_id in self.panels
+
+    def lookup(self, message_id: int, emoji) -> Optional[int]:
+        panel = self.panels.get(message_id)
+        if panel is None:
+            return None
+        return panel['roles'].get(emoji_key(emoji))
+
+    def register_panel(self, message_id: int, guild_id: int, channel_id: int, roles: Dict[str, int], save: bool = True):
+        self.panels[message_id] = {
+            'guild_id': guild_id,
+            'channel_id': channel_id,
+            'roles': {emoji_key(k): int(v) for k, v in roles.items()},
+        }
+        if save:
+            self.save()
+
+    def remove_panel(self, message_id: int, save: bool = True) -> bool:
+        if self.panels.pop(message_id, None) is None:
+            return False
+        if save:
+            self.save()
+        return True
+
+    def granted(self, role_id: int) -> Set[int]:
+        return self.grants.get(role_id, set())
+
+    def record_grants(self, added: Iterable = (), removed: Iterable = (), save: bool = True):
+        """Updates the grant record from (role_id, member_id) pairs the bot just added/removed."""
+        changed = False
+        for role_id, member_id in added:
+            if member_id not in self.grants.setdefault(role_id, set()):
+                self.grants[role_id].add(member_id)
+                changed = True
+        for role_id, member_id in removed:
+            if member_id in self.grants.get(role_id, ()):
+                self.grants[role_id].discard(member_id)
+                changed = True
+        if changed and save:
+            self.save()
+        return changed
+
+    def panels_for_guild(self, guild_id: int) -> Iterable:
+        return [(mid, p) for mid, p in self.panels.items() if p.get('guild_id') == guild_id]
@@ -0,0 +1,98 @@
+import time
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Optional, Set
+
+
+class ReminderWheel:
+    """
+    Hashed timing wheel for event reminders.
+
+    Reminders are bucketed by absolute tick (one minute by default), so scheduling
+    and cancelling are O(1) dict operations. `advance()` only visits the ticks that
+    elapsed since the previous call, falling back to a scan of the occupied buckets
+    when the bot was offline for longer than that.
+    """
+
+    def __init__(self, tick_seconds: int = 60):
+        self.tick_seconds = tick_seconds
+        self._buckets: Dict[int, Dict[Hashable, Any]] = {}  # tick -> {key: payload}
+        self._ticks: Dict[Hashable, int] = {}               # key -> tick
+        self._owners: Dict[Hashable, Set[Hashable]] = {}    # owner -> {keys}
+        self._key_owner: Dict[Hashable, Hashable] = {}      # key -> owner
+        self._cursor: Optional[int] = None                  # last tick processed
+
+    def __len__(self):
+        return len(self._ticks)
+
+    def __contains__(self, key):
+        return key in self._ticks
+
+    def _tick_for(self, when) -> int:
+        if isinstance(when, datetime):
+            when = when.timestamp()
+        return int(when // self.tick_seconds)
+
+    def schedule(self, key: Hashable, when, payload: Any = None, owner: Hashable = None):
+        """Schedules (or reschedules) `key` to fire at `when` (datetime or epoch seconds)."""
+        self.cancel(key)
+        tick = self._tick_for(when)
+        if self._cursor is not None and tick <= self._cursor:
+            # Already overdue: park it on the current tick so the next advance() fires it
+            tick = self._cursor
+        self._buckets.setdefault(tick, {})[key] = payload
+        self._ticks[key] = tick
+        if owner is not None:
+            self._owners.setdefault(owner, set()).add(key)
+            self._key_owner[key] = owner
+
+    def cancel(self, key: Hashable) -> bool:
+        """Removes a single reminder. Returns False if it was not scheduled."""
+        tick = self._ticks.pop(key, None)
+        if tick is None:
+            return False
+        bucket = self._buckets.get(tick)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del self._buckets[tick]
+        self._forget_owner(key)
+        return True
+
+    def _forget_owner(self, key):
+        owner = self._key_owner.pop(key, None)
+        if owner is not None:
+            keys = self._owners.get(owner)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._owners[owner]
+
+    def cancel_owner(self, owner: Hashable) -> int:
+        """Removes every reminder registered for `owner` (e.g. an event id)."""
+        keys = list(self._owners.get(owner, ()))
+        for key in keys:
+            self.cancel(key)
+        return len(keys)
+
+    def advance(self, now=None) -> List[Any]:
+        """Pops and returns the payloads of every reminder due at or before `now`."""
+        if now is None:
+            now = time.time()
+        now_tick = self._tick_for(now)
+
+        if self._cursor is None or now_tick - self._cursor > len(self._buckets):
+            due_ticks = sorted(t for t in self._buckets if t <= now_tick)
+        else:
+            # The cursor tick itself is revisited to pick up reminders parked there by schedule()
+            due_ticks = [t for t in range(self._cursor, now_tick + 1) if t in self._buckets]
+        if self._cursor is None or now_tick > self._cursor:
+            self._cursor = now_tick
+
+        fired = []
+        for tick in due_ticks:
+            bucket = self._buckets.pop(tick, {})
+            for key, payload in bucket.items():
+                del self._ticks[key]
+                self._forget_owner(key)
+                fired.append(payload)
+        return fired
@@ -0,0 +1,62 @@
+from collections import Counter
+from typing import Dict, List, Tuple
+
+class RoleCounter:
+    """
+    Per-guild role membership counts kept current from gateway events.
+
+    Rebuilt once from the member cache at ready, then adjusted by role diffs on
+    member join/update/remove, so "how many people have X?" is a dict lookup.
+    `version` bumps on every change so derived views (e.g. stats embeds) can be cached.
+    """
+
+    def __init__(self):
+        self.counts: Dict[int, Counter] = {}
+        self.version: Dict[int, int] = {}
+
+    @staticmethod
+    def _role_ids(member):
+        return {r.id for r in member.roles if not r.is_default()}
+
+    def _bump(self, guild_id: int):
+        self.version[guild_id] = self.version.get(guild_id, 0) + 1
+
+    def rebuild(self, guild):
+        counts = Counter()
+        for member in guild.members:
+            counts.update(self._role_ids(member))
+        self.counts[guild.id] = counts
+        self._bump(guild.id)
+
+    def member_join(self, member):
+        self._apply(member.guild.id, added=self._role_ids(member))
+
+    def member_remove(self, member):
+        self._apply(member.guild.id, removed=self._role_ids(member))
+
+    def member_update(self, before, after):
+        old, new = self._role_ids(before), self._role_ids(after)
+        if old != new:
+            self._apply(after.guild.id, added=new - old, removed=old - new)
+
+    def role_delete(self, role):
+        if self.counts.get(role.guild.id, Counter()).pop(role.id, None) is not None:
+            self._bump(role.guild.id)
+
+    def _apply(self, guild_id: int, added=(), removed=()):
+        if not (added or removed):
+            return
+        counts = self.counts.setdefault(guild_id, Counter())
+        for role_id in added:
+            counts[role_id] += 1
+        for role_id in removed:
+            counts[role_id] -= 1
+            if counts[role_id] <= 0:
+                del counts[role_id]
+        self._bump(guild_id)
+
+    def count(self, guild_id: int, role_id: int) -> int:
+        return self.counts.get(guild_id, Counter()).get(role_id, 0)
+
+    def top(self, guild_id: int, limit: int = 25) -> List[Tuple[int, int]]:
+        return self.counts.get(guild_id, Counter()).most_common(limit)
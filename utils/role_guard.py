@@ -0,0 +1,58 @@
+from typing import Dict, Optional, Set, Tuple
+
+class RoleGuard:
+    """
+    Pre-flight check for role mutations.
+
+    Whether the bot can manage a (guild, role) pair is derived locally from its
+    permissions and top-role position and cached, so a misconfigured role is
+    rejected without spending an API call (and an invalid request) per member.
+    The cache is cleared on role/guild updates; each rejection is reported once.
+    """
+
+    def __init__(self):
+        self.cache: Dict[Tuple[int, int], Optional[str]] = {}  # None = manageable, else the reason
+        self.reported: Set[Tuple[int, int]] = set()
+
+    @staticmethod
+    def _reason(guild, role) -> Optional[str]:
+        me = guild.me
+        if me is None:
+            return "bot member is not cached"
+        if role.is_default():
+            return "@everyone cannot be assigned"
+        if role.managed:
+            return "role is managed by an integration"
+        perms = me.guild_permissions
+        if not (perms.manage_roles or perms.administrator):
+            return "bot lacks the Manage Roles permission"
+        if role >= me.top_role:
+            return f"role is not below the bot's top role ({me.top_role.name})"
+        return None
+
+    def reason(self, guild, role) -> Optional[str]:
+        key = (guild.id, role.id)
+        if key not in self.cache:
+            self.cache[key] = self._reason(guild, role)
+        return self.cache[key]
+
+    def can_manage(self, guild, role) -> bool:
+        return self.reason(guild, role) is None
+
+    def check(self, guild, role, action: str = "update roles") -> bool:
+        """Like can_manage, but prints the first rejection for each role."""
+        reason = self.reason(guild, role)
+        if reason is None:
+            return True
+        key = (guild.id, role.id)
+        if key not in self.reported:
+            self.reported.add(key)
+            print(f"ERROR: Cannot {action} with role {role.name} in {guild.name}: {reason}. "
+                  f"Skipping these requests until the role or bot permissions change.")
+        return False
+
+    def invalidate(self, guild_id: int):
+        """Forgets every decision for a guild (role positions are relative, so one change affects all)."""
+        for key in [k for k in self.cache if k[0] == guild_id]:
+            del self.cache[key]
+        self.reported = {k for k in self.reported if k[0] != guild_id}
@@ -0,0 +1,297 @@
+import asyncio
+import csv
+import json
+import os
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import discord
+
+from utils.rate_pacer import RatePacer
+
+# member_id -> (role ids to add, role ids to remove)
+RoleChanges = Dict[int, Tuple[Set[int], Set[int]]]
+
+def changes_from_state(state: Dict) -> RoleChanges:
+    """Decodes the change set stored in an engine checkpoint."""
+    return {
+        int(member_id): (set(add), set(remove))
+        for member_id, (add, remove) in state.get('changes', {}).items()
+    }
+
+class JoinDateIndex:
+    """
+    Members sorted by join date. Splitting at a cutoff is a single bisect, so the
+    alumni/member cohorts of a large guild are found without comparing every member.
+    """
+
+    def __init__(self, members: Iterable):
+        entries = sorted((m.joined_at, m.id, m) for m in members if not m.bot and m.joined_at)
+        self.dates = [e[0] for e in entries]
+        self.members = [e[2] for e in entries]
+
+    def __len__(self):
+        return len(self.members)
+
+    def split(self, cutoff: datetime) -> Tuple[List, List]:
+        """Returns (joined before cutoff, joined on/after cutoff)."""
+        i = bisect_left(self.dates, cutoff)
+        return self.members[:i], self.members[i:]
+
+class MigrationPlan:
+    """
+    The full set of role changes for an alumni migration, computed without touching the API.
+    `changes` is what MigrationEngine executes, so a previewed plan runs exactly as shown.
+    """
+
+    CATEGORIES = ("add_alumni", "remove_member", "add_member", "remove_alumni", "remove_legacy")
+
+    def __init__(self, guild_id: int, alumni_role_id: int, member_role_id: int, cutoff: datetime,
+                 remove_role_id: Optional[int] = None):
+        self.guild_id = guild_id
+        self.alumni_role_id = alumni_role_id
+        self.member_role_id = member_role_id
+        self.remove_role_id = remove_role_id
+        self.cutoff = cutoff
+        self.changes: RoleChanges = {}
+        self.counts = {c: 0 for c in self.CATEGORIES}
+        self.cohorts = {"alumni": 0, "member": 0}
+        self.rows: List[Tuple] = []  # (member_id, name, joined_at, cohort, added, removed)
+
+    @property
+    def considered(self) -> int:
+        return self.cohorts["alumni"] + self.cohorts["member"]
+
+    @classmethod
+    def build(cls, guild, alumni_role_id: int, member_role_id: int, cutoff: datetime,
+              remove_role_id: Optional[int] = None, index: Optional[JoinDateIndex] = None) -> 'MigrationPlan':
+        plan = cls(guild.id, alumni_role_id, member_role_id, cutoff, remove_role_id)
+        index = index or JoinDateIndex(guild.members)
+        alumni, members = index.split(cutoff)
+        plan.cohorts = {"alumni": len(alumni), "member": len(members)}
+
+        for cohort, group, keep, drop, drop_category in (
+            ("alumni", alumni, alumni_role_id, member_role_id, "remove_member"),
+            ("member", members, member_role_id, alumni_role_id, "remove_alumni"),
+        ):
+            for member in group:
+                current = {r.id for r in member.roles}
+                add, remove = {keep} - current, {drop} & current
+                if remove_role_id and remove_role_id in current and remove_role_id != keep:
+                    remove.add(remove_role_id)
+                if not (add or remove):
+                    continue
+                plan.changes[member.id] = (add, remove)
+                plan.rows.append((member.id, str(member), member.joined_at.strftime('%Y-%m-%d'), cohort, add, remove))
+                if add:
+                    plan.counts[f"add_{cohort}"] += 1
+                if drop in remove:
+                    plan.counts[drop_category] += 1
+                if remove_role_id and remove_role_id in remove:
+                    plan.counts["remove_legacy"] += 1
+        return plan
+
+    def write_csv(self, fp, role_names: Optional[Dict[int, str]] = None):
+        """Writes one row per member that will change."""
+        role_names = role_names or {}
+
+        def label(ids):
+            return ";".join(role_names.get(i, str(i)) for i in sorted(ids))
+
+        writer = csv.writer(fp)
+        writer.writerow(["member_id", "member", "joined_at", "cohort", "add_roles", "remove_roles"])
+        for member_id, name, joined, cohort, add, remove in self.rows:
+            writer.writerow([member_id, name, joined, cohort, label(add), label(remove)])
+
+    def to_job(self, channel_id: int) -> Dict:
+        return {
+            'guild_id': self.guild_id,
+            'channel_id': channel_id,
+            'alumni_role_id': self.alumni_role_id,
+            'member_role_id': self.member_role_id,
+            'remove_role_id': self.remove_role_id,
+            'cutoff': self.cutoff.strftime('%Y-%m-%d'),
+            'counts': self.counts,
+            'considered': self.considered,
+        }
+
+    @classmethod
+    def from_checkpoint(cls, state: Dict) -> 'MigrationPlan':
+        job = state['job']
+        cutoff = datetime.strptime(job['cutoff'], "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        plan = cls(job['guild_id'], job['alumni_role_id'], job['member_role_id'], cutoff, job.get('remove_role_id'))
+        plan.counts.update(job.get('counts', {}))
+        plan.changes = changes_from_state(state)
+        return plan
+
+def net_role_change(stats: Dict, role_id: int) -> int:
+    """Members who gained minus members who lost `role_id` according to engine stats."""
+    return stats['added'].get(str(role_id), 0) - stats['removed'].get(str(role_id), 0)
+
+def plan_role_change(guild, member_id: int, add: Set[int], remove: Set[int]):
+    """
+    Resolves one member's role diff against their current roles.
+    Returns (member, target roles, role ids before, role ids after), or None if the member left or nothing changes.
+    """
+    member = guild.get_member(member_id)
+    if member is None:
+        return None
+    current = [r for r in member.roles if not r.is_default()]
+    target = [r for r in current if r.id not in remove]
+    for role_id in add:
+        role = guild.get_role(role_id)
+        if role and role not in target:
+            target.append(role)
+
+    current_ids = {r.id for r in current}
+    target_ids = {r.id for r in target}
+    if target_ids == current_ids:
+        return None
+    return member, target, current_ids, target_ids
+
+async def apply_role_change(guild, member_id: int, add: Set[int], remove: Set[int],
+                            pacer: RatePacer, reason: str) -> Optional[Tuple[Set[int], Set[int]]]:
+    """
+    Applies one member's role diff against their current roles with a single edit.
+    Returns (role ids before, role ids after), or None if the member left or nothing changes.
+    Forbidden/HTTP errors are raised to the caller.
+    """
+    planned = plan_role_change(guild, member_id, add, remove)
+    if planned is None:
+        return None
+    member, target, current_ids, target_ids = planned
+    await pacer.call(lambda: member.edit(roles=target, reason=reason))
+    return current_ids, target_ids
+
+class MigrationEngine:
+    """
+    Applies precomputed role changes with one `member.edit(roles=...)` per member.
+
+    A small worker pool keeps requests in flight and lets discord.py's header-driven
+    bucket handling (plus RatePacer for 429s) set the pace instead of fixed sleeps.
+    Progress is checkpointed to disk so an interrupted run resumes where it stopped.
+    """
+
+    def __init__(self, checkpoint_path: str = "migration_checkpoint.json", workers: int = 4,
+                 checkpoint_every: int = 25, pacer: Optional[RatePacer] = None):
+        self.checkpoint_path = checkpoint_path
+        self.workers = workers
+        self.checkpoint_every = checkpoint_every
+        self.pacer = pacer or RatePacer()
+        self.running = False
+        self.state: Optional[Dict] = self.load_checkpoint()
+
+    # --- Checkpointing ---
+
+    def load_checkpoint(self) -> Optional[Dict]:
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        try:
+            with open(self.checkpoint_path, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Failed to load migration checkpoint: {e}")
+            return None
+
+    def save_checkpoint(self):
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        state = dict(self.state, done=sorted(self.state['done']))
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=4)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def has_unfinished(self) -> bool:
+        return bool(self.state) and self.state.get('status') == 'running'
+
+    def start(self, job: Dict, changes: RoleChanges):
+        """Begins a fresh run. The changes are stored with the job so a resume executes the same plan."""
+        self.state = {
+            'job': job,
+            'status': 'running',
+            'changes': {str(k): [sorted(add), sorted(remove)] for k, (add, remove) in changes.items()},
+            'done': [],
+            'stats': {'updated': 0, 'unchanged': 0, 'errors': 0, 'added': {}, 'removed': {}},
+        }
+        self.running = True
+        self.save_checkpoint()
+
+    # --- Execution ---
+
+    async def _apply(self, guild, member_id: int, add: Set[int], remove: Set[int], stats: Dict, reason: str,
+                     journal=None):
+        planned = plan_role_change(guild, member_id, add, remove)
+        if planned is None:
+            stats['unchanged'] += 1
+            return
+        member, target, before, after = planned
+        if journal is not None:
+            # Write-ahead: on disk before the edit is sent, with the fsync kept off the event loop
+            await asyncio.to_thread(journal.record, member_id, before, after)
+
+        try:
+            await self.pacer.call(lambda: member.edit(roles=target, reason=reason))
+        except discord.Forbidden:
+            print(f"ERROR: Missing permissions to manage roles for member {member_id}.")
+            stats['errors'] += 1
+            return
+        except Exception as e:
+            print(f"ERROR processing member {member_id}: {e}")
+            stats['errors'] += 1
+            return
+
+        stats['updated'] += 1
+        for role_id in after - before:
+            stats['added'][str(role_id)] = stats['added'].get(str(role_id), 0) + 1
+        for role_id in before - after:
+            stats['removed'][str(role_id)] = stats['removed'].get(str(role_id), 0) + 1
+
+    async def run(self, guild, changes: Optional[RoleChanges] = None, reason: str = "Role migration",
+                  progress: Optional[Callable[[int, int, Dict], Awaitable[None]]] = None, journal=None) -> Dict:
+        """
+        Executes `changes` (default: the stored plan), skipping members already completed.
+        Each edit is recorded to `journal` (a JournalWriter) before it is sent.
+        """
+        if self.state is None:
+            raise RuntimeError("MigrationEngine.start() must be called before run()")
+        if changes is None:
+            changes = changes_from_state(self.state)
+
+        done = set(self.state['done'])
+        stats = self.state['stats']
+        total = len(changes)
+        queue: asyncio.Queue = asyncio.Queue()
+        for member_id, (add, remove) in changes.items():
+            if member_id not in done:
+                queue.put_nowait((member_id, add, remove))
+
+        completed = len(changes) - queue.qsize()
+        self.running = True
+
+        async def worker():
+            nonlocal completed
+            while True:
+                try:
+                    member_id, add, remove = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await self._apply(guild, member_id, add, remove, stats, reason, journal)
+                done.add(member_id)
+                completed += 1
+                if completed % self.checkpoint_every == 0:
+                    self.state['done'] = done
+                    self.save_checkpoint()
+                if progress and completed % 50 == 0:
+                    try:
+                        await progress(completed, total, stats)
+                    except Exception:
+                        pass
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(self.workers)))
+            self.state['status'] = 'complete'
+        finally:
+            self.running = False
+            self.state['done'] = done
+            self.save_checkpoint()
+        return stats
@@ -0,0 +1,92 @@
+import math
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+from utils.consumption_stats import TIMESTAMP_FORMAT
+
+LEVELS = ("empty", "grams", "days") # Most to least severe
+
+class SpoolForecast:
+    """
+    Exponentially weighted consumption rate per spool.
+
+    Each spool keeps one decayed usage total: every logged amount is added after
+    decaying the previous total by exp(-elapsed / window). Total / window is then
+    the recent grams-per-day rate, so recording usage and reading a forecast are
+    both O(1) and idle spools drift towards a zero rate on their own.
+
+    Low-stock levels are tracked per spool so each one is reported once when a
+    write crosses it, and re-armed when the spool is refilled.
+    """
+
+    def __init__(self, window_days: float = 14.0, low_grams: float = 100.0, low_days: float = 7.0):
+        self.window_days = window_days
+        self.low_grams = low_grams
+        self.low_days = low_days
+        self.totals: Dict[int, float] = {}
+        self.updated: Dict[int, datetime] = {}
+        self.alerted: Dict[int, Set[str]] = {}
+
+    def _decayed(self, spool_id: int, now: datetime) -> float:
+        total = self.totals.get(spool_id, 0.0)
+        if not total:
+            return 0.0
+        elapsed_days = max(0.0, (now - self.updated[spool_id]).total_seconds() / 86400)
+        return total * math.exp(-elapsed_days / self.window_days)
+
+    def record(self, spool_id: int, amount: float, when: Optional[datetime] = None):
+        when = when or datetime.now()
+        self.totals[spool_id] = self._decayed(spool_id, when) + max(0.0, float(amount))
+        self.updated[spool_id] = when
+
+    def rebuild(self, entries: Iterable[Dict]):
+        """Seeds rates from recent log entries (oldest first); anything older than a few windows barely counts."""
+        self.totals, self.updated = {}, {}
+        for entry in entries:
+            try:
+                spool_id = int(entry['filament_id'])
+                when = datetime.strptime(str(entry['timestamp']), TIMESTAMP_FORMAT)
+                amount = float(entry.get('amount_used', 0))
+            except (KeyError, ValueError, TypeError):
+                continue
+            self.record(spool_id, amount, when)
+
+    def rate(self, spool_id: int, now: Optional[datetime] = None) -> float:
+        """Recent consumption in grams per day."""
+        return self._decayed(spool_id, now or datetime.now()) / self.window_days
+
+    def days_left(self, spool_id: int, weight: float, now: Optional[datetime] = None) -> Optional[float]:
+        """Days until the spool runs out at the recent rate, or None if it hasn't been used lately."""
+        if weight <= 0:
+            return 0.0
+        rate = self.rate(spool_id, now)
+        if rate < 0.01:
+            return None
+        return weight / rate
+
+    def levels(self, spool_id: int, weight: float, now: Optional[datetime] = None) -> Set[str]:
+        found = set()
+        if weight <= 0:
+            found.add("empty")
+        if weight <= self.low_grams:
+            found.add("grams")
+        days = self.days_left(spool_id, weight, now)
+        if days is not None and days <= self.low_days:
+            found.add("days")
+        return found
+
+    def check(self, spool_id: int, weight: float, now: Optional[datetime] = None) -> List[str]:
+        """Levels newly crossed by this spool since it was last checked, most severe first."""
+        current = self.levels(spool_id, weight, now)
+        previous = self.alerted.get(spool_id, set())
+        self.alerted[spool_id] = current # Levels no longer met are re-armed
+        return [level for level in LEVELS if level in current and level not in previous]
+
+    def arm(self, inventory: Iterable[Dict], now: Optional[datetime] = None):
+        """Marks every spool's current levels as already reported (e.g. at startup)."""
+        now = now or datetime.now()
+        self.alerted = {item['id']: self.levels(item['id'], item.get('weight_g', 0), now) for item in inventory}
+
+    def forget(self, spool_id: int):
+        for state in (self.totals, self.updated, self.alerted):
+            state.pop(spool_id, None)
@@ -0,0 +1,61 @@
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+PAGE_SIZE = 25 # Discord's cap on select options and autocomplete choices
+
+def spool_label(item: Dict) -> str:
+    label = f"{item.get('brand', '')} {item.get('type', '')} - {item.get('color', '')}"
+    return label if len(label) <= 100 else label[:97] + "..."
+
+class SpoolIndex:
+    """
+    Read-only search index over an inventory snapshot.
+
+    Every word of a spool's brand, type and color goes into one sorted list of
+    (word, position) pairs, so a prefix lookup is two bisects. A multi-word
+    query intersects the positions matched by each word.
+    Rebuild it when the data version moves.
+    """
+
+    def __init__(self, inventory: List[Dict]):
+        self.items = {item['id']: item for item in inventory}
+        self.by_type = sorted(inventory, key=lambda x: (x.get('type', ''), x.get('color', '')))
+        self.by_brand = sorted(inventory, key=lambda x: (x.get('brand', ''), x.get('type', ''), x.get('color', '')))
+
+        # (word, position in by_type): a prefix range yields positions, which sort as plain ints
+        pairs = sorted(
+            (word, rank)
+            for rank, item in enumerate(self.by_type)
+            for field in ('brand', 'type', 'color')
+            for word in str(item.get(field, '')).casefold().split()
+        )
+        self._words = [word for word, _ in pairs]
+        self._ranks = [rank for _, rank in pairs]
+
+    def __len__(self):
+        return len(self.items)
+
+    def _prefix_range(self, prefix: str) -> Tuple[int, int]:
+        lo = bisect_left(self._words, prefix)
+        return lo, bisect_left(self._words, prefix + "\uffff", lo)
+
+    def search(self, query: str, limit: int = PAGE_SIZE) -> List[Dict]:
+        """Spools where every query word prefixes a brand/type/color word, in type/color order."""
+        words = query.casefold().split()
+        if not words:
+            return self.by_type[:limit]
+        ranges = sorted((self._prefix_range(word) for word in words), key=lambda r: r[1] - r[0])
+        lo, hi = ranges[0] # Narrowest word first keeps the intersections small
+        matches = set(self._ranks[lo:hi])
+        for lo, hi in ranges[1:]:
+            if not matches:
+                break
+            matches.intersection_update(self._ranks[lo:hi])
+        return [self.by_type[rank] for rank in sorted(matches)[:limit]]
+
+    def page(self, page: int, order: str = "type", size: int = PAGE_SIZE) -> Tuple[List[Dict], int, int]:
+        """(items on the page, clamped page number, page count)."""
+        items = self.by_brand if order == "brand" else self.by_type
+        pages = max(1, -(-len(items) // size))
+        page = min(max(page, 0), pages - 1)
+        return items[page * size:(page + 1) * size], page, pages
@@ -0,0 +1,234 @@
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+GROUPS = ("user", "material", "filament")
+
+def material_of(filament_desc: str, spool_type: Optional[str] = None) -> str:
+    """
+    The spool's type when known. Otherwise it is guessed from the log's "<color> <type>"
+    description as the last word (wrong for multi-word types, e.g. "PLA Silk").
+    """
+    if spool_type and str(spool_type).strip():
+        return str(spool_type).strip()
+    parts = str(filament_desc or '').split()
+    return parts[-1] if parts else "Unknown"
+
+def to_seconds(value) -> int:
+    """Seconds since 1970-01-01 for a datetime or a "YYYY-MM-DD[ HH:MM:SS]" string (local wall clock, no timezone)."""
+    if isinstance(value, datetime):
+        return (value.toordinal() - EPOCH_ORDINAL) * 86400 + value.hour * 3600 + value.minute * 60 + value.second
+    text = str(value)
+    seconds = (date(int(text[0:4]), int(text[5:7]), int(text[8:10])).toordinal() - EPOCH_ORDINAL) * 86400
+    if len(text) >= 19:
+        seconds += int(text[11:13]) * 3600 + int(text[14:16]) * 60 + int(text[17:19])
+    return seconds
+
+def from_seconds(seconds: int) -> datetime:
+    return datetime(1970, 1, 1) + timedelta(seconds=seconds)
+
+class _GroupSeries:
+    """Row positions of one user/material/filament plus a running total of its amounts."""
+    __slots__ = ("rows", "cum")
+
+    def __init__(self):
+        self.rows = array('i')
+        self.cum = array('d', [0.0])
+
+class UsageColumns:
+    """
+    Usage history as compact columns: timestamps (int64 seconds), amounts
+    (float32), and user/filament/material as interned ids.
+
+    Rows are kept in time order with a running total, so the usage in any time
+    range is two bisects and a subtraction. Each user, material and filament also
+    keeps its own row list and running total, which makes a group-by over a range
+    two bisects per group instead of a pass over the rows.
+
+    `spool_types` (filament_id -> type) gives each filament its material; entries
+    for spools that no longer exist fall back to the description.
+    """
+
+    def __init__(self, spool_types: Optional[Dict[int, str]] = None):
+        self.spool_types: Dict[int, str] = dict(spool_types or {})
+        self.ts = array('q')
+        self.amount = array('f')
+        self.cum = array('d', [0.0]) # cum[i] = sum of amount[:i]
+        self.names: Dict[str, List[str]] = {group: [] for group in GROUPS}
+        self.codes: Dict[str, array] = {group: array('i') for group in GROUPS}
+        self.series: Dict[str, List[_GroupSeries]] = {group: [] for group in GROUPS}
+        self._ids: Dict[str, Dict[str, int]] = {group: {} for group in GROUPS}
+        self._day_seconds: Dict[str, int] = {}
+        self._material_codes: List[int] = [] # filament code -> material code
+
+    def __len__(self):
+        return len(self.ts)
+
+    def _intern(self, group: str, name: str) -> int:
+        ids = self._ids[group]
+        code = ids.get(name)
+        if code is None:
+            code = ids[name] = len(self.names[group])
+            self.names[group].append(name)
+            self.series[group].append(_GroupSeries())
+        return code
+
+    def _parse_ts(self, text: str) -> int:
+        day = self._day_seconds.get(text[:10])
+        if day is None:
+            day = self._day_seconds[text[:10]] = to_seconds(text[:10])
+        return day + int(text[11:13]) * 3600 + int(text[14:16]) * 60 + int(text[17:19])
+
+    def _parse_entry(self, entry: Dict) -> Optional[Tuple[int, float]]:
+        try:
+            return self._parse_ts(str(entry['timestamp'])), float(entry.get('amount_used', 0))
+        except (KeyError, ValueError, TypeError, IndexError):
+            return None
+
+    def _material_for(self, entry: Dict) -> Optional[str]:
+        try:
+            return self.spool_types.get(int(entry.get('filament_id')))
+        except (TypeError, ValueError):
+            return None
+
+    def append(self, entry: Dict) -> bool:
+        """Adds one log entry (entries must arrive in time order). Returns False for unparseable entries."""
+        parsed = self._parse_entry(entry)
+        if parsed is None:
+            return False
+        self._append_row(parsed[0], parsed[1], str(entry.get('user', 'Unknown')),
+                         str(entry.get('filament_desc', 'Unknown')), self._material_for(entry))
+        return True
+
+    def last_timestamp(self) -> Optional[str]:
+        """Timestamp of the newest loaded row, in the log's format (None if empty)."""
+        return from_seconds(self.ts[-1]).strftime("%Y-%m-%d %H:%M:%S") if self.ts else None
+
+    def extend(self, entries: Iterable[Dict]) -> int:
+        """
+        Appends entries logged since the newest loaded row, e.g. iter_logs(start=last_timestamp()).
+        Rows already loaded for that last second are skipped, as is anything older. Returns rows added.
+        """
+        last = self.ts[-1] if self.ts else None
+        skip = len(self.ts) - bisect_left(self.ts, last) if last is not None else 0
+        added = 0
+        for entry in entries:
+            parsed = self._parse_entry(entry)
+            if parsed is None:
+                continue
+            if last is not None and parsed[0] <= last:
+                if parsed[0] == last and skip:
+                    skip -= 1
+                    continue
+                if parsed[0] < last:
+                    continue
+            self._append_row(parsed[0], parsed[1], str(entry.get('user', 'Unknown')),
+                             str(entry.get('filament_desc', 'Unknown')), self._material_for(entry))
+            added += 1
+        return added
+
+    def _append_row(self, ts: int, amount: float, user: str, filament_desc: str, spool_type: Optional[str] = None):
+        row = len(self.ts)
+        self.ts.append(ts)
+        self.amount.append(amount)
+        self.cum.append(self.cum[-1] + amount)
+        user_code = self._intern("user", user)
+        filament_code = self._intern("filament", filament_desc)
+        if filament_code == len(self._material_codes):
+            self._material_codes.append(self._intern("material", material_of(filament_desc, spool_type)))
+        for group, code in (("user", user_code), ("filament", filament_code), ("material", self._material_codes[filament_code])):
+            self.codes[group].append(code)
+            series = self.series[group][code]
+            series.rows.append(row)
+            series.cum.append(series.cum[-1] + amount)
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Dict], spool_types: Optional[Dict[int, str]] = None) -> "UsageColumns":
+        """Streams a log (oldest first) into columns. Out-of-order entries are sorted afterwards, from the columns."""
+        columns = cls(spool_types)
+        in_order = True
+        for entry in entries:
+            if columns.append(entry) and len(columns.ts) > 1 and columns.ts[-1] < columns.ts[-2]:
+                in_order = False
+        if in_order:
+            return columns
+
+        ordered = cls(spool_types)
+        users, filaments, materials = columns.names["user"], columns.names["filament"], columns.names["material"]
+        for row in sorted(range(len(columns.ts)), key=columns.ts.__getitem__):
+            filament_code = columns.codes["filament"][row]
+            ordered._append_row(columns.ts[row], columns.amount[row], users[columns.codes["user"][row]],
+                                filaments[filament_code], materials[columns._material_codes[filament_code]])
+        return ordered
+
+    # --- Queries ---
+
+    def _row_range(self, start: Optional[int], end: Optional[int]) -> Tuple[int, int]:
+        lo = bisect_left(self.ts, start) if start is not None else 0
+        hi = bisect_left(self.ts, end, lo) if end is not None else len(self.ts)
+        return lo, hi
+
+    def total(self, start: Optional[int] = None, end: Optional[int] = None) -> float:
+        """Grams used with start <= ts < end (seconds; None = unbounded)."""
+        lo, hi = self._row_range(start, end)
+        return self.cum[hi] - self.cum[lo]
+
+    def count(self, start: Optional[int] = None, end: Optional[int] = None) -> int:
+        lo, hi = self._row_range(start, end)
+        return hi - lo
+
+    def group_totals(self, group: str, start: Optional[int] = None, end: Optional[int] = None,
+                     top: Optional[int] = None) -> List[Tuple[str, float]]:
+        """(name, grams) per user/material/filament in the range, largest first."""
+        lo, hi = self._row_range(start, end)
+        totals = []
+        for name, series in zip(self.names[group], self.series[group]):
+            # Positions of this group's rows that fall inside [lo, hi)
+            a = bisect_left(series.rows, lo)
+            b = bisect_left(series.rows, hi, a)
+            if b > a:
+                totals.append((name, series.cum[b] - series.cum[a]))
+        totals.sort(key=lambda item: item[1], reverse=True)
+        return totals[:top] if top else totals
+
+    def weekly(self, start: int, end: int, group: Optional[str] = None, name: Optional[str] = None) -> List[Tuple[date, float]]:
+        """Grams per Sunday-starting week within [start, end), optionally for one group member."""
+        first = from_seconds(start).date()
+        week = first - timedelta(days=(first.weekday() + 1) % 7)
+        series = None
+        if group:
+            code = self._ids[group].get(name)
+            if code is None:
+                return []
+            series = self.series[group][code]
+
+        buckets = []
+        while to_seconds(week.isoformat()) < end:
+            # First and last weeks are clipped to the requested range
+            lo, hi = self._row_range(max(start, to_seconds(week.isoformat())),
+                                     min(end, to_seconds((week + timedelta(days=7)).isoformat())))
+            if series is None:
+                grams = self.cum[hi] - self.cum[lo]
+            else:
+                a = bisect_left(series.rows, lo)
+                b = bisect_left(series.rows, hi, a)
+                grams = series.cum[b] - series.cum[a]
+            buckets.append((week, grams))
+            week += timedelta(days=7)
+        return buckets
+
+def render_bars(rows: List[Tuple[str, float]], width: int = 24, label_width: int = 20, unit: str = "g") -> str:
+    """Horizontal text bar chart, for a Discord code block or a terminal."""
+    if not rows:
+        return "(no usage)"
+    peak = max(value for _, value in rows) or 1
+    lines = []
+    for label, value in rows:
+        label = str(label)
+        if len(label) > label_width:
+            label = label[:label_width - 1] + "…"
+        bar = "█" * int(round(width * value / peak))
+        lines.append(f"{label:<{label_width}} {bar:<{width}} {value:,.1f}{unit}")
+    return "\n".join(lines)
@@ -0,0 +1,116 @@
+import csv
+import io
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+CSV_HEADER = ["Timestamp", "User", "Filament", "Amount Used (g)"]
+DATE_FORMAT = "%Y-%m-%d"
+SPOOL_MEMORY_LIMIT = 1024 * 1024  # Parts bigger than this spill to a temp file on disk
+
+def parse_date_range(start_text: str = "", end_text: str = "") -> Tuple[Optional[str], Optional[str]]:
+    """
+    Turns optional YYYY-MM-DD dates into timestamp bounds: start inclusive, end
+    exclusive (the day after the end date, so the whole end day is included).
+    Raises ValueError for malformed dates or an end before the start.
+    """
+    start = datetime.strptime(start_text.strip(), DATE_FORMAT) if start_text and start_text.strip() else None
+    end = datetime.strptime(end_text.strip(), DATE_FORMAT) if end_text and end_text.strip() else None
+    if start and end and end < start:
+        raise ValueError("End date is before start date")
+    return (
+        start.strftime("%Y-%m-%d %H:%M:%S") if start else None,
+        (end + timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S") if end else None,
+    )
+
+def filter_entries(entries: Iterable[Dict], start: Optional[str] = None, end: Optional[str] = None,
+                   user: Optional[str] = None) -> Iterable[Dict]:
+    """Lazily keeps entries with start <= timestamp < end whose user contains `user` (case-insensitive)."""
+    needle = user.strip().casefold() if user and user.strip() else None
+    for entry in entries:
+        ts = str(entry.get('timestamp', ''))
+        if start and ts < start:
+            continue
+        if end and ts >= end:
+            continue
+        if needle and needle not in str(entry.get('user', '')).casefold():
+            continue
+        yield entry
+
+class CsvPartWriter:
+    """
+    Streams usage entries through csv.writer into spooled temp files, starting a
+    new part (with its own header) whenever the next row would push the current
+    one past `part_limit` bytes. Only one row is ever held as a string.
+    """
+
+    def __init__(self, part_limit: int):
+        self.part_limit = part_limit
+        self.parts: List[tempfile.SpooledTemporaryFile] = []
+        self.rows = 0
+        self._row_buffer = io.StringIO()
+        self._writer = csv.writer(self._row_buffer, lineterminator="\n")
+        self._header = self._encode(CSV_HEADER)
+        self._current = None
+        self._current_size = 0
+
+    def _encode(self, row) -> bytes:
+        self._row_buffer.seek(0)
+        self._row_buffer.truncate()
+        self._writer.writerow(row)
+        return self._row_buffer.getvalue().encode("utf-8")
+
+    def _new_part(self):
+        self._current = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_LIMIT, mode="w+b")
+        self._current.write(self._header)
+        self._current_size = len(self._header)
+        self.parts.append(self._current)
+
+    def write_entry(self, entry: Dict):
+        data = self._encode([
+            entry.get('timestamp', ''),
+            entry.get('user', 'Unknown'),
+            entry.get('filament_desc', 'Unknown'),
+            entry.get('amount_used', 0),
+        ])
+        if self._current is None or (self._current_size + len(data) > self.part_limit and self._current_size > len(self._header)):
+            self._new_part()
+        self._current.write(data)
+        self._current_size += len(data)
+        self.rows += 1
+
+    def finish(self) -> List[tempfile.SpooledTemporaryFile]:
+        for part in self.parts:
+            part.seek(0)
+        return self.parts
+
+def export_csv_parts(entries: Iterable[Dict], part_limit: int) -> Tuple[List[tempfile.SpooledTemporaryFile], int]:
+    """Writes entries as CSV parts of at most part_limit bytes. Returns (rewound parts, row count). Blocking: run in a thread."""
+    writer = CsvPartWriter(part_limit)
+    try:
+        for entry in entries:
+            writer.write_entry(entry)
+    except Exception:
+        for part in writer.parts:
+            part.close()
+        raise
+    return writer.finish(), writer.rows
+
+def group_parts(parts: List, limit: int, max_files: int = 10) -> List[List]:
+    """
+    Groups rewound parts into messages whose attachments total at most `limit`
+    bytes (Discord caps the whole request, not just each file), max_files each.
+    """
+    groups, current, current_size = [], [], 0
+    for part in parts:
+        part.seek(0, io.SEEK_END)
+        size = part.tell()
+        part.seek(0)
+        if current and (current_size + size > limit or len(current) >= max_files):
+            groups.append(current)
+            current, current_size = [], 0
+        current.append(part)
+        current_size += size
+    if current:
+        groups.append(current)
+    return groups
@@ -0,0 +1,191 @@
+import gzip
+import json
+import os
+import re
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+SEGMENT_PATTERN = re.compile(r'^usage-(\d{4}-\d{2})\.jsonl(\.gz)?$')
+COMPACTING_PATTERN = re.compile(r'^usage-(\d{4}-\d{2})\.jsonl\.compacting$') # A segment being folded into its archive
+
+class UsageLog:
+    """
+    Filament usage history as append-only JSON Lines, one segment per month.
+
+    Logging an entry is a single small append to the current month's segment.
+    Closed months are compacted to gzip in the background, and readers stream
+    the segments in order instead of loading the whole history.
+    """
+
+    MIGRATION_MARKER = ".migrated_from_logs_json"
+
+    def __init__(self, log_dir: str):
+        self.log_dir = log_dir
+        os.makedirs(self.log_dir, exist_ok=True)
+
+        # Readers skip .compacting files, so finish an interrupted compaction before anything reads
+        for name in os.listdir(self.log_dir):
+            match = COMPACTING_PATTERN.match(name)
+            if match:
+                self.compact_month(match.group(1))
+
+    @staticmethod
+    def month_of(entry: Dict) -> str:
+        ts = str(entry.get('timestamp', ''))
+        if re.match(r'^\d{4}-\d{2}', ts):
+            return ts[:7]
+        return datetime.now().strftime("%Y-%m")
+
+    def segment_path(self, month: str, compressed: bool = False) -> str:
+        return os.path.join(self.log_dir, f"usage-{month}.jsonl{'.gz' if compressed else ''}")
+
+    def segments(self) -> List[str]:
+        """Segment paths, oldest month first (a month may have both a .gz and a fresh .jsonl)."""
+        found = []
+        for name in os.listdir(self.log_dir):
+            match = SEGMENT_PATTERN.match(name)
+            if match:
+                found.append((match.group(1), 0 if match.group(2) else 1, os.path.join(self.log_dir, name)))
+        return [path for _, _, path in sorted(found)]
+
+    def append(self, entry: Dict):
+        with open(self.segment_path(self.month_of(entry)), 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def append_many(self, entries: List[Dict]):
+        by_month: Dict[str, List[str]] = {}
+        for entry in entries:
+            by_month.setdefault(self.month_of(entry), []).append(json.dumps(entry))
+        for month, lines in by_month.items():
+            with open(self.segment_path(month), 'a') as f:
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def iter_entries(self, since_month: Optional[str] = None) -> Iterator[Dict]:
+        """Streams entries oldest first, optionally skipping segments before `since_month` (YYYY-MM)."""
+        for path in self.segments():
+            if since_month and SEGMENT_PATTERN.match(os.path.basename(path)).group(1) < since_month:
+                continue
+            opener = gzip.open if path.endswith('.gz') else open
+            try:
+                with opener(path, 'rt') as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            yield json.loads(line)
+                        except json.JSONDecodeError:
+                            continue  # Torn last line from a crash mid-append
+            except OSError as e:
+                print(f"USAGE_LOG_READ_ERROR: {path} - {e}")
+
+    def compactable_months(self) -> List[str]:
+        """Closed months with a plain segment (or an interrupted compaction) to fold into their archive."""
+        current = datetime.now().strftime("%Y-%m")
+        months = set()
+        for name in os.listdir(self.log_dir):
+            match = SEGMENT_PATTERN.match(name)
+            if match and match.group(2):
+                continue # Already an archive
+            match = match or COMPACTING_PATTERN.match(name)
+            if match and match.group(1) < current:
+                months.add(match.group(1))
+        return sorted(months)
+
+    def _fold_into_archive(self, month: str, pending: str):
+        packed = self.segment_path(month, compressed=True)
+        archived = []
+        if os.path.exists(packed):
+            with gzip.open(packed, 'rt') as f:
+                archived = [line if line.endswith("\n") else line + "\n" for line in f if line.strip()]
+        with open(pending, 'r') as f:
+            lines = [line if line.endswith("\n") else line + "\n" for line in f if line.strip()]
+
+        # A crash after the archive was replaced but before the pending file was removed
+        # leaves its lines at the end of the archive already: don't add them twice
+        if lines and archived[-len(lines):] != lines:
+            tmp = f"{packed}.tmp"
+            with gzip.open(tmp, 'wt') as f:
+                f.writelines(archived + lines)
+            os.replace(tmp, packed)
+        os.remove(pending)
+
+    def compact_month(self, month: str) -> bool:
+        """
+        Gzips one closed month's plain segment into its archive, folding late entries into
+        an existing archive. The segment is first renamed to .compacting, so an interrupted
+        run is finished (not repeated) next time. Returns True if anything was compacted.
+        """
+        compacting = os.path.join(self.log_dir, f"usage-{month}.jsonl.compacting")
+        plain = self.segment_path(month)
+        done = False
+        if os.path.exists(compacting): # Left over from an interrupted run
+            self._fold_into_archive(month, compacting)
+            done = True
+        if os.path.exists(plain):
+            os.replace(plain, compacting)
+            self._fold_into_archive(month, compacting)
+            done = True
+        return done
+
+    def compact(self) -> int:
+        """Gzips every closed month's plain segment. Returns segments compacted."""
+        return sum(1 for month in self.compactable_months() if self.compact_month(month))
+
+    def _read_marker(self) -> Optional[Dict]:
+        marker = os.path.join(self.log_dir, self.MIGRATION_MARKER)
+        try:
+            with open(marker, 'r') as f:
+                content = f.read()
+        except OSError:
+            return None
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            # Plain-text marker from the old one-time import: "Imported N entries from ..."
+            match = re.search(r'Imported (\d+) entries', content)
+            return {'imported': int(match.group(1)) if match else 0, 'signature': None}
+
+    def _write_marker(self, imported: int, signature):
+        marker = os.path.join(self.log_dir, self.MIGRATION_MARKER)
+        with open(f"{marker}.tmp", 'w') as f:
+            json.dump({'imported': imported, 'signature': signature, 'updated': datetime.now().isoformat()}, f)
+        os.replace(f"{marker}.tmp", marker)
+
+    def import_from_json(self, logs_file: str) -> int:
+        """
+        Imports entries appended to the legacy logs.json array (e.g. by the desktop app)
+        since the last import. The file is left untouched; the marker records how many
+        of its entries were imported and the file's stat() signature, so an unchanged
+        file costs one stat(). Returns entries imported.
+        """
+        try:
+            st = os.stat(logs_file)
+        except OSError:
+            return 0
+        signature = [st.st_mtime_ns, st.st_size]
+        state = self._read_marker() or {'imported': 0, 'signature': None}
+        if state.get('signature') == signature:
+            return 0
+        try:
+            with open(logs_file, 'r') as f:
+                content = f.read()
+            entries = json.loads(content) if content.strip() else []
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"USAGE_LOG_MIGRATION_ERROR: {logs_file} - {e}")
+            return 0
+
+        imported = state.get('imported', 0)
+        if len(entries) < imported:
+            print(f"USAGE_LOG_MIGRATION_WARNING: {logs_file} shrank from {imported} to {len(entries)} entries; "
+                  f"only entries appended from now on will be imported.")
+            imported = len(entries)
+        new_entries = entries[imported:]
+        if new_entries:
+            self.append_many(new_entries)
+        self._write_marker(len(entries), signature)
+        return len(new_entries)